@@ -2,4 +2,4 @@ cd $PSScriptRoot
 
 cd ..
 
-python -m http.server
\ No newline at end of file
+python schedule_server.py
\ No newline at end of file
@@ -0,0 +1,19 @@
+﻿# Watch_Show.ps1 - rebuilds the schedule every time CallSchedule.txt or the cast list is saved
+
+$scriptDir = $PSScriptRoot
+$parentDir = Split-Path -Path $scriptDir -Parent
+
+$pythonScript = Join-Path $parentDir "watch_show.py"
+if (-not (Test-Path $pythonScript)) {
+    Write-Error "ERROR: watch_show.py not found at: $pythonScript"
+    Read-Host "Press Enter to exit"
+    exit 1
+}
+
+Set-Location $parentDir
+Write-Host "Watching Call_Schedule and Cast_List. Leave this window open while editing; close it to stop." -ForegroundColor Yellow
+
+python watch_show.py
+
+Write-Host ""
+Read-Host "Press Enter to exit"
@@ -0,0 +1,139 @@
+"""Compare the compact schedule export with the JSON files index.html reads.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_compact [--actors 1000] [--slots 2000] [--repo]
+
+Builds a synthetic season (or, with --repo, uses the repository's own
+cast.json, group_mappings.json and schedules.json), writes cast.json,
+call_times.json and call_windows.json the way update_schedules.py does and
+the compact export, then prints raw and gzip sizes and the time to parse and
+decode each, after checking that the compact file decodes to the same data.
+If node is installed, the decoder in index.html is timed and checked as well.
+"""
+import argparse
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from benchmarks.synthetic import generate_cast, generate_season
+from compact_export import compact_bytes, decode_compact, encode_compact
+from show_store import load_json
+from update_schedules import build_call_times, build_call_windows, iter_call_labels
+
+
+def best_time(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+# Runs index.html's decodeCompact() (and the functions it calls) under node
+NODE_SCRIPT = r"""
+const fs = require('fs');
+const [html, dir, repeat] = process.argv.slice(1);
+const source = fs.readFileSync(html, 'utf8');
+function extract(name) {
+  const start = source.indexOf('function ' + name + '(');
+  let depth = 0;
+  for (let i = source.indexOf('{', start); ; i++) {
+    if (source[i] === '{') depth++;
+    else if (source[i] === '}' && --depth === 0) return source.slice(start, i + 1);
+  }
+}
+eval(['decodeCompact', 'mergeIntervals', 'formatMinutes'].map(extract).join('\n'));
+const read = name => fs.readFileSync(dir + '/' + name, 'utf8');
+const files = ['cast.json', 'call_times.json', 'call_windows.json'].map(read);
+const compact = read('schedule_compact.json');
+function best(fn) {
+  let min = Infinity;
+  for (let i = 0; i < Number(repeat); i++) {
+    const start = process.hrtime.bigint();
+    fn();
+    min = Math.min(min, Number(process.hrtime.bigint() - start) / 1e6);
+  }
+  return min;
+}
+const decoded = decodeCompact(JSON.parse(compact));
+const expected = { actors: JSON.parse(files[0]).actors, callTimes: JSON.parse(files[1]), callWindows: JSON.parse(files[2]) };
+if (JSON.stringify(decoded) !== JSON.stringify(expected)) throw new Error('index.html decodes different data');
+console.log(best(() => files.map(text => JSON.parse(text))).toFixed(1) + ' ' + best(() => decodeCompact(JSON.parse(compact))).toFixed(1));
+"""
+
+
+def node_times(files, compact, repeat):
+    """(JSON parse ms, compact parse and decode ms) in node, or None without node."""
+    node = shutil.which('node')
+    if node is None:
+        return None
+    with tempfile.TemporaryDirectory() as directory:
+        for name, body in list(files.items()) + [('schedule_compact.json', compact)]:
+            with open(os.path.join(directory, name), 'wb') as f:
+                f.write(body)
+        output = subprocess.run([node, '-e', NODE_SCRIPT, 'index.html', directory, str(repeat)],
+                                check=True, capture_output=True, text=True).stdout
+    return [float(value) for value in output.split()]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--actors', type=int, default=1000)
+    arg_parser.add_argument('--slots', type=int, default=2000)
+    arg_parser.add_argument('--seed', type=int, default=1)
+    arg_parser.add_argument('--repeat', type=int, default=5, help="keep the best of this many decode runs")
+    arg_parser.add_argument('--repo', action='store_true', help="use the repository's JSON files instead")
+    args = arg_parser.parse_args()
+
+    if args.repo:
+        cast_data = load_json('cast.json')
+        group_mappings = load_json('group_mappings.json')
+        schedule = load_json('schedules.json')
+    else:
+        cast_data, group_mappings = generate_cast(args.actors, args.seed)
+        schedule = generate_season(cast_data, args.slots, args.seed)
+    print(f"{len(cast_data['actors'])} actors, {sum(len(s) for s in schedule.values())} slots, {len(schedule)} days")
+
+    call_times = build_call_times(schedule, cast_data, group_mappings)
+    call_windows = build_call_windows(schedule, cast_data)
+    files = {name: json.dumps(data, indent=2).encode('utf-8')
+             for name, data in (('cast.json', cast_data), ('call_times.json', call_times),
+                                ('call_windows.json', call_windows))}
+    start = time.perf_counter()
+    compact, compressed = compact_bytes(encode_compact(cast_data['actors'],
+                                                       iter_call_labels(schedule, cast_data, group_mappings)))
+    print(f"Encoded in {time.perf_counter() - start:.3f}s")
+
+    decoded = decode_compact(json.loads(compact))
+    assert decoded['actors'] == cast_data['actors'], "compact actors differ"
+    assert decoded['call_times'] == call_times, "compact call times differ"
+    assert decoded['call_windows'] == call_windows, "compact call windows differ"
+
+    print(f"{'file':>24} {'raw KB':>9} {'gzip KB':>9}")
+    for name, body in files.items():
+        print(f"{name:>24} {len(body) / 1024:>9.1f} {len(gzip.compress(body)) / 1024:>9.1f}")
+    json_raw = sum(len(body) for body in files.values())
+    json_gzip = sum(len(gzip.compress(body)) for body in files.values())
+    print(f"{'JSON total':>24} {json_raw / 1024:>9.1f} {json_gzip / 1024:>9.1f}")
+    print(f"{'schedule_compact.json':>24} {len(compact) / 1024:>9.1f} {len(compressed) / 1024:>9.1f}")
+    print(f"Compact is {json_raw / len(compact):.1f}x smaller raw, {json_gzip / len(compressed):.1f}x smaller gzipped")
+
+    json_time = best_time(lambda: [json.loads(body) for body in files.values()], args.repeat)
+    compact_time = best_time(lambda: decode_compact(json.loads(gzip.decompress(compressed))), args.repeat)
+    print(f"Python: parse JSON files {json_time * 1000:.1f} ms; unzip, parse and decode compact {compact_time * 1000:.1f} ms")
+    times = node_times(files, compact, args.repeat)
+    if times is None:
+        print("node not found; skipped timing the index.html decoder")
+    else:
+        print(f"index.html (node): parse JSON files {times[0]:.1f} ms; parse and decode compact {times[1]:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Micro-benchmark ConflictResolver.is_valid_name as the cast grows.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_name_index [--lookups 20000]
+
+The original implementation scans every actor's role list per lookup; the
+indexed resolver should stay flat as the cast size increases.
+"""
+import argparse
+import random
+import time
+
+from benchmarks.synthetic import generate_cast
+from update_schedules import ConflictResolver
+
+
+def legacy_is_valid_name(cast_data, group_mappings, name):
+    name_upper = name.upper()
+
+    if name_upper == "FULL CAST":
+        return True
+
+    if name_upper in group_mappings:
+        return True
+
+    for actor_roles in cast_data.get('actor_roles', {}).values():
+        if name_upper in [r.upper() for r in actor_roles]:
+            return True
+
+    return False
+
+
+def time_lookups(check, names):
+    start = time.perf_counter()
+    for name in names:
+        check(name)
+    return (time.perf_counter() - start) / len(names)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--lookups', type=int, default=20000)
+    args = arg_parser.parse_args()
+
+    print(f"{'actors':>8} {'legacy us/lookup':>18} {'indexed us/lookup':>18}")
+    for actor_count in (30, 300, 3000):
+        cast_data, group_mappings = generate_cast(actor_count)
+        rng = random.Random(actor_count)
+        roles = sorted({role for roles in cast_data['actor_roles'].values() for role in roles} - set(group_mappings))
+        groups = sorted(group_mappings)
+        names = [rng.choice([rng.choice(roles).title(), rng.choice(groups).title(), "Unknown"])
+                 for _ in range(args.lookups)]
+
+        resolver = ConflictResolver(cast_data, group_mappings)
+        legacy_names = names[:max(200, args.lookups * 30 // actor_count)]
+        legacy = time_lookups(lambda n: legacy_is_valid_name(cast_data, group_mappings, n), legacy_names)
+        indexed = time_lookups(resolver.is_valid_name, names)
+        for name in legacy_names:
+            assert resolver.is_valid_name(name) == legacy_is_valid_name(cast_data, group_mappings, name)
+        print(f"{actor_count:>8} {legacy * 1e6:>18.2f} {indexed * 1e6:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
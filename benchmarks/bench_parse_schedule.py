@@ -0,0 +1,199 @@
+"""Benchmark parse_schedule against the original line-by-line implementation.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_parse_schedule [--lines 50000] [--seed 1]
+
+A synthetic call board is generated from cast.json, both parsers are run on it
+with a non-interactive resolver, and the results are checked for equality.
+"""
+import argparse
+import contextlib
+import io
+import os
+import re
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.synthetic import StubResolver, generate_call_board
+from update_schedules import load_json, parse_schedule, resolve_name
+
+
+def legacy_parse_schedule(file_path, conflict_resolver):
+    schedule = {}
+    current_date = None
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+        i = 0
+        
+        while i < len(lines):
+            line = lines[i].strip()
+            
+            # Check for date line
+            date_pattern = r'^(?:Friday|Saturday),?\s+([A-Za-z]+)\s+(\d{1,2})(?:,?\s+(\d{4}))?:?$'
+            date_match = re.match(date_pattern, line, re.IGNORECASE)
+            
+            if date_match:
+                month_name = date_match.group(1)
+                day = int(date_match.group(2))
+                year = int(date_match.group(3)) if date_match.group(3) else 2025
+                month_num = datetime.strptime(month_name, '%B').month
+                current_date = datetime(year, month_num, day).strftime('%Y-%m-%d')
+                schedule[current_date] = []
+                print(f"Parsed date: {line} -> {current_date}")
+                i += 1
+                continue
+            
+            if not current_date or not line:
+                i += 1
+                continue
+            
+            # Check if line is ONLY a time (no groups on same line)
+            time_only_pattern = r'^\s*(\d{1,2}:\d{2}(?:am|pm)?-\d{1,2}:\d{2}(?:am|pm)?)\s*$'
+            time_only_match = re.match(time_only_pattern, line)
+            
+            if time_only_match:
+                time_range = time_only_match.group(1).strip()
+                groups = []
+                i += 1
+                
+                # Collect groups from subsequent lines
+                while i < len(lines):
+                    next_line = lines[i].strip()
+                    if not next_line:
+                        i += 1
+                        continue
+                    
+                    # Check if next line is a new time or date
+                    time_check_pattern = r'^\s*(\d{1,2}:\d{2}(?:am|pm)?-\d{1,2}:\d{2}(?:am|pm)?)'
+                    date_check_pattern = r'^\s*(?:Friday|Saturday)'
+                    if re.match(time_check_pattern, next_line) or re.match(date_check_pattern, next_line, re.IGNORECASE):
+                        break
+                    
+                    next_groups_raw = [g.strip() for g in re.split(r',\s*', next_line) if g.strip()]
+                    for group_name in next_groups_raw:
+                        resolved = resolve_name(group_name, conflict_resolver, current_date, time_range)
+                        if resolved:
+                            groups.append(resolved.upper())
+                    i += 1
+                
+                if groups and current_date in schedule:
+                    schedule[current_date].append({"time": time_range, "groups": groups})
+                    print(f"Added schedule: {current_date}, {time_range}, {groups}")
+                continue
+            
+            # Check for time with groups on the same line
+            time_groups_pattern = r'^\s*(\d{1,2}:\d{2}(?:am|pm)?-\d{1,2}:\d{2}(?:am|pm)?)\s+(.+)$'
+            time_match = re.match(time_groups_pattern, line)
+            
+            if time_match:
+                time_range = time_match.group(1).strip()
+                groups_text = time_match.group(2).strip()
+                
+                groups_raw = [g.strip() for g in re.split(r',\s*', groups_text) if g.strip()]
+                groups = []
+                
+                for group_name in groups_raw:
+                    resolved = resolve_name(group_name, conflict_resolver, current_date, time_range)
+                    if resolved:
+                        groups.append(resolved.upper())
+                
+                # Only add to schedule if we have valid groups
+                if current_date in schedule and groups:
+                    schedule[current_date].append({"time": time_range, "groups": groups})
+                    print(f"Added schedule: {current_date}, {time_range}, {groups}")
+                
+                i += 1
+                
+                # Only check for continuation lines if we added a schedule entry
+                if groups and current_date in schedule and schedule[current_date]:
+                    while i < len(lines):
+                        next_line = lines[i].strip()
+                        if not next_line:
+                            i += 1
+                            continue
+                        
+                        # Check if next line is a new time or date
+                        time_check_pattern = r'^\s*(\d{1,2}:\d{2}(?:am|pm)?-\d{1,2}:\d{2}(?:am|pm)?)'
+                        date_check_pattern = r'^\s*(?:Friday|Saturday)'
+                        if re.match(time_check_pattern, next_line) or re.match(date_check_pattern, next_line, re.IGNORECASE):
+                            break
+                        
+                        next_groups_raw = [g.strip() for g in re.split(r',\s*', next_line) if g.strip()]
+                        next_groups = []
+                        
+                        for group_name in next_groups_raw:
+                            resolved = resolve_name(group_name, conflict_resolver, current_date, time_range)
+                            if resolved:
+                                next_groups.append(resolved.upper())
+                        
+                        if next_groups:
+                            schedule[current_date][-1]["groups"].extend(next_groups)
+                            print(f"Added groups to: {current_date}, {schedule[current_date][-1]['time']}, {schedule[current_date][-1]['groups']}")
+                        i += 1
+                continue
+            
+            # Handle standalone Full Cast lines for cases with no time specified
+            full_cast_check = r'^\s*Full Cast\s*(?:\(optional\))?\s*$'
+            if re.match(full_cast_check, line, re.IGNORECASE) and current_date in schedule:
+                if not schedule[current_date]:
+                    # No time slots yet for this date use default time
+                    day_of_week = datetime.strptime(current_date, '%Y-%m-%d').strftime('%A')
+                    default_time = "5:30pm-9:00pm" if day_of_week == "Friday" else "9:30am-2:00pm"
+                    schedule[current_date].append({"time": default_time, "groups": ["FULL CAST"]})
+                    print(f"Added default FULL CAST schedule: {current_date}, {default_time}, ['FULL CAST']")
+                else:
+                    # There are existing time slots add to the last one
+                    schedule[current_date][-1]["groups"].append("FULL CAST")
+                    print(f"Added FULL CAST to: {current_date}, {schedule[current_date][-1]['time']}, {schedule[current_date][-1]['groups']}")
+                i += 1
+            else:
+                i += 1
+    
+    return schedule
+
+
+
+
+def run(parser, path, names):
+    resolver = StubResolver(names)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        schedule = parser(path, resolver)
+    return schedule, time.perf_counter() - start, resolver.conflicts
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--lines', type=int, default=50000)
+    arg_parser.add_argument('--seed', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    cast_data = load_json("cast.json")
+    group_mappings = load_json("group_mappings.json")
+    names = sorted({r for roles in cast_data['actor_roles'].values() for r in roles} | set(group_mappings))
+
+    fd, path = tempfile.mkstemp(suffix='.txt')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(generate_call_board(args.lines, names, args.seed))
+
+        legacy, legacy_time, legacy_conflicts = run(legacy_parse_schedule, path, names)
+        current, current_time, current_conflicts = run(parse_schedule, path, names)
+    finally:
+        os.remove(path)
+
+    slots = sum(len(s) for s in current.values())
+    print(f"{args.lines} lines, {len(current)} dates, {slots} slots")
+    print(f"legacy parse_schedule: {legacy_time:.3f}s ({legacy_conflicts} conflicts)")
+    print(f"parse_schedule:        {current_time:.3f}s ({current_conflicts} conflicts)")
+    print(f"speedup: {legacy_time / current_time:.2f}x")
+    if legacy != current or legacy_conflicts != current_conflicts:
+        raise SystemExit("Output mismatch between legacy and current parser")
+    print("Output identical.")
+
+
+if __name__ == "__main__":
+    main()
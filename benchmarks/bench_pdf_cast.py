@@ -0,0 +1,62 @@
+"""Benchmark serial vs process-pool page extraction in update_cast_from_pdf.
+
+Run from the repository root (requires pdfplumber):
+
+    python -m benchmarks.bench_pdf_cast [--pages 40] [--workers N]
+
+A synthetic cast PDF is written with a minimal built-in PDF writer, parsed
+with one worker and with a pool, and the results are checked for equality.
+It is then parsed twice more with an empty page cache (pdf_page_cache):
+once to fill it and once reading every page back from it.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import generate_cast_pages, write_pdf
+from pdf_page_cache import PageCache
+from update_cast_from_pdf import parse_cast_list
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--pages', type=int, default=40)
+    arg_parser.add_argument('--workers', type=int, default=None)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'CastList.pdf')
+        write_pdf(path, generate_cast_pages(args.pages))
+
+        start = time.perf_counter()
+        serial = parse_cast_list(path, workers=1)
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = parse_cast_list(path, workers=args.workers)
+        parallel_time = time.perf_counter() - start
+
+        cached_times = []
+        for _ in range(2):
+            cache = PageCache(os.path.join(directory, 'pdf_page_cache'))
+            start = time.perf_counter()
+            cached = parse_cast_list(path, workers=1, cache=cache)
+            cache.save()
+            cached_times.append(time.perf_counter() - start)
+            if cached != serial:
+                raise SystemExit("Output mismatch between cached and uncached extraction")
+
+    print(f"{args.pages} pages, {len(serial[0]['actors'])} actors, {len(serial[1])} roles")
+    print(f"serial extraction:   {serial_time:.3f}s")
+    print(f"parallel extraction: {parallel_time:.3f}s ({args.workers or os.cpu_count()} workers)")
+    print(f"speedup: {serial_time / parallel_time:.2f}x")
+    print(f"page cache, cold:    {cached_times[0]:.3f}s")
+    print(f"page cache, warm:    {cached_times[1]:.3f}s ({cache.report()})")
+    if serial != parallel:
+        raise SystemExit("Output mismatch between serial and parallel extraction")
+    print("Output identical.")
+
+
+if __name__ == "__main__":
+    main()
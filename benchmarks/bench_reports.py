@@ -0,0 +1,71 @@
+"""Benchmark schedule_reports.CallMatrix against per-slot loops over actor_roles.
+
+Run from the repository root (requires numpy):
+
+    python -m benchmarks.bench_reports [--actors 1000] [--slots 2000]
+
+Builds a synthetic season, computes slot headcounts, per-actor call counts
+and idle actors both ways, checks they agree and prints the timings.
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import generate_cast, generate_season
+from schedule_reports import CallMatrix
+
+
+def loop_reports(schedule, cast_data, start, end):
+    actors = cast_data['actors']
+    actor_roles = cast_data['actor_roles']
+    headcounts = []
+    call_counts = {actor: 0 for actor in actors}
+    for day in sorted(schedule):
+        for slot in schedule[day]:
+            called = [actor for actor in actors
+                      if 'FULL CAST' in slot['groups'] or any(role in slot['groups'] for role in actor_roles[actor])]
+            headcounts.append(len(called))
+            if start <= day <= end:
+                for actor in called:
+                    call_counts[actor] += 1
+    idle = [actor for actor in actors if call_counts[actor] == 0]
+    return headcounts, [call_counts[actor] for actor in actors], idle
+
+
+def matrix_reports(schedule, cast_data, start, end):
+    matrix = CallMatrix(schedule, cast_data)
+    mask = matrix.slot_mask(start, end)
+    return (matrix.slot_headcounts().tolist(), matrix.actor_call_counts(mask).tolist(),
+            matrix.idle_actors(mask))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--actors', type=int, default=1000)
+    arg_parser.add_argument('--slots', type=int, default=2000)
+    arg_parser.add_argument('--seed', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    cast_data, _ = generate_cast(args.actors, args.seed)
+    schedule = generate_season(cast_data, args.slots, args.seed)
+    dates = sorted(schedule)
+    # One Friday/Saturday weekend from the middle of the season without a
+    # FULL CAST call, so the actors none of its slots name are idle
+    weekends = [(dates[i], dates[i + 1]) for i in range(0, len(dates) - 1, 2)]
+    weekends = weekends[len(weekends) // 2:] + weekends[:len(weekends) // 2]
+    start, end = next(((friday, saturday) for friday, saturday in weekends
+                       if not any('FULL CAST' in slot['groups'] for slot in schedule[friday] + schedule[saturday])),
+                      weekends[0])
+    print(f"{len(cast_data['actors'])} actors, {sum(len(s) for s in schedule.values())} slots, {len(dates)} days")
+
+    results = {}
+    for label, report in (('loops', loop_reports), ('matrix', matrix_reports)):
+        begin = time.perf_counter()
+        results[label] = report(schedule, cast_data, start, end)
+        print(f"{label:>8}: {time.perf_counter() - begin:.3f}s")
+    assert results['loops'] == results['matrix'], "matrix reports differ from the loop reports"
+    assert results['matrix'][2], f"no idle actors for {start}..{end}"
+    print(f"Reports match ({len(results['matrix'][2])} idle actors for {start}..{end}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Load-test schedule_server.py on localhost.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_server [--clients 20] [--requests 2000] [--url http://localhost:8000]
+
+Without --url a server for the repository's own JSON files is started on a
+free local port. Each client thread mixes /calls queries for random actors and
+date ranges with revalidated (If-None-Match) and fresh gzip downloads of the
+JSON files, the way a rush of families loading index.html would.
+"""
+import argparse
+import gzip
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from urllib.parse import urlencode
+
+from schedule_server import ScheduleRequestHandler, ScheduleServer
+
+ASSETS = ['/cast.json', '/call_times.json']
+
+
+def fetch(url, headers=None):
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def fetch_json(url):
+    status, headers, body = fetch(url, {'Accept-Encoding': 'gzip'})
+    if headers.get('Content-Encoding') == 'gzip':
+        body = gzip.decompress(body)
+    return json.loads(body)
+
+
+def make_requests(base_url, count, seed):
+    actors = fetch_json(base_url + '/cast.json')['actors']
+    dates = sorted({date for calls in fetch_json(base_url + '/call_times.json').values() for date in calls})
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.7:
+            params = [('actor', actor) for actor in rng.sample(actors, rng.randint(1, 3))]
+            if dates and rng.random() < 0.8:
+                first = rng.randrange(len(dates))
+                params += [('from', dates[first]), ('to', dates[min(len(dates) - 1, first + rng.randint(0, 4))])]
+            requests.append(('calls', '/calls?' + urlencode(params)))
+        elif kind < 0.9:
+            requests.append(('revalidate', rng.choice(ASSETS)))
+        else:
+            requests.append(('download', rng.choice(ASSETS)))
+    return requests
+
+
+def run_client(base_url, requests, etags, results):
+    for kind, path in requests:
+        headers = {'Accept-Encoding': 'gzip'}
+        if kind == 'revalidate':
+            headers['If-None-Match'] = etags[path]
+        start = time.perf_counter()
+        status, _, body = fetch(base_url + path, headers)
+        results.append((kind, status, len(body), time.perf_counter() - start))
+
+
+def percentile(values, share):
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--url', help="server to test (default: start one on a free local port)")
+    arg_parser.add_argument('--clients', type=int, default=20)
+    arg_parser.add_argument('--requests', type=int, default=2000, help="total requests across all clients")
+    arg_parser.add_argument('--seed', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server = ScheduleServer(('127.0.0.1', 0), ScheduleRequestHandler, quiet=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    base_url = base_url.rstrip('/')
+
+    requests = make_requests(base_url, args.requests, args.seed)
+    etags = {path: fetch(base_url + path)[1]['ETag'] for path in ASSETS}
+    results = []
+    clients = [threading.Thread(target=run_client, args=(base_url, requests[i::args.clients], etags, results))
+               for i in range(args.clients)]
+    start = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(results)} requests from {args.clients} clients in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.0f} req/s) against {base_url}")
+    print(f"{'request':>12} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'avg KB':>8}  statuses")
+    for kind in ('calls', 'revalidate', 'download'):
+        rows = [r for r in results if r[0] == kind]
+        if not rows:
+            continue
+        latencies = sorted(r[3] * 1000 for r in rows)
+        statuses = Counter(r[1] for r in rows)
+        print(f"{kind:>12} {len(rows):>7} {percentile(latencies, 0.5):>8.2f} {percentile(latencies, 0.95):>8.2f} "
+              f"{percentile(latencies, 0.99):>8.2f} {sum(r[2] for r in rows) / len(rows) / 1024:>8.1f}  "
+              f"{dict(sorted(statuses.items()))}")
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
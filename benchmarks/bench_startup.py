@@ -0,0 +1,136 @@
+"""Time each schedule_cli.py subcommand from a cold interpreter.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup [--repeat 5]
+
+A synthetic show of one real show's size (benchmarks.synthetic) is written
+to a temporary folder and every subcommand is run there in a new Python
+process, the way a wrapper script or a scheduled task would start it. For
+each one the best of --repeat runs is kept for:
+
+    help     "<command> --help": interpreter start, the subcommand's imports
+             and its argument parser, with no work done
+    run      the whole command; serve and watch are timed until they are
+             ready (the server is listening, the watcher is waiting)
+    import   the subcommand module's own import time (python -X importtime)
+
+and the heavy optional modules the run actually loaded are listed, so a
+subcommand that starts pulling in tkinter or pdfplumber when it does not
+need them shows up here. "python -c pass" is the floor every command pays.
+"""
+import argparse
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import call_board_names, cast_csv, cast_pages, generate_call_board, generate_cast, write_pdf
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, 'schedule_cli.py')
+
+ACTORS = 70
+LINES = 600
+TYPO_RATE = 0.05
+HEAVY_MODULES = ['tkinter', 'pdfplumber', 'numpy', 'cProfile', 'concurrent.futures']
+IMPORT_TIME_RE = re.compile(r'^import time:\s+\d+ \|\s+(\d+) \|(\s*)(\S+)$')
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+
+def write_show(directory, seed=1):
+    cast_data, group_mappings = generate_cast(ACTORS, seed)
+    os.makedirs(os.path.join(directory, 'Cast_List'))
+    os.makedirs(os.path.join(directory, 'Call_Schedule'))
+    with open(os.path.join(directory, 'Cast_List', 'CastList.csv'), 'w', encoding='utf-8') as f:
+        f.write(cast_csv(cast_data, group_mappings))
+    write_pdf(os.path.join(directory, 'Cast_List', 'CastList.pdf'), cast_pages(cast_data, group_mappings))
+    with open(os.path.join(directory, 'Call_Schedule', 'CallSchedule.txt'), 'w', encoding='utf-8') as f:
+        f.write(generate_call_board(LINES, call_board_names(cast_data, group_mappings), seed, TYPO_RATE))
+
+
+def commands():
+    """(label, schedule_cli arguments, module, line printed once ready or None to wait for exit)."""
+    found = [('cast csv', ['cast', '--from', 'csv', '-q'], 'update_cast_from_csv', None)]
+    if subprocess.run([sys.executable, '-c', 'import pdfplumber'], capture_output=True).returncode == 0:
+        found.append(('cast pdf', ['cast', '--from', 'pdf', '--workers', '1'], 'update_cast_from_pdf', None))
+    found += [
+        ('build', ['build', '--batch', '--full'], 'update_schedules', None),
+        ('report', ['report'], 'schedule_reports', None),
+        ('serve', ['serve', '--port', str(free_port()), '--bind', 'localhost', '-q'], 'schedule_server', 'Serving '),
+        ('watch', ['watch', '--batch', '--poll'], 'watch_show', 'Watching for changes'),
+    ]
+    return found
+
+
+def run_once(argv, directory, ready=None, extra=()):
+    """(seconds until exit or until the ready line is printed, stderr)."""
+    env = dict(os.environ, PYTHONUNBUFFERED='1')
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, *extra, *argv], cwd=directory, env=env, text=True,
+                               stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if ready is None:
+        _, stderr = process.communicate()
+        seconds = time.perf_counter() - start
+        if process.returncode:
+            raise RuntimeError(f"{' '.join(argv)} failed:\n{stderr}")
+        return seconds, stderr
+    for line in process.stdout:
+        if line.startswith(ready):
+            break
+    seconds = time.perf_counter() - start
+    process.terminate()
+    _, stderr = process.communicate()
+    return seconds, stderr
+
+
+def best_of(repeat, argv, directory, ready=None):
+    return min(run_once(argv, directory, ready)[0] for _ in range(repeat))
+
+
+def import_profile(argv, directory, module, ready=None):
+    """(seconds to import module, sorted heavy modules loaded) from one python -X importtime run."""
+    _, stderr = run_once(argv, directory, ready, ('-X', 'importtime'))
+    module_seconds = 0.0
+    loaded = set()
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_RE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = match.groups()
+        if name == module and len(indent) == 1:
+            module_seconds = int(cumulative) / 1e6
+        if name in HEAVY_MODULES:
+            loaded.add(name)
+    return module_seconds, sorted(loaded)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--repeat', type=int, default=5, help="keep the best of this many runs")
+    arg_parser.add_argument('--seed', type=int, default=1)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_show(directory, args.seed)
+        floor = best_of(args.repeat, ['-c', 'pass'], directory)
+        print(f"python -c pass: {floor * 1000:.1f} ms\n")
+        print(f"{'command':<10} {'help ms':>9} {'run ms':>9} {'import ms':>10}  heavy modules loaded")
+        for label, cli_args, module, ready in commands():
+            help_seconds = best_of(args.repeat, [CLI, *cli_args, '--help'], directory)
+            run_seconds = best_of(args.repeat, [CLI, *cli_args], directory, ready)
+            module_seconds, loaded = import_profile([CLI, *cli_args], directory, module, ready)
+            print(f"{label:<10} {help_seconds * 1000:>9.1f} {run_seconds * 1000:>9.1f} {module_seconds * 1000:>10.1f}  "
+                  f"{', '.join(loaded) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Run each pipeline stage on synthetic shows of several sizes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_suite [--sizes 1,10] [--stages parse,build] [--json results.json]
+
+Size 1 is about one real show: 70 actors, a 600-line call board and 100
+rehearsal slots; size 10 is ten times that, and so on. Every input comes from
+benchmarks.synthetic with a fixed seed, and conflicts are resolved without
+dialogs (StubResolver, or BatchResolver for parse-batch), so runs are
+comparable across commits. For each stage and size the suite keeps the best
+of --repeat timed runs, then runs it once more under tracemalloc, and
+prints throughput and peak Python memory. Sizes of 100 and more take a while
+and several GB; pick the stages with --stages:
+
+    csv          update_cast_from_csv.parse_cast_list on CastList.csv rows
+    pdf          update_cast_from_pdf.parse_cast_list on cast list pages
+                 (skipped when pdfplumber is not installed)
+    parse        parse_schedule on call board lines, 5% of names misspelled
+    parse-batch  the same with BatchResolver ranking the misspellings; every
+                 distinct misspelling is ranked against the whole cast, so
+                 this grows with size squared (tens of seconds at size 10)
+    build        call_times, call_windows and the compact export per slot
+    calendars    every actor's .ics feed, per actor
+    reports      schedule_reports.CallMatrix per slot (needs numpy)
+    query        schedule_server.CallIndex lookups of one actor's month
+"""
+import argparse
+import contextlib
+import copy
+import importlib.util
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import (StubResolver, call_board_names, cast_csv, cast_pages, generate_call_board,
+                                  generate_cast, generate_season, write_pdf)
+from calendar_feeds import actor_events, render_feed
+from compact_export import compact_bytes, encode_compact
+from schedule_server import CallIndex
+from update_cast_from_csv import parse_cast_list as parse_cast_csv
+from update_schedules import (BatchResolver, build_call_times, build_call_windows, iter_call_labels,
+                              parse_schedule)
+
+BASE_ACTORS = 70
+BASE_LINES = 600
+BASE_SLOTS = 100
+BASE_QUERIES = 2000
+TYPO_RATE = 0.05
+
+
+def csv_stage(cast_data, group_mappings, size, seed, directory):
+    path = os.path.join(directory, 'CastList.csv')
+    text = cast_csv(cast_data, group_mappings)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    return text.count('\n') - 1, 'rows', lambda: parse_cast_csv(path, quiet=True)
+
+
+def pdf_stage(cast_data, group_mappings, size, seed, directory):
+    if importlib.util.find_spec('pdfplumber') is None:
+        return None
+    from update_cast_from_pdf import parse_cast_list as parse_cast_pdf
+    path = os.path.join(directory, 'CastList.pdf')
+    pages = cast_pages(cast_data, group_mappings)
+    write_pdf(path, pages)
+    return len(pages), 'pages', lambda: parse_cast_pdf(path, workers=1)
+
+
+def write_call_board(cast_data, group_mappings, size, seed, directory):
+    path = os.path.join(directory, 'CallSchedule.txt')
+    if not os.path.exists(path):
+        board = generate_call_board(BASE_LINES * size, call_board_names(cast_data, group_mappings), seed, TYPO_RATE)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(board)
+    return path
+
+
+def parse_stage(cast_data, group_mappings, size, seed, directory):
+    path = write_call_board(cast_data, group_mappings, size, seed, directory)
+    names = call_board_names(cast_data, group_mappings)
+    return BASE_LINES * size, 'lines', lambda: parse_schedule(path, StubResolver(names))
+
+
+def parse_batch_stage(cast_data, group_mappings, size, seed, directory):
+    path = write_call_board(cast_data, group_mappings, size, seed, directory)
+
+    def run():
+        # Auto-matches add roles to the cast, so every run starts from a fresh copy
+        return parse_schedule(path, BatchResolver(copy.deepcopy(cast_data), dict(group_mappings)))
+    return BASE_LINES * size, 'lines', run
+
+
+def build_stage(cast_data, group_mappings, size, seed, directory):
+    schedule = generate_season(cast_data, BASE_SLOTS * size, seed)
+
+    def run():
+        build_call_times(schedule, cast_data, group_mappings)
+        build_call_windows(schedule, cast_data)
+        return compact_bytes(encode_compact(cast_data['actors'], iter_call_labels(schedule, cast_data, group_mappings)))
+    return BASE_SLOTS * size, 'slots', run
+
+
+def calendars_stage(cast_data, group_mappings, size, seed, directory):
+    schedule = generate_season(cast_data, BASE_SLOTS * size, seed)
+    calls = list(iter_call_labels(schedule, cast_data, group_mappings))
+
+    def run():
+        events = actor_events(calls)
+        return [render_feed(actor, events.get(actor, []), '20250101T000000Z') for actor in cast_data['actors']]
+    return len(cast_data['actors']), 'feeds', run
+
+
+def reports_stage(cast_data, group_mappings, size, seed, directory):
+    try:
+        from schedule_reports import CallMatrix
+    except ImportError:
+        return None
+    schedule = generate_season(cast_data, BASE_SLOTS * size, seed)
+
+    def run():
+        matrix = CallMatrix(schedule, cast_data)
+        return matrix.slot_headcounts(), matrix.actor_call_counts()
+    return BASE_SLOTS * size, 'slots', run
+
+
+def query_stage(cast_data, group_mappings, size, seed, directory):
+    schedule = generate_season(cast_data, BASE_SLOTS * size, seed)
+    call_times = build_call_times(schedule, cast_data, group_mappings)
+    dates = sorted(schedule)
+    rng = random.Random(seed)
+    queries = [(rng.choice(cast_data['actors']).lower(), rng.choice(dates)[:7]) for _ in range(BASE_QUERIES * size)]
+
+    def run():
+        index = CallIndex(cast_data, call_times)
+        for name, month in queries:
+            index.calls(index.lookup(name), f"{month}-01", f"{month}-31")
+    return len(queries), 'queries', run
+
+
+STAGES = {
+    'csv': csv_stage,
+    'pdf': pdf_stage,
+    'parse': parse_stage,
+    'parse-batch': parse_batch_stage,
+    'build': build_stage,
+    'calendars': calendars_stage,
+    'reports': reports_stage,
+    'query': query_stage,
+}
+
+
+def measure(run, repeat):
+    """(best seconds of repeat runs, peak traced bytes of one more run); the stage's prints are discarded."""
+    best = None
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--sizes', default='1,10', help="comma-separated multiples of one show")
+    arg_parser.add_argument('--stages', default=','.join(STAGES), help=f"comma-separated, from: {', '.join(STAGES)}")
+    arg_parser.add_argument('--seed', type=int, default=1)
+    arg_parser.add_argument('--repeat', type=int, default=3, help="keep the best of this many timed runs")
+    arg_parser.add_argument('--json', metavar='FILE', help="also save the results to FILE")
+    args = arg_parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+    stages = args.stages.split(',')
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        arg_parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    results = []
+    print(f"{'stage':<12} {'size':>5} {'items':>9} {'unit':<8} {'seconds':>9} {'items/s':>11} {'peak MB':>9}")
+    for size in sizes:
+        cast_data, group_mappings = generate_cast(BASE_ACTORS * size, args.seed)
+        with tempfile.TemporaryDirectory() as directory:
+            for stage in stages:
+                setup = STAGES[stage](cast_data, group_mappings, size, args.seed, directory)
+                if setup is None:
+                    print(f"{stage:<12} {size:>5} skipped (missing dependency)")
+                    continue
+                items, unit, run = setup
+                seconds, peak = measure(run, args.repeat)
+                results.append({'stage': stage, 'size': size, 'items': items, 'unit': unit,
+                                'seconds': round(seconds, 6), 'items_per_second': round(items / seconds, 1),
+                                'peak_bytes': peak})
+                print(f"{stage:<12} {size:>5} {items:>9} {unit:<8} {seconds:>9.4f} {items / seconds:>11,.0f} "
+                      f"{peak / 2 ** 20:>9.2f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'seed': args.seed, 'repeat': args.repeat, 'results': results}, f, indent=2)
+        print(f"Results saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
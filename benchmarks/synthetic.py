@@ -0,0 +1,299 @@
+"""Seeded synthetic shows for the benchmarks.
+
+Everything here is deterministic for a given seed, so benchmark runs at the
+same size can be compared across commits:
+
+    generate_cast          cast.json/group_mappings.json for N actors: named
+                           principal roles, numbered ensemble parts, groups,
+                           actors with several roles and group memberships
+    cast_csv               that cast as a Cast_List/CastList.csv
+    cast_pages             that cast as the lines of cast list PDF pages
+    generate_cast_pages    pages of a callboard-style cast list with random
+                           names, for parser throughput
+    write_pdf              a minimal PDF writer for those pages
+    generate_call_board    CallSchedule.txt text: times with groups, time-only
+                           lines, continuation lines, Full Cast lines, notes,
+                           unknown names and (optionally) misspelled names
+    generate_season        an already parsed schedules.json
+
+StubResolver stands in for ConflictResolver so parsing never opens a dialog.
+"""
+import csv
+import io
+import random
+from datetime import date, timedelta
+from itertools import islice
+
+FIRST_NAMES = ["Ava", "Ben", "Cora", "Dylan", "Ella", "Finn", "Grace", "Henry", "Isla", "Jack",
+               "Kyla", "Liam", "Mia", "Noah", "Olive", "Piper", "Quinn", "Ruby", "Sam", "Tessa"]
+LAST_NAMES = ["Bassler", "Blank", "Cass", "Gann", "Hernandez", "Martinez", "Pann", "Springer",
+              "Schmidt", "Parker", "Smith", "Olson", "Cutts", "Matias", "Clauser", "Geiger"]
+# More names for generate_cast, so large casts need few hyphenated surnames
+MORE_FIRST_NAMES = ["Aden", "Brody", "Charlie", "Emily", "Gideon", "Isabelle", "Joie", "Lucy", "Maggie", "Ryan",
+                    "Selah", "Talia", "Tavian", "Violet", "Lydia", "Lucas", "Jacob", "Antonio", "Ainsley", "Abby"]
+MORE_LAST_NAMES = ["Bast", "Corchado", "Masik", "Pendolino", "Radewahn", "Johnson", "Konopka", "VerKuilen",
+                   "Spitzer", "Gahagan", "Dohrmann", "Nguyen", "Kowalski", "Becker", "Weber", "Novak",
+                   "Lopez", "Reyes", "Fischer", "Meyer", "Hoffmann", "Jansen", "Larsen", "Moreau"]
+CHARACTERS = ["SpongeBob", "Patrick Star", "Sandy Cheeks", "Squidward", "Plankton", "Karen", "Mr. Krabs",
+              "Pearl Krabs", "Patchy The Pirate", "French Narrator", "Perch Perkins", "Mrs. Puff",
+              "Larry The Lobster", "Old Man Jenkins", "Buster Bluetang", "Johnny The Bartender",
+              "Mayor Of Bikini Bottom", "Foley Fish", "Electric Skate", "Girl Fish"]
+GROUP_WORDS = (["Plankton", "Pirate", "Money", "Sardine", "Jellyfish", "Reef", "Town", "Krusty", "Surf", "Anchor"],
+               ["Posse", "Dancers", "Singers", "Crew", "Chorus", "Band", "Kids", "Ensemble"])
+# Group names have no digits: the PDF grammar only reads letters in a group header
+GROUP_PLACES = ["North", "South", "East", "West", "Upstage", "Downstage", "Junior", "Senior"]
+
+TIMES = ["5:30-8:30", "5:30-9:00", "6:15-9:00", "6:30-9:00", "9:30-2:00", "9:00-9:25", "10:00-12:00pm", "1:00pm-2:00pm"]
+LINES_PER_PAGE = 45
+
+
+def actor_names(count, rng):
+    """count distinct 'First Last' names; hyphenated surnames once the plain ones run out."""
+    firsts = FIRST_NAMES + MORE_FIRST_NAMES
+    lasts = LAST_NAMES + MORE_LAST_NAMES
+    names = [f"{first} {last}" for first in firsts for last in lasts]
+    names += islice((f"{first} {last}-{other}" for first in firsts for last in lasts for other in lasts
+                     if other != last), max(0, count - len(names)))
+    if count > len(names):
+        raise ValueError(f"at most {len(names)} synthetic actors")
+    return rng.sample(names, count)
+
+
+def group_names(count):
+    """count distinct group names; past every word pairing a place is added ('Reef Dancers North')."""
+    pairs = [f"{first} {second}" for first in GROUP_WORDS[0] for second in GROUP_WORDS[1]]
+    names = pairs + [f"{pair} {place}" for place in GROUP_PLACES for pair in pairs]
+    if count > len(names):
+        raise ValueError(f"at most {len(names)} synthetic groups")
+    return names[:count]
+
+
+def generate_cast(actor_count, seed=1):
+    """(cast_data, group_mappings) shaped like update_cast_from_csv.py output.
+
+    About a third of the actors play a named or numbered principal role and
+    some of those play two; everyone is in one to three groups of ~12, and
+    group_mappings lists the groups as the real file does.
+    """
+    rng = random.Random(seed)
+    actors = actor_names(actor_count, rng)
+    groups = [g.upper() for g in group_names(max(1, actor_count // 12))]
+    principal_count = max(1, actor_count // 3)
+    principals = [CHARACTERS[i] if i < len(CHARACTERS) else f"{CHARACTERS[i % len(CHARACTERS)]} {i // len(CHARACTERS) + 1}"
+                  for i in range(principal_count)]
+
+    cast_data = {"actors": actors, "actor_roles": {actor: [] for actor in actors}}
+    players = rng.sample(actors, min(principal_count, actor_count))
+    for role, actor in zip(principals, players):
+        cast_data["actor_roles"][actor].append(role.upper())
+    # Double casting: some principals also take a second part
+    for actor, role in zip(rng.sample(players, len(players) // 5), reversed(principals)):
+        if role.upper() not in cast_data["actor_roles"][actor]:
+            cast_data["actor_roles"][actor].append(role.upper())
+    for actor in actors:
+        for group in rng.sample(groups, min(len(groups), rng.choice([1, 1, 2, 3]))):
+            cast_data["actor_roles"][actor].append(group)
+
+    return cast_data, {group: group for group in groups}
+
+
+def cast_csv(cast_data, group_mappings):
+    """CastList.csv text: principal rows first, then one 'y' row per group member.
+
+    parse_cast_list() adds the last group seen to every later principal row, so
+    the groups have to come last to read back as the same cast.
+    """
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(["Role", "Actor", "Group (y/n)"])
+    for actor in cast_data["actors"]:
+        for role in cast_data["actor_roles"][actor]:
+            if role not in group_mappings:
+                writer.writerow([role.title(), actor, "n"])
+    for group in group_mappings:
+        for actor in cast_data["actors"]:
+            if group in cast_data["actor_roles"][actor]:
+                writer.writerow([group.title(), actor, "y"])
+    return out.getvalue()
+
+
+def call_board_names(cast_data, group_mappings):
+    """Role and group names as a stage manager would type them (title case)."""
+    names = {r for roles in cast_data['actor_roles'].values() for r in roles} | set(group_mappings)
+    return sorted(name.title() for name in names)
+
+
+def misspell(name, rng):
+    """Drop, double or swap one letter (never the first)."""
+    if len(name) < 4:
+        return name + name[-1]
+    i = rng.randrange(1, len(name) - 1)
+    kind = rng.random()
+    if kind < 0.4:
+        return name[:i] + name[i + 1:]
+    if kind < 0.7:
+        return name[:i] + name[i] + name[i:]
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+
+def generate_call_board(line_count, names, seed=1, typo_rate=0.0):
+    """About line_count lines of Friday/Saturday call board for the given role and group names."""
+    rng = random.Random(seed)
+    lines = []
+    day = date(2025, 9, 5)
+    while len(lines) < line_count:
+        friday = day.strftime('%B') + " " + str(day.day)
+        lines.append(rng.choice(["Friday ", "Friday, ", "FRIDAY "]) + friday + rng.choice([":", "", ", 2025"]))
+        for _ in range(rng.randint(0, 8)):
+            lines.append(make_slot_lines(rng, names, typo_rate))
+        saturday = day + timedelta(days=1)
+        lines.append("Saturday " + saturday.strftime('%B') + " " + str(saturday.day) + ":")
+        for _ in range(rng.randint(0, 8)):
+            lines.append(make_slot_lines(rng, names, typo_rate))
+        day += timedelta(days=7)
+        if day.year > 2025:
+            day = date(2025, 1, 3)
+    return "\n".join(lines[:line_count]) + "\n"
+
+
+def make_slot_lines(rng, names, typo_rate=0.0):
+    def pick(count):
+        picked = rng.sample(names, count)
+        if typo_rate:
+            picked = [misspell(name, rng) if rng.random() < typo_rate else name for name in picked]
+        return ", ".join(picked)
+
+    kind = rng.random()
+    picked = pick(rng.randint(1, 6))
+    if kind < 0.05:
+        return rng.choice(["Full Cast", "FULL CAST (optional)", "Worship"])
+    if kind < 0.1:
+        return rng.choice(["", "Notes for the week", "Friday rehearsal moved"])
+    if kind < 0.15:
+        return "Misspeled Role, Unknown Name?"
+    if kind < 0.3:
+        return rng.choice(TIMES) + "\n" + picked + "\n" + pick(2)
+    if kind < 0.45:
+        return rng.choice(TIMES) + " " + picked + "\n" + pick(2)
+    return rng.choice(TIMES) + " " + picked
+
+
+def generate_season(cast_data, slot_count, seed=1):
+    """Friday/Saturday rehearsals with ~6 slots a day calling roles and groups."""
+    rng = random.Random(seed)
+    roles = sorted({role for roles in cast_data['actor_roles'].values() for role in roles})
+    schedule = {}
+    day = date(2025, 9, 12)
+    slots = 0
+    while slots < slot_count:
+        for offset, times in ((0, ['5:30-7:00', '5:30-9:00', '6:15-9:00', '7:00-9:00']),
+                              (1, ['9:30-11:00', '9:30-2:00', '11:00-2:00', '12:30-2:00'])):
+            slots_today = []
+            for _ in range(min(6, slot_count - slots)):
+                groups = ['FULL CAST'] if rng.random() < 0.03 else rng.sample(roles, rng.randint(1, 6))
+                slots_today.append({'time': rng.choice(times), 'groups': groups})
+                slots += 1
+            schedule[(day + timedelta(days=offset)).isoformat()] = slots_today
+        day += timedelta(days=7)
+    return schedule
+
+
+def generate_cast_pages(page_count, seed=1):
+    """Callboard-style pages: 'ROLE: Actor' lines and group blocks with actor lists."""
+    rng = random.Random(seed)
+    pages = []
+    role_number = 0
+    for page in range(page_count):
+        lines = [f"CAST LIST - PAGE {page + 1}"]
+        while len(lines) < LINES_PER_PAGE:
+            if rng.random() < 0.7:
+                role_number += 1
+                lines.append(f"Role {role_number}: {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}")
+            else:
+                lines.append(f"ENSEMBLE {rng.randint(1, 30)}:")
+                for _ in range(rng.randint(3, 10)):
+                    lines.append(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}")
+        pages.append(lines[:LINES_PER_PAGE])
+    return pages
+
+
+def cast_pages(cast_data, group_mappings):
+    """A generate_cast() cast laid out like a callboard PDF: 'Role: Actor' lines, then group blocks.
+
+    A group that runs onto the next page repeats its header there.
+    """
+    pages = [["CAST LIST"]]
+
+    def add(line, group=None):
+        if len(pages[-1]) == LINES_PER_PAGE:
+            pages.append([f"{group}:"] if group else [])
+        pages[-1].append(line)
+
+    for actor in cast_data["actors"]:
+        for role in cast_data["actor_roles"][actor]:
+            if role not in group_mappings:
+                add(f"{role.title()}: {actor}")
+    for group in group_mappings:
+        add(f"{group}:")
+        for actor in cast_data["actors"]:
+            if group in cast_data["actor_roles"][actor]:
+                add(actor, group)
+    return pages
+
+
+def pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path, pages):
+    """Write a bare-bones PDF with one Helvetica text block per page."""
+    objects = []
+    page_ids = []
+    font_id = 3
+    for page_lines in pages:
+        stream = "BT /F1 11 Tf 13 TL 50 760 Td\n" + "".join(
+            f"({pdf_escape(line)}) Tj T*\n" for line in page_lines) + "ET"
+        content_id = 4 + len(objects)
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        page_ids.append(4 + len(objects))
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>")
+    kids = " ".join(f"{i} 0 R" for i in page_ids)
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>",
+               f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>",
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"] + objects
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1')
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode('latin-1')
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('latin-1')
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+class StubResolver:
+    """Non-interactive stand-in for ConflictResolver.
+
+    Known names are valid; unknown names are ignored when they end in '?',
+    otherwise mapped to FULL CAST, so every parser sees the same decisions.
+    """
+
+    def __init__(self, names):
+        self.names = {n.upper() for n in names}
+        self.names.add("FULL CAST")
+        self.conflicts = 0
+
+    def is_valid_name(self, name):
+        return name.upper() in self.names
+
+    def resolve_conflict(self, conflicting_name, current_date=None, current_time=None):
+        self.conflicts += 1
+        if conflicting_name.endswith('?'):
+            return None
+        return 'FULL CAST'
@@ -0,0 +1,212 @@
+"""iCalendar (.ics) feeds of each actor's calls, for parents to subscribe to.
+
+One calendars/<name>.ics per actor, with an event for every slot the actor is
+called to, labelled the way index.html shows it ("PLANKTON 5:30-9:00"). Each
+slot's UID is derived from its date, its time and how many slots at that
+time came before it on the day, so a calendar app updates an event in place
+when the feed is refreshed, including when different groups are called to
+it. The groups are in the event's description; when they change the event's
+SEQUENCE goes up and LAST-MODIFIED is set to the build that changed them.
+
+calendars/feeds.json records the file name and a hash of the events of every
+feed, and each slot's revision (see slot_revision()). A feed is only
+rendered and rewritten when its actor's events hash differently from the
+last build, so a typical schedule edit touches a handful of files instead of
+one per cast member.
+"""
+import hashlib
+import os
+import re
+from datetime import datetime, timezone
+
+from show_store import load_json, save_json
+from time_intervals import slot_interval
+
+FEEDS_VERSION = 2
+PRODID = "-//CYT Milwaukee//Rehearsal Schedule//EN"
+
+# RFC 5545 content lines are folded at 75 octets
+FOLD_LENGTH = 75
+
+# Call times are Milwaukee wall-clock times. Without a TZID some calendar
+# apps read them as UTC and move every call by five or six hours.
+TIMEZONE = "America/Chicago"
+VTIMEZONE = [
+    'BEGIN:VTIMEZONE',
+    f'TZID:{TIMEZONE}',
+    'BEGIN:DAYLIGHT',
+    'TZOFFSETFROM:-0600',
+    'TZOFFSETTO:-0500',
+    'TZNAME:CDT',
+    'DTSTART:19700308T020000',
+    'RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=2SU',
+    'END:DAYLIGHT',
+    'BEGIN:STANDARD',
+    'TZOFFSETFROM:-0500',
+    'TZOFFSETTO:-0600',
+    'TZNAME:CST',
+    'DTSTART:19701101T020000',
+    'RRULE:FREQ=YEARLY;BYMONTH=11;BYDAY=1SU',
+    'END:STANDARD',
+    'END:VTIMEZONE',
+]
+
+
+def feed_name(actor, taken):
+    """File name for an actor's feed: 'joe-bob.ics', or 'joe-bob-2.ics' if that is taken."""
+    slug = re.sub(r'[^a-z0-9]+', '-', actor.lower()).strip('-') or 'actor'
+    name = f"{slug}.ics"
+    number = 2
+    while name in taken:
+        name = f"{slug}-{number}.ics"
+        number += 1
+    return name
+
+
+def slot_uid(date, slot, occurrence, show_id=None):
+    """UID for the occurrence'th slot at its time on date; the groups it calls do not matter."""
+    key = f"{date}|{slot['time']}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    suffix = f"-{occurrence}" if occurrence else ""
+    return f"{date.replace('-', '')}-{digest}{suffix}@{show_id or 'schedule'}.rehearsals"
+
+
+def slot_revision(slot, previous, stamp):
+    """{'groups', 'sequence', 'modified'} for a slot, given its revision from the last build (or None).
+
+    The SEQUENCE goes up and LAST-MODIFIED becomes stamp only when the
+    groups called to the slot changed.
+    """
+    groups = hashlib.sha1('|'.join(slot['groups']).encode('utf-8')).hexdigest()[:16]
+    if previous is None:
+        return {'groups': groups, 'sequence': 0, 'modified': stamp}
+    if previous['groups'] == groups:
+        return previous
+    return {'groups': groups, 'sequence': previous['sequence'] + 1, 'modified': stamp}
+
+
+def actor_events(calls, show_id=None, revisions=None, stamp=None):
+    """{actor: [event]} from iter_call_labels() output, in date order.
+
+    revisions is {uid: slot_revision()} from the last build.
+    """
+    revisions = revisions or {}
+    stamp = stamp or datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    events = {}
+    # Slots at the same time on the same day are told apart by how many came before
+    seen = {}
+    for date, slot, labels in calls:
+        key = (date, slot['time'])
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+        uid = slot_uid(date, slot, occurrence, show_id)
+        revision = slot_revision(slot, revisions.get(uid), stamp)
+        interval = slot_interval(slot['time'], date)
+        for actor, label in labels.items():
+            events.setdefault(actor, []).append({'uid': uid, 'date': date, 'interval': interval, 'summary': label,
+                                                 'groups': slot['groups'], 'revision': revision})
+    return events
+
+
+def events_hash(actor, events):
+    digest = hashlib.sha256(f"{TIMEZONE}|{actor}".encode('utf-8'))
+    for event in events:
+        revision = event['revision']
+        digest.update(repr((event['uid'], event['date'], event['interval'], event['summary'],
+                            revision['sequence'], revision['modified'])).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def escape_text(text):
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def fold_line(line):
+    """Split a content line into 75-octet pieces, continued with a leading space."""
+    data = line.encode('utf-8')
+    if len(data) <= FOLD_LENGTH:
+        return line
+    pieces = []
+    start = 0
+    limit = FOLD_LENGTH
+    while start < len(data):
+        end = min(start + limit, len(data))
+        # Do not split a multi-byte character
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        pieces.append(data[start:end].decode('utf-8'))
+        start = end
+        limit = FOLD_LENGTH - 1
+    return '\r\n '.join(pieces)
+
+
+def render_feed(actor, events, stamp):
+    """The .ics text for one actor (CRLF line endings, as the format requires)."""
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{escape_text(actor)} - rehearsal calls',
+        f'X-WR-TIMEZONE:{TIMEZONE}',
+    ] + VTIMEZONE
+    for event in events:
+        day = event['date'].replace('-', '')
+        revision = event['revision']
+        lines += ['BEGIN:VEVENT', f"UID:{event['uid']}", f'DTSTAMP:{stamp}',
+                  f"SEQUENCE:{revision['sequence']}", f"LAST-MODIFIED:{revision['modified']}"]
+        if event['interval'] is None:
+            # Time not readable: an all-day event that still shows the call label
+            lines.append(f'DTSTART;VALUE=DATE:{day}')
+        else:
+            start, end = event['interval']
+            lines.append(f'DTSTART;TZID={TIMEZONE}:{day}T{start // 60:02d}{start % 60:02d}00')
+            lines.append(f'DTEND;TZID={TIMEZONE}:{day}T{end // 60:02d}{end % 60:02d}00')
+        lines.append(f"SUMMARY:{escape_text(event['summary'])}")
+        if event['groups']:
+            lines.append(f"DESCRIPTION:{escape_text('Called: ' + ', '.join(event['groups']))}")
+        lines.append('END:VEVENT')
+    lines.append('END:VCALENDAR')
+    return ''.join(fold_line(line) + '\r\n' for line in lines)
+
+
+def save_calendars(paths, actors, calls, generation):
+    """Stage the feeds of actors whose calls changed; returns (regenerated, total).
+
+    Feeds of actors no longer in the cast are removed.
+    """
+    previous = load_json(paths['calendar_manifest']) or {}
+    if previous.get('version') != FEEDS_VERSION:
+        previous = {}
+    previous_feeds = previous.get('feeds', {})
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    events = actor_events(calls, paths['show_id'], previous.get('slots'), stamp)
+
+    # Keep every actor's existing file name so subscriptions keep working
+    current = set(actors)
+    taken = {feed['file'] for actor, feed in previous_feeds.items() if actor in current}
+    feeds = {}
+    regenerated = 0
+    for actor in actors:
+        actor_list = events.get(actor, [])
+        feed = previous_feeds.get(actor)
+        if feed is None:
+            feed = {'file': feed_name(actor, taken)}
+            taken.add(feed['file'])
+        filepath = os.path.join(paths['calendars'], feed['file'])
+        feed_hash = events_hash(actor, actor_list)
+        if feed.get('hash') != feed_hash or not os.path.exists(filepath):
+            generation.stage(filepath, render_feed(actor, actor_list, stamp).encode('utf-8'))
+            regenerated += 1
+        feeds[actor] = {'file': feed['file'], 'hash': feed_hash}
+
+    files = {feed['file'] for feed in feeds.values()}
+    for actor, feed in previous_feeds.items():
+        if actor not in feeds and feed['file'] not in files:
+            generation.remove(os.path.join(paths['calendars'], feed['file']))
+    slots = {event['uid']: event['revision'] for actor_list in events.values() for event in actor_list}
+    save_json({'version': FEEDS_VERSION, 'feeds': feeds, 'slots': dict(sorted(slots.items()))},
+              paths['calendar_manifest'], generation)
+    return regenerated, len(feeds)
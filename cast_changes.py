@@ -0,0 +1,253 @@
+"""What changed between two versions of the cast, and what to carry across.
+
+Every name the call board can use is a role in cast.json or a key of
+group_mappings.json. The cast scripts map every role to itself, so roles and
+groups are the same kind of name here; a group is simply held by several
+actors. diff_casts() compares two casts by those names and who holds them:
+
+    actors_added, actors_removed   actors who joined or left the cast
+    roles_added, roles_removed     names that appeared or are gone
+    roles_moved                    {name: {'from': [actors], 'to': [actors]}}
+                                   for names that lost or gained holders
+    groups_renamed                 {old: new} when a name disappeared and
+                                   exactly one new name has the same holders
+    mappings_changed               {name: [old value, new value]}
+
+update_schedules.py uses the diff to resolve again only the slots that use
+a removed or renamed name, instead of reparsing the whole call board.
+
+A new cast list would otherwise throw away the roles and groups that
+ConflictResolver added to cast.json (and any made by hand). cast_source.json
+records the cast exactly as the list produced it, so keep_additions() can
+tell those additions apart and carry them over for actors who are still in
+the cast; it belongs with cast.json and is committed with it, while
+cast_changes.json is only a report of the last update. Without that record
+(casts saved before it existed), only the roles and groups the resolver is
+known to have created are kept: those in resolution_cache.json and
+resolver_journal.jsonl, and the actor matches an older --batch run listed in
+conflict_report.json (see recorded_names()).
+"""
+import hashlib
+import json
+
+from show_store import load_json
+
+CAST_SOURCE_VERSION = 1
+
+
+def cast_fingerprint(cast_data, group_mappings):
+    """Stable hash of the cast and group mappings a resolution cache was built against."""
+    payload = json.dumps([cast_data, group_mappings], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def name_holders(cast_data, group_mappings):
+    """{NAME: set of actors} for every name the call board can use."""
+    holders = {name: set() for name in group_mappings}
+    for actor, roles in cast_data.get('actor_roles', {}).items():
+        for role in roles:
+            holders.setdefault(role.upper(), set()).add(actor)
+    return holders
+
+
+def diff_casts(old_cast, old_mappings, new_cast, new_mappings):
+    old_holders = name_holders(old_cast, old_mappings)
+    new_holders = name_holders(new_cast, new_mappings)
+    removed = sorted(set(old_holders) - set(new_holders))
+    added = sorted(set(new_holders) - set(old_holders))
+
+    # A rename keeps the holders; only an unambiguous pair counts
+    removed_by_holders = {}
+    added_by_holders = {}
+    for name in removed:
+        removed_by_holders.setdefault(frozenset(old_holders[name]), []).append(name)
+    for name in added:
+        added_by_holders.setdefault(frozenset(new_holders[name]), []).append(name)
+    renamed = {}
+    for holders, names in removed_by_holders.items():
+        candidates = added_by_holders.get(holders, [])
+        if holders and len(names) == 1 and len(candidates) == 1:
+            renamed[names[0]] = candidates[0]
+
+    old_actors = set(old_cast.get('actors', []))
+    new_actors = set(new_cast.get('actors', []))
+    return {
+        'from': cast_fingerprint(old_cast, old_mappings),
+        'to': cast_fingerprint(new_cast, new_mappings),
+        'actors_added': [actor for actor in new_cast.get('actors', []) if actor not in old_actors],
+        'actors_removed': [actor for actor in old_cast.get('actors', []) if actor not in new_actors],
+        'roles_added': [name for name in added if name not in renamed.values()],
+        'roles_removed': [name for name in removed if name not in renamed],
+        'roles_moved': {
+            name: {'from': sorted(old_holders[name] - new_holders[name]),
+                   'to': sorted(new_holders[name] - old_holders[name])}
+            for name in sorted(set(old_holders) & set(new_holders)) if old_holders[name] != new_holders[name]
+        },
+        'groups_renamed': dict(sorted(renamed.items())),
+        'mappings_changed': {
+            name: [old_mappings[name], new_mappings[name]]
+            for name in sorted(set(old_mappings) & set(new_mappings)) if old_mappings[name] != new_mappings[name]
+        },
+    }
+
+
+def has_changes(changes):
+    return any(changes[key] for key in ('actors_added', 'actors_removed', 'roles_added', 'roles_removed',
+                                        'roles_moved', 'groups_renamed', 'mappings_changed'))
+
+
+def describe_changes(changes):
+    """Lines summarising a diff_casts() result (and what keep_additions() kept) for the console."""
+    if changes is None:
+        return []
+    lines = []
+    if not has_changes(changes):
+        lines.append("No changes to the cast since the last cast list.")
+    for key, label in (('actors_added', "Actors added"), ('actors_removed', "Actors removed"),
+                       ('roles_added', "Roles added"), ('roles_removed', "Roles removed")):
+        if changes[key]:
+            lines.append(f"{label} ({len(changes[key])}): {', '.join(changes[key])}")
+    for name, moved in changes['roles_moved'].items():
+        parts = []
+        if moved['from']:
+            parts.append(f"no longer {', '.join(moved['from'])}")
+        if moved['to']:
+            parts.append(f"now also {', '.join(moved['to'])}")
+        lines.append(f"Role {name}: {'; '.join(parts)}")
+    for old, new in changes['groups_renamed'].items():
+        lines.append(f"Renamed: {old} -> {new}")
+    kept = changes.get('kept', {})
+    if kept.get('roles') or kept.get('groups'):
+        count = sum(len(roles) for roles in kept['roles'].values())
+        lines.append(f"Kept {count} role(s) and {len(kept['groups'])} group(s) added while resolving the schedule.")
+    for actor, roles in kept.get('dropped', {}).items():
+        lines.append(f"Dropped {', '.join(roles)}: {actor} is no longer in the cast.")
+    return lines
+
+
+def recorded_names(paths):
+    """Roles and groups the resolver created, as far as its saved files record them.
+
+    A name the resolver made (New Role, New Group, or a --batch match to an
+    actor in an older conflict_report.json) resolves to itself; answers that
+    point at an existing role or group are not counted.
+    """
+    names = set()
+    cache = load_json(paths['resolution_cache']) or {}
+    for name, decision in cache.get('aliases', {}).items():
+        if decision.get('type') == 'mapping' and (decision.get('value') or '').upper() == name.upper():
+            names.add(name.upper())
+    report = load_json(paths['conflict_report']) or {}
+    for name, value in report.get('auto_matched', {}).items():
+        # Newer reports record {kind, target, score} and never match an actor
+        if isinstance(value, str) and value.upper() == name.upper():
+            names.add(name.upper())
+    try:
+        with open(paths['resolver_journal'], 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        lines = []
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            break
+        if entry.get('action') == 'new_role':
+            names.add(entry['role'].upper())
+        elif entry.get('action') == 'new_group':
+            names.add(entry['group'].upper())
+    return names
+
+
+def keep_additions(old_cast, old_mappings, source, new_cast, new_mappings, recorded=()):
+    """The new cast with the old cast's additions carried over; returns (cast_data, group_mappings, kept).
+
+    source is the cast_source.json record of the list the old cast came
+    from, or None; then only the names in recorded (recorded_names()) that
+    the new list does not have are carried over.
+    """
+    cast_data = {'actors': list(new_cast.get('actors', [])),
+                 'actor_roles': {actor: list(roles) for actor, roles in new_cast.get('actor_roles', {}).items()}}
+    group_mappings = dict(new_mappings)
+    if source:
+        source_roles = {actor: set(roles) for actor, roles in source['cast'].get('actor_roles', {}).items()}
+        source_mappings = source['group_mappings']
+
+        def is_addition(actor, role):
+            return role not in source_roles.get(actor, ())
+
+        def is_added_mapping(name, value):
+            return source_mappings.get(name) != value
+    else:
+        new_names = set(name_holders(new_cast, new_mappings))
+        recorded = set(recorded) - new_names
+
+        def is_addition(actor, role):
+            return role.upper() in recorded
+
+        def is_added_mapping(name, value):
+            return name in recorded
+
+    kept = {'roles': {}, 'groups': [], 'mappings': {}, 'dropped': {}}
+    for actor, roles in old_cast.get('actor_roles', {}).items():
+        additions = [role for role in roles if is_addition(actor, role)]
+        if not additions:
+            continue
+        if actor not in cast_data['actor_roles']:
+            kept['dropped'][actor] = additions
+            continue
+        for role in additions:
+            if role not in cast_data['actor_roles'][actor]:
+                cast_data['actor_roles'][actor].append(role)
+                kept['roles'].setdefault(actor, []).append(role)
+
+    held = set(name_holders(cast_data, {}))
+    for name, value in old_mappings.items():
+        if not is_added_mapping(name, value):
+            continue
+        if name in group_mappings:
+            # A value edited by hand (e.g. "" so calls show only the time)
+            if group_mappings[name] != value:
+                group_mappings[name] = value
+                kept['mappings'][name] = value
+        elif name in held:
+            group_mappings[name] = value
+            kept['groups'].append(name)
+    return cast_data, group_mappings, kept
+
+
+def update_cast(paths, cast_data, group_mappings, clean=False):
+    """Carry the saved cast's additions over to a newly parsed cast list and diff the two.
+
+    With clean=True nothing is carried over and the new list is used as it
+    is. Returns (cast_data, group_mappings, changes); changes is None when
+    no cast has been saved yet.
+    """
+    old_cast = load_json(paths['cast'])
+    old_mappings = load_json(paths['group_mappings'])
+    if not old_cast or old_mappings is None:
+        return cast_data, group_mappings, None
+    if clean:
+        merged_cast, merged_mappings = cast_data, group_mappings
+        kept = {'roles': {}, 'groups': [], 'mappings': {}, 'dropped': {}}
+    else:
+        source = load_json(paths['cast_source'])
+        if source and source.get('version') != CAST_SOURCE_VERSION:
+            source = None
+        recorded = () if source else recorded_names(paths)
+        merged_cast, merged_mappings, kept = keep_additions(old_cast, old_mappings, source, cast_data,
+                                                            group_mappings, recorded)
+    changes = diff_casts(old_cast, old_mappings, merged_cast, merged_mappings)
+    changes['kept'] = kept
+    return merged_cast, merged_mappings, changes
+
+
+def stage_cast_update(generation, paths, source_cast, source_mappings, changes):
+    """Stage cast_source.json and, when there was a previous cast, cast_changes.json."""
+    generation.stage(paths['cast_source'], json.dumps({
+        'version': CAST_SOURCE_VERSION,
+        'cast': source_cast,
+        'group_mappings': source_mappings,
+    }, indent=2, ensure_ascii=False))
+    if changes is not None:
+        generation.stage(paths['cast_changes'], json.dumps(changes, indent=2, ensure_ascii=False))
@@ -0,0 +1,165 @@
+"""Compact export of the schedule for index.html on slow connections.
+
+cast.json, call_times.json and call_windows.json repeat every actor, role,
+group and time string many times over and are indented for reading. The
+compact file carries the same information once:
+
+    strings  every actor, group and time text, each stored once
+    actors   string ids in cast.json order
+    slots    columns with one entry per slot, dates in order:
+             day (days after epoch), time (string id), start/end (minutes
+             after midnight, -1 if the time cannot be read), group_count and
+             groups (the string ids of all slots' groups, concatenated)
+    calls    per actor, pairs of (slot - previous slot, label id): the call
+             label is "<label> <time>", or just the time when the id is -1
+
+Call windows are not stored; they are the actor's readable slot intervals for
+a day merged the same way as update_schedules.build_call_windows. The output
+is minified and written next to a gzip copy (.gz) for hosts that cannot
+compress on the fly. decode_compact() is the reference decoder; the one in
+index.html must give the same result.
+"""
+import gzip
+import json
+import os
+from datetime import date, timedelta
+
+from time_intervals import format_interval, merge_intervals, slot_interval
+
+COMPACT_VERSION = 1
+GZIP_SUFFIX = ".gz"
+
+
+class StringTable:
+    """Assigns each distinct string the index of its first use."""
+
+    def __init__(self):
+        self.strings = []
+        self.ids = {}
+
+    def intern(self, text):
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+
+def encode_compact(actors, calls):
+    """Build the compact structure.
+
+    actors is cast.json's actor list; calls yields (date, slot, {actor: label})
+    for every slot with dates in order, as update_schedules.iter_call_labels does.
+    """
+    strings = StringTable()
+    actor_ids = {actor: i for i, actor in enumerate(actors)}
+    slots = {'day': [], 'time': [], 'start': [], 'end': [], 'group_count': [], 'groups': []}
+    actor_calls = [[] for _ in actors]
+    last_slot = [0] * len(actors)
+    epoch = None
+
+    for index, (day, slot, labels) in enumerate(calls):
+        day_value = date.fromisoformat(day)
+        if epoch is None:
+            epoch = day_value
+        start, end = slot_interval(slot['time'], day) or (-1, -1)
+        slots['day'].append((day_value - epoch).days)
+        slots['time'].append(strings.intern(slot['time']))
+        slots['start'].append(start)
+        slots['end'].append(end)
+        slots['group_count'].append(len(slot['groups']))
+        slots['groups'].extend(strings.intern(group) for group in slot['groups'])
+
+        for actor, label in labels.items():
+            i = actor_ids[actor]
+            if label == slot['time']:
+                label_id = -1
+            else:
+                label_id = strings.intern(label[:len(label) - len(slot['time']) - 1])
+            actor_calls[i] += [index - last_slot[i], label_id]
+            last_slot[i] = index
+
+    return {
+        'version': COMPACT_VERSION,
+        'epoch': epoch.isoformat() if epoch else None,
+        'strings': strings.strings,
+        'actors': [strings.intern(actor) for actor in actors],
+        'slots': slots,
+        'calls': actor_calls,
+    }
+
+
+def decode_compact(data):
+    """{'actors', 'schedule', 'call_times', 'call_windows'} from a compact structure."""
+    if data.get('version') != COMPACT_VERSION:
+        raise ValueError(f"unsupported compact schedule version: {data.get('version')}")
+    strings = data['strings']
+    slots = data['slots']
+    epoch = date.fromisoformat(data['epoch']) if data['epoch'] else None
+
+    dates = []
+    schedule = {}
+    offset = 0
+    for i, day in enumerate(slots['day']):
+        dates.append((epoch + timedelta(days=day)).isoformat())
+        groups = [strings[g] for g in slots['groups'][offset:offset + slots['group_count'][i]]]
+        offset += slots['group_count'][i]
+        schedule.setdefault(dates[i], []).append({'time': strings[slots['time'][i]], 'groups': groups})
+
+    actors = [strings[a] for a in data['actors']]
+    call_times = {}
+    call_windows = {}
+    for actor, pairs in zip(actors, data['calls']):
+        times = call_times[actor] = {}
+        intervals = {}
+        slot = 0
+        for step, label_id in zip(pairs[::2], pairs[1::2]):
+            slot += step
+            time = strings[slots['time'][slot]]
+            times.setdefault(dates[slot], []).append(time if label_id < 0 else f"{strings[label_id]} {time}")
+            if slots['start'][slot] >= 0:
+                intervals.setdefault(dates[slot], []).append((slots['start'][slot], slots['end'][slot]))
+        call_windows[actor] = {
+            day: [{'start': start, 'end': end, 'label': format_interval((start, end))}
+                  for start, end in merge_intervals(day_intervals)]
+            for day, day_intervals in intervals.items()
+        }
+    return {'actors': actors, 'schedule': schedule, 'call_times': call_times, 'call_windows': call_windows}
+
+
+def compact_bytes(data):
+    """Minified UTF-8 JSON and its gzip copy (fixed mtime, so unchanged data gives identical bytes)."""
+    body = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return body, gzip.compress(body, compresslevel=9, mtime=0)
+
+
+def stage_compact(filepath, data, generation):
+    """Stage filepath and filepath.gz; returns True if either changed."""
+    body, compressed = compact_bytes(data)
+    changed = generation.stage(filepath, body)
+    return generation.stage(filepath + GZIP_SUFFIX, compressed) or changed
+
+
+def save_compact(paths, actors, calls, generation):
+    """Stage the compact export of a show; returns True if any file changed.
+
+    Sharded shows get one file per month in <show>/compact/, matching the
+    month shards index.html downloads.
+    """
+    calls = list(calls)
+    if not paths['sharded']:
+        return stage_compact(paths['compact'], encode_compact(actors, calls), generation)
+
+    months = {}
+    for call in calls:
+        months.setdefault(call[0][:7], []).append(call)
+    changed = False
+    for month, month_calls in sorted(months.items()):
+        filepath = os.path.join(paths['compact_shards'], f"{month}.json")
+        changed = stage_compact(filepath, encode_compact(actors, month_calls), generation) or changed
+    if os.path.isdir(paths['compact_shards']):
+        for name in os.listdir(paths['compact_shards']):
+            if name.split('.')[0] not in months:
+                generation.remove(os.path.join(paths['compact_shards'], name))
+                changed = True
+    return changed
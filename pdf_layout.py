@@ -0,0 +1,179 @@
+"""Rebuild reading-order lines for a cast list page from word positions.
+
+extract_text() flattens a page left to right, so a two-column callboard
+interleaves both columns and a Role | Actor table loses its pairing. These
+functions work from pdfplumber word boxes (text, x0, x1, top, bottom) and
+table rows instead: vertical whitespace gutters split the page into columns,
+a two-column page without colons is read as role/actor pairs, and every
+other column is read top to bottom. The result is plain text lines that the
+existing cast list grammar in update_cast_from_pdf understands.
+"""
+import re
+
+# Words whose tops differ by at most this many points share a row
+ROW_TOLERANCE = 3
+# A horizontal gap wider than this starts a new cell within a row
+CELL_GAP = 12
+# Minimum width of an empty vertical band that separates two columns
+COLUMN_GUTTER = 18
+# Share of rows allowed to cross a gutter (titles spanning both columns)
+GUTTER_CROSSING_SHARE = 0.1
+# Share of rows that must have text on both sides to read a page as pairs
+PAIR_ROW_SHARE = 0.6
+
+TABLE_HEADER_RE = re.compile(r'^(role|character|part)s?$', re.IGNORECASE)
+
+
+def page_layout(page):
+    """Picklable word boxes and table rows for one pdfplumber page."""
+    words = [(w['text'], w['x0'], w['x1'], w['top'], w['bottom']) for w in page.extract_words()]
+    tables = []
+    for table in page.find_tables():
+        rows = [[(cell or '').strip() for cell in row] for row in table.extract()]
+        tables.append({'bbox': table.bbox, 'rows': rows})
+    return {'width': page.width, 'words': words, 'tables': tables}
+
+
+def group_rows(words):
+    """Group word boxes into rows ordered top to bottom, words left to right."""
+    rows = []
+    for word in sorted(words, key=lambda w: (w[3], w[1])):
+        if rows and word[3] - rows[-1][0][3] <= ROW_TOLERANCE:
+            rows[-1].append(word)
+        else:
+            rows.append([word])
+    return [sorted(row, key=lambda w: w[1]) for row in rows]
+
+
+def split_cells(row):
+    """Join a row's words into cells, breaking at gaps wider than CELL_GAP."""
+    cells = []
+    for word in row:
+        if cells and word[1] - cells[-1][2] <= CELL_GAP:
+            text, x0, _ = cells[-1]
+            cells[-1] = (text + ' ' + word[0], x0, word[2])
+        else:
+            cells.append((word[0], word[1], word[2]))
+    return cells
+
+
+def find_gutters(words):
+    """x positions of vertical bands at least COLUMN_GUTTER wide that (almost) no row crosses.
+
+    A few crossing rows are tolerated so a centred title does not merge the
+    columns below it.
+    """
+    if not words:
+        return []
+    left = int(min(w[1] for w in words))
+    right = int(max(w[2] for w in words)) + 1
+    coverage = [0] * (right - left)
+    rows = group_rows(words)
+    for row in rows:
+        covered = set()
+        for word in row:
+            covered.update(range(int(word[1]) - left, int(word[2]) + 1 - left))
+        for x in covered:
+            coverage[x] += 1
+    allowed = max(1, int(len(rows) * GUTTER_CROSSING_SHARE))
+
+    gutters = []
+    start = None
+    for x, count in enumerate(coverage + [len(rows) + 1]):
+        if count <= allowed:
+            if start is None:
+                start = x
+        else:
+            if start is not None and start > 0 and x - start >= COLUMN_GUTTER and x < len(coverage):
+                gutters.append(left + (start + x) / 2)
+            start = None
+    return gutters
+
+
+def split_columns(words, gutters):
+    columns = [[] for _ in range(len(gutters) + 1)]
+    for word in words:
+        center = (word[1] + word[2]) / 2
+        columns[sum(1 for g in gutters if center > g)].append(word)
+    return columns
+
+
+def row_texts(column_words):
+    return [' '.join(cell[0] for cell in split_cells(row)) for row in group_rows(column_words)]
+
+
+def is_pair_layout(left, right):
+    """True if two columns look like Role | Actor rather than two lists.
+
+    Independent lists carry their own 'ROLE: Actor' lines or 'GROUP:'
+    headers; a pairs table has no colons and text on both sides of most rows.
+    """
+    if any(':' in text for text in row_texts(left) + row_texts(right)):
+        return False
+    tops_left = {round(w[3] / ROW_TOLERANCE) for w in left}
+    tops_right = {round(w[3] / ROW_TOLERANCE) for w in right}
+    rows = tops_left | tops_right
+    return bool(rows) and len(tops_left & tops_right) / len(rows) >= PAIR_ROW_SHARE
+
+
+def pair_lines(words, gutter):
+    """'ROLE: Actor' lines from rows split at the gutter; one-sided rows pass through."""
+    lines = []
+    for row in group_rows(words):
+        left = ' '.join(w[0] for w in row if (w[1] + w[2]) / 2 <= gutter)
+        right = ' '.join(w[0] for w in row if (w[1] + w[2]) / 2 > gutter)
+        if left and right and TABLE_HEADER_RE.match(left):
+            continue
+        if left and right:
+            lines.append(f"{left}: {right}")
+        else:
+            lines.append(left or right)
+    return lines
+
+
+def table_lines(table):
+    lines = []
+    for row in table['rows']:
+        cells = [cell for cell in row if cell]
+        if len(cells) >= 2 and TABLE_HEADER_RE.match(cells[0]):
+            continue
+        if len(cells) >= 2:
+            lines.append(f"{cells[0]}: {cells[1]}")
+        elif cells:
+            lines.append(cells[0])
+    return lines
+
+
+def inside(word, bbox):
+    x0, top, x1, bottom = bbox
+    return word[1] >= x0 and word[2] <= x1 and word[3] >= top and word[4] <= bottom
+
+
+def layout_lines(layout):
+    """Return (lines, description) for one page_layout() result."""
+    lines = []
+    for table in layout['tables']:
+        lines.extend(table_lines(table))
+    words = [w for w in layout['words'] if not any(inside(w, t['bbox']) for t in layout['tables'])]
+
+    gutters = find_gutters(words)
+    if gutters:
+        # Titles that straddle a gutter are read first instead of being cut in two
+        spanning = set()
+        for row in group_rows(words):
+            for text, x0, x1 in split_cells(row):
+                if any(x0 < g < x1 for g in gutters):
+                    lines.append(text)
+                    spanning.update(w for w in row if w[1] >= x0 and w[2] <= x1)
+        words = [w for w in words if w not in spanning]
+    columns = split_columns(words, gutters)
+    if len(columns) == 2 and is_pair_layout(*columns):
+        lines.extend(pair_lines(words, gutters[0]))
+        description = "role/actor pairs"
+    else:
+        for column in columns:
+            lines.extend(row_texts(column))
+        description = f"{len(columns)} column(s)"
+    if layout['tables']:
+        description += f", {len(layout['tables'])} table(s)"
+    return lines, description
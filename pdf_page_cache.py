@@ -0,0 +1,161 @@
+"""On-disk cache of what update_cast_from_pdf extracted from each cast list page.
+
+Extracting a page (extract_text(), or the word boxes and tables of
+pdf_layout.page_layout()) is most of the time a PDF cast list takes, and it
+is repeated on every run even when the PDF has not changed. Each page's
+result is saved under a key made from:
+
+    the page's content   a hash of its content streams and everything in
+                         its resources (fonts, images, forms), its boxes and
+                         its rotation; see page_fingerprint()
+    the parser version   PAGE_CACHE_VERSION, the pdfplumber version and
+                         whether it was text or layout extraction
+
+so a page is only extracted again when it, or the code reading it, changed;
+an edited page in an otherwise unchanged PDF misses on that page alone.
+Entries are one JSON file each in the cache folder; index.json records their
+sizes and when they were last used, and the least recently used are removed
+once the folder grows past max_bytes.
+"""
+import hashlib
+import json
+import os
+
+from show_store import atomic_write, load_json
+
+# Bump when extract_page() or pdf_layout.page_layout() return something different
+PAGE_CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+
+
+def page_fingerprint(page):
+    """sha256 of everything a pdfplumber page's text is drawn from."""
+    from pdfminer.pdftypes import PDFObjRef, PDFStream
+    from pdfminer.psparser import PSLiteral
+
+    digest = hashlib.sha256()
+    seen = set()
+
+    def feed(obj):
+        if isinstance(obj, PDFObjRef):
+            # Shared objects (fonts used on every page) are hashed once; a
+            # repeat or a reference cycle only adds the object number
+            digest.update(b'R%d;' % obj.objid)
+            if obj.objid in seen:
+                return
+            seen.add(obj.objid)
+            obj = obj.resolve()
+        if isinstance(obj, PDFStream):
+            feed(obj.attrs)
+            data = obj.get_data() or b''
+            digest.update(b'S%d;' % len(data))
+            digest.update(data)
+        elif isinstance(obj, dict):
+            digest.update(b'{')
+            for key in sorted(obj, key=str):
+                digest.update(str(key).encode('utf-8') + b':')
+                feed(obj[key])
+            digest.update(b'}')
+        elif isinstance(obj, (list, tuple)):
+            digest.update(b'[')
+            for item in obj:
+                feed(item)
+            digest.update(b']')
+        elif isinstance(obj, PSLiteral):
+            digest.update(b'/' + repr(obj.name).encode('utf-8') + b';')
+        else:
+            digest.update(repr(obj).encode('utf-8') + b';')
+
+    page_obj = page.page_obj
+    feed([page_obj.mediabox, page_obj.cropbox, page_obj.rotate])
+    feed(page_obj.resources)
+    feed(page_obj.contents)
+    return digest.hexdigest()
+
+
+def restore_page(page):
+    """A cached page as extract_page() returned it.
+
+    JSON turns page_layout()'s word and bbox tuples into lists, and
+    pdf_layout puts words in sets.
+    """
+    if isinstance(page, dict):
+        page = dict(page, words=[tuple(word) for word in page['words']],
+                    tables=[dict(table, bbox=tuple(table['bbox'])) for table in page['tables']])
+    return page
+
+
+def parser_version(layout):
+    import pdfplumber
+    return f"{PAGE_CACHE_VERSION}/{pdfplumber.__version__}/{'layout' if layout else 'text'}"
+
+
+class PageCache:
+    """Extracted pages by key, with a least-recently-used size bound; call save() when done."""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        index = load_json(os.path.join(directory, 'index.json'))
+        if not index or index.get('version') != PAGE_CACHE_VERSION:
+            index = {'version': PAGE_CACHE_VERSION, 'clock': 0, 'entries': {}}
+        self.index = index
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def key(self, page, layout=False):
+        return hashlib.sha256(f"{parser_version(layout)}\n{page_fingerprint(page)}".encode('utf-8')).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def touch(self, key, size):
+        self.index['clock'] += 1
+        self.index['entries'][key] = {'bytes': size, 'used': self.index['clock']}
+
+    def get(self, key):
+        """The cached page for key, or None."""
+        entry = self.index['entries'].get(key)
+        value = load_json(self.entry_path(key)) if entry else None
+        if value is None:
+            self.index['entries'].pop(key, None)
+            self.misses += 1
+            return None
+        self.touch(key, entry['bytes'])
+        self.hits += 1
+        return restore_page(value['page'])
+
+    def put(self, key, page):
+        content = json.dumps({'page': page}, separators=(',', ':'), ensure_ascii=False)
+        os.makedirs(self.directory, exist_ok=True)
+        atomic_write(self.entry_path(key), content)
+        self.touch(key, len(content.encode('utf-8')))
+
+    def total_bytes(self):
+        return sum(entry['bytes'] for entry in self.index['entries'].values())
+
+    def save(self):
+        """Remove the least recently used entries over max_bytes and write index.json."""
+        entries = self.index['entries']
+        total = self.total_bytes()
+        for key in sorted(entries, key=lambda k: entries[k]['used']):
+            if total <= self.max_bytes:
+                break
+            total -= entries.pop(key)['bytes']
+            self.evicted += 1
+            try:
+                os.remove(self.entry_path(key))
+            except FileNotFoundError:
+                pass
+        if entries or os.path.isdir(self.directory):
+            os.makedirs(self.directory, exist_ok=True)
+            atomic_write(os.path.join(self.directory, 'index.json'), json.dumps(self.index, indent=2))
+
+    def report(self):
+        pages = self.hits + self.misses
+        rate = self.hits / pages if pages else 0.0
+        evicted = f", {self.evicted} least recently used removed" if self.evicted else ""
+        return (f"Page cache: {self.hits} of {pages} pages reused ({rate:.0%} hit rate), {self.misses} extracted; "
+                f"{len(self.index['entries'])} entries, {self.total_bytes() / 1024:.0f} KB "
+                f"of {self.max_bytes / 1024 / 1024:g} MB{evicted}.")
@@ -0,0 +1,154 @@
+"""Stage timings and counters for the update scripts (--profile).
+
+The scripts share the module-level `metrics` object. Code marks a stage with
+
+    with metrics.stage('parse'):
+        ...
+
+and counts things with metrics.count('lines', n). Both do nothing until
+metrics.start() is called, so the instrumentation stays in place for normal
+runs. Stage times are inclusive: time spent in a dialog is also part of
+resolve_conflict and of parse when those stages enclose it.
+
+metrics.finish() prints the breakdown and writes it to
+<show folder>/metrics/<script>-<YYYYMMDD-HHMMSS>.json, one file per run so
+seasons can be compared. With a cProfile path the whole run is also
+profiled and dumped there for pstats or snakeviz.
+"""
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+METRICS_VERSION = 1
+METRICS_DIR = "metrics"
+
+NULL_STAGE = nullcontext()
+
+
+class Stage:
+    __slots__ = ('totals', 'start')
+
+    def __init__(self, totals):
+        self.totals = totals
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.totals[0] += time.perf_counter() - self.start
+        self.totals[1] += 1
+        return False
+
+
+class Metrics:
+
+    def __init__(self):
+        self.enabled = False
+        self.script = None
+        self.directory = None
+        self.started = None
+        self.start_time = None
+        self.stages = {}
+        self.counters = {}
+        self.profiler = None
+        self.profile_path = None
+
+    def start(self, script, base_dir, profile_path=None):
+        """Begin collecting for this run; profile_path also turns on cProfile."""
+        self.enabled = True
+        self.script = script
+        self.directory = os.path.join(base_dir, METRICS_DIR)
+        self.started = datetime.now()
+        self.start_time = time.perf_counter()
+        if profile_path:
+            # Imported here: every script loads this module, few runs profile
+            import cProfile
+            self.profile_path = profile_path
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stage(self, name):
+        if not self.enabled:
+            return NULL_STAGE
+        totals = self.stages.get(name)
+        if totals is None:
+            totals = self.stages[name] = [0.0, 0]
+        return Stage(totals)
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def timed(self, name, iterable):
+        """Wrap an iterable so the time spent producing each item adds to stage name (for generators).
+
+        The number of items becomes the stage's call count.
+        """
+        if not self.enabled:
+            return iterable
+        return self._timed(name, iterable)
+
+    def _timed(self, name, iterable):
+        iterator = iter(iterable)
+        totals = self.stages.setdefault(name, [0.0, 0])
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                totals[0] += time.perf_counter() - start
+                return
+            totals[0] += time.perf_counter() - start
+            totals[1] += 1
+            yield item
+
+    def as_dict(self, status):
+        import platform
+        return {
+            'version': METRICS_VERSION,
+            'script': self.script,
+            'started': self.started.isoformat(timespec='seconds'),
+            'status': status,
+            'python': platform.python_version(),
+            'argv': sys.argv[1:],
+            'total_seconds': round(time.perf_counter() - self.start_time, 6),
+            'stages': {name: {'seconds': round(seconds, 6), 'calls': calls}
+                       for name, (seconds, calls) in self.stages.items()},
+            'counters': dict(sorted(self.counters.items())),
+        }
+
+    def finish(self, status='ok'):
+        """Print the breakdown and save the metrics JSON (and cProfile dump); returns the JSON path."""
+        if not self.enabled:
+            return None
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.profile_path)
+        report = self.as_dict(status)
+        self.enabled = False
+
+        print(f"\nProfile ({report['total_seconds']:.3f}s total):")
+        for name, stage in sorted(report['stages'].items(), key=lambda item: -item[1]['seconds']):
+            print(f"  {name:<24} {stage['seconds']:>9.3f}s {stage['calls']:>9} calls")
+        for name, value in report['counters'].items():
+            print(f"  {name:<24} {value:>10}")
+
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{self.script}-{self.started.strftime('%Y%m%d-%H%M%S')}"
+        path = os.path.join(self.directory, f"{name}.json")
+        number = 2
+        while os.path.exists(path):
+            path = os.path.join(self.directory, f"{name}-{number}.json")
+            number += 1
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Metrics saved to {path}")
+        if self.profiler is not None:
+            print(f"cProfile data saved to {self.profile_path} (python -m pstats {self.profile_path})")
+        return path
+
+
+metrics = Metrics()
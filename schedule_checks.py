@@ -0,0 +1,143 @@
+"""Feasibility checks for a parsed schedule.
+
+Double bookings: an actor called by two different slots whose times overlap
+on the same day (for example their role in one room and their group in
+another). Calls are expanded to actors through cast.json actor_roles, with
+group_mappings aliases (a group mapped to another group name) followed, and
+each actor's intervals are swept in start order so only overlapping pairs
+are compared. FULL CAST slots are left out by default because callboards
+routinely schedule smaller calls inside them.
+
+Capacity: the number of different actors called at the same time, found
+with one sweep over every slot's start and end, compared against the number
+of people the rehearsal space holds.
+"""
+from time_intervals import format_interval, slot_interval
+
+
+def group_members(cast_data, group_mappings):
+    """{role or group: [actors]}, including groups that map to another group's name."""
+    actor_roles = cast_data.get('actor_roles', {})
+    members = {}
+    for actor in cast_data.get('actors', []):
+        for role in actor_roles.get(actor, []):
+            members.setdefault(role, []).append(actor)
+    for group, target in group_mappings.items():
+        if target and target != group and target in members:
+            aliased = members.setdefault(group, [])
+            aliased.extend(actor for actor in members[target] if actor not in aliased)
+    return members
+
+
+def slot_calls(schedule, cast_data, group_mappings):
+    """[(date, slot index, (start, end), {actor: roles})] for slots with a readable time."""
+    members = group_members(cast_data, group_mappings)
+    actors = cast_data.get('actors', [])
+    calls = []
+    for date in sorted(schedule):
+        for index, slot in enumerate(schedule[date]):
+            interval = slot_interval(slot['time'], date)
+            if interval is None:
+                continue
+            called = {}
+            if 'FULL CAST' in slot['groups']:
+                called = {actor: ['FULL CAST'] for actor in actors}
+            for group in slot['groups']:
+                for actor in members.get(group, []):
+                    called.setdefault(actor, []).append(group)
+            calls.append((date, index, interval, called))
+    return calls
+
+
+def find_double_bookings(schedule, calls, include_full_cast=False):
+    """Overlapping calls per actor, sorted by date, actor and time."""
+    by_actor = {}
+    for date, index, (start, end), called in calls:
+        if not include_full_cast and 'FULL CAST' in schedule[date][index]['groups']:
+            continue
+        for actor, roles in called.items():
+            by_actor.setdefault((actor, date), []).append((start, end, index, roles))
+
+    conflicts = []
+    for (actor, date), intervals in by_actor.items():
+        if len(intervals) < 2:
+            continue
+        active = []
+        for call in sorted(intervals, key=lambda c: (c[0], c[1], c[2])):
+            # Drop calls that ended before this one starts; the rest overlap it
+            active = [other for other in active if other[1] > call[0]]
+            for other in active:
+                conflicts.append({
+                    'date': date,
+                    'actor': actor,
+                    'overlap': format_interval((call[0], min(call[1], other[1]))),
+                    'calls': [describe_call(schedule[date][c[2]], c[3]) for c in (other, call)],
+                })
+            active.append(call)
+    conflicts.sort(key=lambda c: (c['date'], c['actor'], c['overlap']))
+    return conflicts
+
+
+def describe_call(slot, roles):
+    return {'time': slot['time'], 'groups': slot['groups'], 'roles': roles}
+
+
+def find_capacity_overflows(calls, capacity):
+    """Periods where more than capacity different actors are called at once.
+
+    Every slot adds its actors at its start and removes them at its end; the
+    events are sorted once and swept in order, keeping a count of the slots
+    each actor is in and a running total of actors in at least one (someone
+    in two overlapping slots counts once). Between two event times that total
+    is the headcount.
+    """
+    events = []
+    for date, _, (start, end), called in calls:
+        events.append((date, start, 1, called))
+        events.append((date, end, -1, called))
+    events.sort(key=lambda event: (event[0], event[1]))
+
+    overflows = []
+    period = None
+    slot_counts = {}
+    headcount = 0
+    for position, (date, minute, step, called) in enumerate(events):
+        for actor in called:
+            count = slot_counts.get(actor, 0) + step
+            slot_counts[actor] = count
+            if count == (1 if step > 0 else 0):
+                headcount += step
+        following = events[position + 1] if position + 1 < len(events) else None
+        if following is not None and following[:2] == (date, minute):
+            continue
+        # Every event at this minute is applied; headcount holds until the next one
+        if following is not None and following[0] == date and headcount > capacity:
+            if period is None:
+                period = {'date': date, 'start': minute, 'headcount': 0}
+            period['end'] = following[1]
+            period['headcount'] = max(period['headcount'], headcount)
+        elif period is not None:
+            overflows.append(period)
+            period = None
+    return [{'date': p['date'], 'time': format_interval((p['start'], p['end'])),
+             'headcount': p['headcount'], 'capacity': capacity} for p in overflows]
+
+
+def print_conflicts(double_bookings, overflows):
+    for conflict in double_bookings:
+        first, second = conflict['calls']
+        print(f"Double booked: {conflict['actor']} on {conflict['date']} {conflict['overlap']}: "
+              f"{'/'.join(first['roles'])} {first['time']} and {'/'.join(second['roles'])} {second['time']}")
+    for overflow in overflows:
+        print(f"Over capacity: {overflow['date']} {overflow['time']}: "
+              f"{overflow['headcount']} called, room holds {overflow['capacity']}")
+
+
+def check_schedule(schedule, cast_data, group_mappings, capacity=None, include_full_cast=False):
+    """Run the checks and return the conflict report saved as schedule_conflicts.json."""
+    calls = slot_calls(schedule, cast_data, group_mappings)
+    double_bookings = find_double_bookings(schedule, calls, include_full_cast)
+    overflows = [] if capacity is None else find_capacity_overflows(calls, capacity)
+    print_conflicts(double_bookings, overflows)
+    print(f"Schedule check: {len(double_bookings)} double booking(s), {len(overflows)} over-capacity period(s).")
+    return {'capacity': capacity, 'double_bookings': double_bookings, 'over_capacity': overflows}
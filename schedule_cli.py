@@ -0,0 +1,120 @@
+"""One entry point for the whole pipeline, on Windows, macOS and Linux.
+
+    python schedule_cli.py [--timing] cast [--from csv|pdf] [options]
+    python schedule_cli.py [--timing] build [options]
+    python schedule_cli.py [--timing] serve [options]
+    python schedule_cli.py [--timing] report [options]
+    python schedule_cli.py [--timing] watch [options]
+
+Each subcommand runs the main() of the script it wraps and takes the same
+options (python schedule_cli.py build --help lists them): cast is
+update_cast_from_csv.py or update_cast_from_pdf.py, build is
+update_schedules.py, serve is schedule_server.py, report is
+schedule_reports.py and watch is watch_show.py. Without --from, cast picks
+the cast list the way Update_Cast_List.ps1 does.
+
+Only the chosen subcommand's module is imported, and the modules load their
+heavy dependencies on first use: pdfplumber when a PDF is read, tkinter when
+a name needs a dialog, cProfile with --cprofile. --timing prints how long the
+import and the command took; benchmarks/bench_startup.py times every
+subcommand from a cold interpreter.
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+from show_store import show_paths
+
+# subcommand -> (module, help)
+COMMANDS = {
+    'cast': (None, "build cast.json and group_mappings.json from Cast_List/CastList.csv or .pdf"),
+    'build': ('update_schedules', "build the schedule from Call_Schedule/CallSchedule.txt"),
+    'serve': ('schedule_server', "serve the website and the /calls API"),
+    'report': ('schedule_reports', "write CSV call reports"),
+    'watch': ('watch_show', "rebuild whenever the call board or cast list is saved"),
+}
+CAST_MODULES = {'csv': 'update_cast_from_csv', 'pdf': 'update_cast_from_pdf'}
+
+
+def csv_has_rows(csv_path):
+    """True if the CSV has something besides its header and blank lines."""
+    try:
+        with open(csv_path, 'r', encoding='utf-8-sig') as f:
+            return sum(1 for line in f if line.strip()) > 1
+    except FileNotFoundError:
+        return False
+
+
+def choose_cast_source(paths):
+    """'csv' or 'pdf' for the show's cast list, as Update_Cast_List.ps1 chooses; None (with a message) if unclear."""
+    csv_exists = csv_has_rows(paths['cast_list_csv'])
+    pdf_exists = os.path.exists(paths['cast_list_pdf'])
+    if csv_exists and pdf_exists:
+        print(f"Both {paths['cast_list_csv']} and {paths['cast_list_pdf']} exist. Choose one with --from csv or --from pdf.")
+        return None
+    if csv_exists:
+        return 'csv'
+    if pdf_exists:
+        return 'pdf'
+    if os.path.exists(paths['cast_list_csv']):
+        print(f"Error: {paths['cast_list_csv']} exists but is empty. Please complete it or add CastList.pdf.")
+    else:
+        print(f"Error: Neither CastList.csv nor CastList.pdf exist in {os.path.dirname(paths['cast_list_csv'])}.")
+    return None
+
+
+def cast_module(argv):
+    """(module name, remaining argv) for the cast subcommand; module is None if no cast list can be used."""
+    source_parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    source_parser.add_argument('--from', dest='source', choices=sorted(CAST_MODULES))
+    known, rest = source_parser.parse_known_args(argv)
+    if '-h' in rest or '--help' in rest:
+        return CAST_MODULES[known.source or 'csv'], rest
+    show_parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    show_parser.add_argument('--show')
+    source = known.source or choose_cast_source(show_paths(show_parser.parse_known_args(rest)[0].show))
+    if source == 'pdf' and importlib.util.find_spec('pdfplumber') is None:
+        print("Reading a PDF cast list needs pdfplumber: pip install pdfplumber "
+              "(or save the cast list as Cast_List/CastList.csv).")
+        return None, rest
+    return CAST_MODULES.get(source), rest
+
+
+def make_arg_parser():
+    arg_parser = argparse.ArgumentParser(
+        description="Run one step of the schedule pipeline. Options after the subcommand go to the script it wraps.",
+        epilog="commands:\n" + "\n".join(f"  {name:<8} {help_text}" for name, (_, help_text) in COMMANDS.items()),
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--timing', action='store_true',
+                            help="print the time taken to import the subcommand and to run it")
+    arg_parser.add_argument('command', choices=list(COMMANDS), metavar='command',
+                            help="one of: " + ", ".join(COMMANDS))
+    arg_parser.add_argument('args', nargs=argparse.REMAINDER, help="options for the subcommand")
+    return arg_parser
+
+
+def main(args):
+    argv = args.args
+    module_name = COMMANDS[args.command][0]
+    if args.command == 'cast':
+        module_name, argv = cast_module(argv)
+        if module_name is None:
+            exit(1)
+
+    start = time.perf_counter()
+    # __import__ rather than importlib.import_module, so python -X importtime reports the module too
+    module = __import__(module_name)
+    imported = time.perf_counter()
+    command_args = module.make_arg_parser(f"{os.path.basename(sys.argv[0])} {args.command}").parse_args(argv)
+    try:
+        module.main(command_args)
+    finally:
+        if args.timing:
+            print(f"{args.command}: imported {module_name} in {imported - start:.3f}s, "
+                  f"ran in {time.perf_counter() - imported:.3f}s")
+
+
+if __name__ == "__main__":
+    main(make_arg_parser().parse_args())
@@ -0,0 +1,131 @@
+"""Changes between published schedules, so index.html can update a stored copy.
+
+index.html keeps the single show's actors, call times and call windows in
+IndexedDB. Rather than download the whole schedule again after every build,
+it reads deltas/index.json:
+
+    generation  generation.json number of the data published now
+    deltas      up to MAX_DELTAS {'from', 'to', 'file'} steps, oldest first
+
+and fetches the delta files leading from the generation it has stored to the
+current one. Each delta (deltas/<to>.json) holds only what changed:
+
+    actors   cast.json's actor list, present only when it changed
+    times    {actor: {date: [call labels] or null}}, or null for an actor
+             who is no longer in the cast
+    windows  the same for the arrival/release windows
+
+A date's entry replaces the stored one, so applying a delta to data that
+already includes it changes nothing. A generation that does not change what
+the page shows (the conflict list, the resolution cache) gets no delta, and
+neither does one whose delta would be bigger than schedule_compact.json. The
+previous data is read back from schedule_compact.json, which is what the
+page would otherwise have downloaded. apply_delta() is the reference for the
+code in index.html. Month-sharded shows download only the months they
+display, so they get no deltas.
+"""
+import json
+import os
+
+from compact_export import COMPACT_VERSION, decode_compact
+from show_store import current_generation, load_json
+
+DELTA_VERSION = 1
+# Deltas kept; a page that is further behind downloads the whole schedule
+MAX_DELTAS = 20
+
+
+def diff_index(old, new):
+    """Changed dates of an {actor: {date: value}} index, in the delta format."""
+    changes = {}
+    for actor, dates in new.items():
+        old_dates = old.get(actor)
+        if old_dates is None:
+            changes[actor] = dates
+            continue
+        changed = {date: value for date, value in dates.items() if old_dates.get(date) != value}
+        changed.update((date, None) for date in old_dates if date not in dates)
+        if changed:
+            changes[actor] = changed
+    for actor in old:
+        if actor not in new:
+            changes[actor] = None
+    return changes
+
+
+def build_delta(old, actors, call_times, call_windows):
+    """Delta from old ({'actors', 'call_times', 'call_windows'}) to the new data, or None if nothing changed."""
+    delta = {}
+    if old['actors'] != actors:
+        delta['actors'] = actors
+    times = diff_index(old['call_times'], call_times)
+    if times:
+        delta['times'] = times
+    windows = diff_index(old['call_windows'], call_windows)
+    if windows:
+        delta['windows'] = windows
+    return delta or None
+
+
+def apply_delta(data, delta):
+    """Apply a delta in place to {'actors', 'call_times', 'call_windows'}."""
+    if 'actors' in delta:
+        data['actors'] = delta['actors']
+    for key, changes in (('call_times', delta.get('times', {})), ('call_windows', delta.get('windows', {}))):
+        index = data[key]
+        for actor, dates in changes.items():
+            if dates is None:
+                index.pop(actor, None)
+                continue
+            actor_dates = index.setdefault(actor, {})
+            for date, value in dates.items():
+                if value is None:
+                    actor_dates.pop(date, None)
+                else:
+                    actor_dates[date] = value
+    return data
+
+
+def load_published(paths):
+    """The data index.html last downloaded, decoded from schedule_compact.json; None if there is none."""
+    compact = load_json(paths['compact'])
+    if not compact or compact.get('version') != COMPACT_VERSION:
+        return None
+    return decode_compact(compact)
+
+
+def save_delta(paths, actors, call_times, call_windows, generation):
+    """Stage the delta from the published data and the updated deltas/index.json; returns True if staged.
+
+    Must be called before the generation's files are committed, while
+    schedule_compact.json still holds the previous data.
+    """
+    if paths['sharded']:
+        return False
+    manifest = load_json(paths['delta_manifest'])
+    old = load_published(paths)
+    delta = build_delta(old, actors, call_times, call_windows) if old else None
+    if manifest is not None and old is not None and delta is None:
+        return False
+
+    # Staging anything makes the commit happen, so this is the number it will get
+    number = current_generation(paths) + 1
+    steps = manifest['deltas'] if manifest and manifest.get('version') == DELTA_VERSION else []
+    # Without a manifest or the previous data there is nothing to step from, and a
+    # delta bigger than the whole compact export is not worth publishing; the new
+    # generation number alone then sends stored copies back to a full download
+    if delta is not None and manifest is not None:
+        delta = dict({'version': DELTA_VERSION, 'from': manifest['generation'], 'to': number}, **delta)
+        content = json.dumps(delta, separators=(',', ':'), ensure_ascii=False)
+        if len(content.encode('utf-8')) < os.path.getsize(paths['compact']):
+            filename = f"{number}.json"
+            generation.stage(os.path.join(paths['deltas'], filename), content)
+            steps = steps + [{'from': manifest['generation'], 'to': number, 'file': filename}]
+    for step in steps[:-MAX_DELTAS]:
+        generation.remove(os.path.join(paths['deltas'], step['file']))
+    generation.stage(paths['delta_manifest'], json.dumps({
+        'version': DELTA_VERSION,
+        'generation': number,
+        'deltas': steps[-MAX_DELTAS:],
+    }, indent=2))
+    return True
@@ -0,0 +1,163 @@
+"""Bulk rehearsal reports from cast.json and schedules.json.
+
+Membership is computed once as a matrix product instead of looping over
+actor_roles for every slot: A is actors x roles/groups (True if the actor
+holds the role or is in the group), S is slots x roles/groups (True if the
+slot calls it), and (S @ A.T) > 0 is slots x actors, True where the actor is
+called. FULL CAST is a column every actor holds, so it needs no special case.
+Headcounts, call counts and idle actors are then sums over that matrix.
+
+Requires numpy (pip install numpy).
+"""
+import argparse
+import csv
+import os
+from datetime import datetime
+
+import numpy as np
+
+from show_store import load_json, load_schedule, show_paths
+from time_intervals import slot_interval
+
+FULL_CAST = 'FULL CAST'
+
+
+class CallMatrix:
+    """Who is called in which slot for one schedule."""
+
+    def __init__(self, schedule, cast_data):
+        self.actors = list(cast_data.get('actors', []))
+        actor_roles = cast_data.get('actor_roles', {})
+        self.slots = [(date, slot['time'], slot['groups']) for date in sorted(schedule) for slot in schedule[date]]
+
+        columns = {FULL_CAST: 0}
+        for actor in self.actors:
+            for role in actor_roles.get(actor, []):
+                columns.setdefault(role, len(columns))
+        self.columns = list(columns)
+
+        actor_matrix = np.zeros((len(self.actors), len(columns)), dtype=bool)
+        actor_matrix[:, 0] = True
+        for i, actor in enumerate(self.actors):
+            actor_matrix[i, [columns[role] for role in actor_roles.get(actor, [])]] = True
+
+        slot_matrix = np.zeros((len(self.slots), len(columns)), dtype=bool)
+        for i, (_, _, groups) in enumerate(self.slots):
+            slot_matrix[i, [columns[group] for group in groups if group in columns]] = True
+
+        # float32 keeps the product on BLAS; any positive count means called
+        self.called = (slot_matrix.astype(np.float32) @ actor_matrix.T.astype(np.float32)) > 0
+        self.dates = np.array([date for date, _, _ in self.slots], dtype='U10')
+
+    def slot_mask(self, start=None, end=None):
+        """Boolean mask of slots dated between start and end inclusive."""
+        mask = np.ones(len(self.slots), dtype=bool)
+        if start:
+            mask &= self.dates >= start
+        if end:
+            mask &= self.dates <= end
+        return mask
+
+    def slot_headcounts(self):
+        return self.called.sum(axis=1)
+
+    def actor_call_counts(self, mask=None):
+        called = self.called if mask is None else self.called[mask]
+        return called.sum(axis=0)
+
+    def actor_days_called(self, mask=None):
+        """Distinct rehearsal days each actor is called."""
+        dates = self.dates if mask is None else self.dates[mask]
+        called = self.called if mask is None else self.called[mask]
+        days, day_index = np.unique(dates, return_inverse=True)
+        day_slots = np.zeros((len(days), len(dates)), dtype=np.float32)
+        day_slots[day_index, np.arange(len(dates))] = 1
+        return ((day_slots @ called.astype(np.float32)) > 0).sum(axis=0)
+
+    def idle_actors(self, mask=None):
+        """Actors not called in any slot selected by mask."""
+        called = self.called if mask is None else self.called[mask]
+        return [self.actors[i] for i in np.flatnonzero(~called.any(axis=0))]
+
+    def hourly_calls(self, mask=None):
+        """[(date, hour, [actors])] for each hour of each day someone is called.
+
+        An actor counts for an hour if any of their slots overlaps it.
+        """
+        selected = np.arange(len(self.slots)) if mask is None else np.flatnonzero(mask)
+        buckets = {}
+        for i in selected:
+            date, time, _ = self.slots[i]
+            interval = slot_interval(time, date)
+            if interval is None:
+                continue
+            for hour in range(interval[0] // 60, (interval[1] - 1) // 60 + 1):
+                buckets.setdefault((date, hour), []).append(i)
+        keys = sorted(buckets)
+        hour_slots = np.zeros((len(keys), len(self.slots)), dtype=np.float32)
+        for row, key in enumerate(keys):
+            hour_slots[row, buckets[key]] = 1
+        called = (hour_slots @ self.called.astype(np.float32)) > 0
+        return [(date, hour, [self.actors[i] for i in np.flatnonzero(called[row])])
+                for row, (date, hour) in enumerate(keys)]
+
+
+def write_csv(path, header, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    print(f"Saved {path}")
+
+
+def write_reports(matrix, output_dir, start=None, end=None):
+    os.makedirs(output_dir, exist_ok=True)
+    mask = matrix.slot_mask(start, end)
+
+    headcounts = matrix.slot_headcounts()
+    write_csv(os.path.join(output_dir, 'slot_headcount.csv'), ['date', 'time', 'groups', 'headcount'],
+              [(date, time, '; '.join(groups), int(headcounts[i]))
+               for i, (date, time, groups) in enumerate(matrix.slots) if mask[i]])
+
+    counts = matrix.actor_call_counts(mask)
+    days = matrix.actor_days_called(mask)
+    write_csv(os.path.join(output_dir, 'actor_calls.csv'), ['actor', 'calls', 'days'],
+              [(actor, int(counts[i]), int(days[i])) for i, actor in enumerate(matrix.actors)])
+
+    write_csv(os.path.join(output_dir, 'hourly_calls.csv'), ['date', 'hour', 'headcount', 'actors'],
+              [(date, f"{hour:02d}:00", len(actors), '; '.join(actors))
+               for date, hour, actors in matrix.hourly_calls(mask)])
+
+    write_csv(os.path.join(output_dir, 'idle_actors.csv'), ['actor'],
+              [(actor,) for actor in matrix.idle_actors(mask)])
+
+
+def parse_day(value):
+    datetime.strptime(value, '%Y-%m-%d')
+    return value
+
+
+def make_arg_parser(prog=None):
+    arg_parser = argparse.ArgumentParser(prog=prog, description="Write CSV call reports from schedules.json and cast.json")
+    arg_parser.add_argument('--show', help="report on shows/<SHOW>/ instead of the root files")
+    arg_parser.add_argument('--from', dest='start', type=parse_day, help="first date to include (YYYY-MM-DD)")
+    arg_parser.add_argument('--to', dest='end', type=parse_day, help="last date to include (YYYY-MM-DD)")
+    arg_parser.add_argument('--output-dir', help="folder for the CSV files (default: <show folder>/reports)")
+    return arg_parser
+
+
+def main(args):
+    paths = show_paths(args.show)
+    cast_data = load_json(paths['cast'])
+    schedule = load_schedule(paths)
+    if not cast_data or schedule is None:
+        print(f"Error: {paths['cast']} or the schedule for this show not found.")
+        exit(1)
+
+    matrix = CallMatrix(schedule, cast_data)
+    print(f"{len(matrix.actors)} actors x {len(matrix.slots)} slots x {len(matrix.columns)} roles/groups")
+    write_reports(matrix, args.output_dir or os.path.join(paths['base'], 'reports'), args.start, args.end)
+
+
+if __name__ == "__main__":
+    main(make_arg_parser().parse_args())
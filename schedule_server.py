@@ -0,0 +1,284 @@
+"""Local web server for index.html with a call-time API.
+
+Serves the repository like "python -m http.server" and adds:
+
+    /calls?actor=NAME[&actor=NAME...][&from=YYYY-MM-DD][&to=YYYY-MM-DD][&show=ID]
+
+answered from an in-memory per-actor index of call_times.json and
+call_windows.json (or a show's month shards), so a query no longer downloads
+the whole schedule; index.html uses it when this server is serving it. JSON
+files are sent with an ETag and gzip-compressed when the browser accepts it,
+and both the index and the cached files are reloaded when the JSON on disk
+changes, so re-running update_schedules.py does not need a server restart.
+"""
+import argparse
+import bisect
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from show_store import load_call_times, load_call_windows, load_json, show_paths
+
+DEFAULT_PORT = 8000
+# Seconds between checks for changed call times (per show)
+RELOAD_INTERVAL = 1.0
+# Responses smaller than this are not worth compressing
+GZIP_MIN_SIZE = 512
+
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+SHOW_ID_RE = re.compile(r'^[\w-]+$')
+
+
+class CallIndex:
+    """One show's calls per actor, with dates sorted for range queries."""
+
+    def __init__(self, cast_data, call_times, call_windows=None):
+        self.actors = {actor: ([], []) for actor in (cast_data or {}).get('actors', [])}
+        for actor, dates in call_times.items():
+            ordered = sorted(dates)
+            self.actors[actor] = (ordered, [dates[date] for date in ordered])
+        self.names = {actor.lower(): actor for actor in self.actors}
+        self.call_windows = call_windows or {}
+
+    def lookup(self, name):
+        """Actor name as spelled in the cast, matched case-insensitively."""
+        return self.names.get(name.strip().lower())
+
+    def calls(self, actor, start=None, end=None):
+        """{date: [labels]} for an actor between start and end inclusive."""
+        dates, labels = self.actors[actor]
+        lo = bisect.bisect_left(dates, start) if start else 0
+        hi = bisect.bisect_right(dates, end) if end else len(dates)
+        return dict(zip(dates[lo:hi], labels[lo:hi]))
+
+    def windows(self, actor, calls):
+        """{date: [windows]} for an actor on the dates of calls()."""
+        windows = self.call_windows.get(actor, {})
+        return {date: windows[date] for date in calls if date in windows}
+
+
+def file_signature(files):
+    signature = []
+    for path in files:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+class ScheduleStore:
+    """Call indexes per show, rebuilt when their JSON files change."""
+
+    def __init__(self, reload_interval=RELOAD_INTERVAL):
+        self.reload_interval = reload_interval
+        self.lock = threading.Lock()
+        # show_id -> (file signature, last checked, CallIndex or None)
+        self.shows = {}
+
+    @staticmethod
+    def watched_files(paths):
+        if paths['sharded']:
+            return ([paths['cast']] + sorted(glob.glob(os.path.join(paths['call_time_shards'], '*.json')))
+                    + sorted(glob.glob(os.path.join(paths['call_window_shards'], '*.json'))))
+        return [paths['cast'], paths['call_times'], paths['call_windows']]
+
+    def get(self, show_id=None):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.shows.get(show_id)
+            if entry and now - entry[1] < self.reload_interval:
+                return entry[2]
+            paths = show_paths(show_id)
+            signature = file_signature(self.watched_files(paths))
+            if entry and entry[0] == signature:
+                self.shows[show_id] = (signature, now, entry[2])
+                return entry[2]
+            try:
+                call_times = load_call_times(paths)
+                index = None if call_times is None else CallIndex(load_json(paths['cast']), call_times,
+                                                                  load_call_windows(paths))
+            except ValueError as e:
+                # Caught mid-write; keep serving the previous index and retry on the next check
+                print(f"Could not reload call times for {show_id or 'root'}: {e}")
+                return entry[2] if entry else None
+            self.shows[show_id] = (signature, now, index)
+            if index is not None:
+                print(f"Loaded call times for {show_id or 'root'}: {len(index.actors)} actors")
+            return index
+
+
+class AssetCache:
+    """File contents with an ETag and a gzip copy, refreshed when the file changes."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.files = {}
+
+    def get(self, path):
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            entry = self.files.get(path)
+            if entry and entry[0] == key:
+                return entry[1]
+        with open(path, 'rb') as f:
+            body = f.read()
+        asset = {
+            'etag': '"' + hashlib.sha256(body).hexdigest()[:32] + '"',
+            'body': body,
+            'gzip': self.precompressed(path, stat) or (gzip.compress(body) if len(body) >= GZIP_MIN_SIZE else None),
+        }
+        with self.lock:
+            self.files[path] = (key, asset)
+        return asset
+
+    @staticmethod
+    def precompressed(path, stat):
+        """Contents of a .gz copy written alongside the file (see compact_export.py), if it is current."""
+        try:
+            if os.stat(path + '.gz').st_mtime_ns < stat.st_mtime_ns:
+                return None
+            with open(path + '.gz', 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+class ScheduleServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections when many families load the page at once
+    request_queue_size = 128
+
+    def __init__(self, address, handler, reload_interval=RELOAD_INTERVAL, quiet=False):
+        super().__init__(address, handler)
+        self.store = ScheduleStore(reload_interval)
+        self.assets = AssetCache()
+        self.quiet = quiet
+
+
+class ScheduleRequestHandler(SimpleHTTPRequestHandler):
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/calls':
+            self.send_calls(parse_qs(url.query))
+            return
+        if url.path.endswith('.json'):
+            path = self.translate_path(url.path)
+            if os.path.isfile(path):
+                self.send_asset(path)
+                return
+        super().do_GET()
+
+    def accepts_gzip(self):
+        encodings = self.headers.get('Accept-Encoding', '')
+        return any(part.split(';')[0].strip() == 'gzip' for part in encodings.split(','))
+
+    def send_body(self, status, body, compressed=None, extra_headers=()):
+        if compressed is None and len(body) >= GZIP_MIN_SIZE:
+            compressed = gzip.compress(body)
+        use_gzip = compressed is not None and self.accepts_gzip()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Vary', 'Accept-Encoding')
+        for name, value in extra_headers:
+            self.send_header(name, value)
+        if use_gzip:
+            body = compressed
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_body(status, body, extra_headers=[('Cache-Control', 'no-store')])
+
+    def send_asset(self, path):
+        asset = self.server.assets.get(path)
+        etag = asset['etag']
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        # no-cache: browsers keep the file but revalidate it with the ETag on every load
+        self.send_body(HTTPStatus.OK, asset['body'], asset['gzip'],
+                       [('ETag', etag), ('Cache-Control', 'no-cache')])
+
+    def send_calls(self, query):
+        names = query.get('actor', [])
+        start = query.get('from', [None])[0]
+        end = query.get('to', [None])[0]
+        show_id = query.get('show', [None])[0]
+        if not names:
+            self.send_json(HTTPStatus.BAD_REQUEST, {'error': "missing actor"})
+            return
+        for label, value in (('from', start), ('to', end)):
+            if value is not None and not DATE_RE.match(value):
+                self.send_json(HTTPStatus.BAD_REQUEST, {'error': f"{label} must be YYYY-MM-DD"})
+                return
+        if show_id is not None and not SHOW_ID_RE.match(show_id):
+            self.send_json(HTTPStatus.BAD_REQUEST, {'error': f"invalid show: {show_id}"})
+            return
+
+        index = self.server.store.get(show_id)
+        if index is None:
+            self.send_json(HTTPStatus.SERVICE_UNAVAILABLE,
+                           {'error': "no call times found; run update_schedules.py first"})
+            return
+
+        calls = {}
+        windows = {}
+        unknown = []
+        for name in names:
+            actor = index.lookup(name)
+            if actor is None:
+                unknown.append(name)
+            else:
+                calls[actor] = index.calls(actor, start, end)
+                windows[actor] = index.windows(actor, calls[actor])
+        status = HTTPStatus.NOT_FOUND if unknown and not calls else HTTPStatus.OK
+        self.send_json(status, {'show': show_id, 'from': start, 'to': end, 'calls': calls, 'windows': windows,
+                                'unknown': unknown})
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def make_arg_parser(prog=None):
+    arg_parser = argparse.ArgumentParser(prog=prog, description="Serve the website and the /calls API.")
+    arg_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    arg_parser.add_argument('--bind', default='', help="address to listen on (default: all interfaces)")
+    arg_parser.add_argument('--directory', default='.', help="folder to serve (default: current folder)")
+    arg_parser.add_argument('--reload-interval', type=float, default=RELOAD_INTERVAL,
+                            help=f"seconds between checks for changed call times (default {RELOAD_INTERVAL})")
+    arg_parser.add_argument('-q', '--quiet', action='store_true', help="do not log every request")
+    return arg_parser
+
+
+def main(args):
+    os.chdir(args.directory)
+    server = ScheduleServer((args.bind, args.port), ScheduleRequestHandler, args.reload_interval, args.quiet)
+    print(f"Serving {os.getcwd()} at http://localhost:{args.port}/ (call times API at /calls?actor=...)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopping server.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main(make_arg_parser().parse_args())
@@ -0,0 +1,58 @@
+// Offline copy of the rehearsal checker, registered by index.html.
+//
+// Requests for this site go to the network first and every good answer is
+// kept in the cache. When the network fails, or has not answered within
+// NETWORK_TIMEOUT_MS (a rehearsal venue with one bar of signal), the cached
+// copy is used instead, so the page and everything it downloaded last time
+// still open. Requests made with cache: 'no-store' (the generation.json
+// checks) are left alone. The single show's schedule itself is also kept in
+// IndexedDB by index.html and updated from the published deltas.
+const CACHE_NAME = 'rehearsal-checker-v1';
+const NETWORK_TIMEOUT_MS = 4000;
+const PAGE_FILES = ['./', 'index.html'];
+
+self.addEventListener('install', event => {
+  event.waitUntil(caches.open(CACHE_NAME)
+    .then(cache => cache.addAll(PAGE_FILES))
+    .then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+  event.waitUntil(caches.keys()
+    .then(keys => Promise.all(keys.filter(key => key !== CACHE_NAME).map(key => caches.delete(key))))
+    .then(() => self.clients.claim()));
+});
+
+self.addEventListener('fetch', event => {
+  const request = event.request;
+  if (request.method !== 'GET' || request.cache === 'no-store' || new URL(request.url).origin !== location.origin) {
+    return;
+  }
+  event.respondWith(networkFirst(request));
+});
+
+function networkFirst(request) {
+  return new Promise(resolve => {
+    let answered = false;
+    const answer = response => {
+      if (!answered && response) {
+        answered = true;
+        resolve(response);
+      }
+      return answered;
+    };
+    const fromCache = () => caches.match(request).then(answer);
+    const timer = setTimeout(fromCache, NETWORK_TIMEOUT_MS);
+    fetch(request).then(response => {
+      clearTimeout(timer);
+      if (response.ok) {
+        const copy = response.clone();
+        caches.open(CACHE_NAME).then(cache => cache.put(request, copy));
+      }
+      answer(response);
+    }, () => {
+      clearTimeout(timer);
+      fromCache().then(found => found || answer(Response.error()));
+    });
+  });
+}
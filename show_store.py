@@ -0,0 +1,363 @@
+"""Show-scoped data layout for the schedule pipeline.
+
+Without a show id everything lives in the repository root as before
+(cast.json, group_mappings.json, schedules.json, call_times.json,
+call_windows.json). A show id moves a production into shows/<show_id>/ with
+its own cast, mappings and Call_Schedule/Cast_List inputs, and splits
+schedules, call times and call windows into one file per month so the web
+pages only download the months they display. Every show is listed in the
+top-level shows.json manifest.
+
+Files are never rewritten in place: each write goes to a temp file that is
+fsynced and renamed over the original, and the outputs of one run are
+committed together as a numbered generation (see Generation).
+"""
+import glob
+import json
+import os
+import posixpath
+
+from pipeline_metrics import metrics
+
+SHOWS_DIR = "shows"
+SHOWS_MANIFEST_PATH = "shows.json"
+
+# Year used for date headings that do not include one
+DEFAULT_YEAR = 2025
+
+
+def load_json(filepath):
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+# Suffix of the fully written copy that replaces a file when it is committed
+TEMP_SUFFIX = ".tmp"
+
+
+def read_text(filepath, binary=False):
+    try:
+        if binary:
+            with open(filepath, 'rb') as f:
+                return f.read()
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def fsync_directory(directory):
+    """Make renames in a directory durable (not possible, nor needed, on Windows)."""
+    if os.name == 'nt':
+        return
+    fd = os.open(directory or '.', os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_temp(filepath, content, encoding='utf-8'):
+    """Write content (str, or bytes for binary files) to filepath + TEMP_SUFFIX and flush it to disk."""
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = filepath + TEMP_SUFFIX
+    if isinstance(content, bytes):
+        f = open(temp_path, 'wb')
+    else:
+        f = open(temp_path, 'w', encoding=encoding)
+    with f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    if metrics.enabled:
+        metrics.count('files_written')
+        metrics.count('bytes_written', os.path.getsize(temp_path))
+    return temp_path
+
+
+def atomic_write(filepath, content, encoding='utf-8'):
+    """Replace filepath with content so readers see the old or the new file, never a partial one."""
+    os.replace(write_temp(filepath, content, encoding), filepath)
+    fsync_directory(os.path.dirname(filepath))
+
+
+def save_json(data, filepath, generation=None):
+    """Write data as JSON, leaving the file untouched if its content is unchanged.
+
+    With a generation the write is staged and happens when it is committed.
+    """
+    with metrics.stage('save_json'):
+        content = json.dumps(data, indent=2)
+        if generation is not None:
+            return generation.stage(filepath, content)
+        if read_text(filepath) == content:
+            return False
+        atomic_write(filepath, content)
+        return True
+
+
+class Generation:
+    """Output files of one run, committed so that either all changes land or none.
+
+    Changed files are staged in memory, then written to temp files and
+    fsynced. The list of pending renames is saved to generation.pending.json
+    before the first original is replaced; if the process dies during the
+    renames, recover_generation() finishes them on the next run, so
+    cast.json, group_mappings.json and the schedule files always come from
+    the same run. generation.json records the number of the last commit and
+    the files it changed.
+    """
+
+    def __init__(self, paths):
+        self.paths = paths
+        self.writes = {}
+        self.encodings = {}
+        self.removals = []
+
+    def stage(self, filepath, content, encoding='utf-8'):
+        """Queue a write; returns False if the file already has this content."""
+        if read_text(filepath, isinstance(content, bytes)) == content:
+            self.writes.pop(filepath, None)
+            return False
+        self.writes[filepath] = content
+        self.encodings[filepath] = encoding
+        return True
+
+    def remove(self, filepath):
+        if filepath not in self.removals:
+            self.removals.append(filepath)
+
+    def commit(self):
+        """Write every staged change; returns the changed paths."""
+        if not self.writes and not self.removals:
+            return []
+        for filepath, content in self.writes.items():
+            write_temp(filepath, content, self.encodings[filepath])
+        pending = {
+            'generation': current_generation(self.paths) + 1,
+            'replace': sorted(self.writes),
+            'remove': sorted(self.removals),
+        }
+        save_json(pending, self.paths['generation_pending'])
+        finish_generation(self.paths, pending)
+        changed = sorted(self.writes) + sorted(self.removals)
+        self.writes = {}
+        self.encodings = {}
+        self.removals = []
+        return changed
+
+
+def current_generation(paths):
+    return (load_json(paths['generation']) or {}).get('generation', 0)
+
+
+def finish_generation(paths, pending):
+    directories = set()
+    for filepath in pending['replace']:
+        # Already renamed if an earlier attempt got this far
+        if os.path.exists(filepath + TEMP_SUFFIX):
+            os.replace(filepath + TEMP_SUFFIX, filepath)
+        directories.add(os.path.dirname(filepath))
+    for filepath in pending['remove']:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        directories.add(os.path.dirname(filepath))
+    for directory in directories:
+        fsync_directory(directory)
+    save_json({
+        'generation': pending['generation'],
+        'files': [os.path.relpath(f, paths['base']).replace(os.sep, '/') for f in pending['replace'] + pending['remove']],
+    }, paths['generation'])
+    os.remove(paths['generation_pending'])
+
+
+def recover_generation(paths):
+    """Finish a commit that was interrupted after its files were written; returns True if there was one."""
+    pending = load_json(paths['generation_pending'])
+    if pending is None:
+        return False
+    finish_generation(paths, pending)
+    print(f"Finished saving generation {pending['generation']}, which was interrupted.")
+    return True
+
+
+def show_paths(show_id=None):
+    """Return the input and output paths for a show (or the root single show)."""
+    base = '.' if show_id is None else os.path.join(SHOWS_DIR, show_id)
+    return {
+        'show_id': show_id,
+        'base': base,
+        'sharded': show_id is not None,
+        'call_schedule': os.path.join(base, 'Call_Schedule', 'CallSchedule.txt'),
+        'cast_list_csv': os.path.join(base, 'Cast_List', 'CastList.csv'),
+        'cast_list_pdf': os.path.join(base, 'Cast_List', 'CastList.pdf'),
+        'pdf_page_cache': os.path.join(base, 'pdf_page_cache'),
+        'cast': os.path.join(base, 'cast.json'),
+        'group_mappings': os.path.join(base, 'group_mappings.json'),
+        'cast_source': os.path.join(base, 'cast_source.json'),
+        'cast_changes': os.path.join(base, 'cast_changes.json'),
+        'schedules': os.path.join(base, 'schedules.json'),
+        'schedule_shards': os.path.join(base, 'schedules'),
+        'call_times': os.path.join(base, 'call_times.json'),
+        'call_time_shards': os.path.join(base, 'call_times'),
+        'call_windows': os.path.join(base, 'call_windows.json'),
+        'call_window_shards': os.path.join(base, 'call_windows'),
+        'compact': os.path.join(base, 'schedule_compact.json'),
+        'compact_shards': os.path.join(base, 'compact'),
+        'calendars': os.path.join(base, 'calendars'),
+        'calendar_manifest': os.path.join(base, 'calendars', 'feeds.json'),
+        'deltas': os.path.join(base, 'deltas'),
+        'delta_manifest': os.path.join(base, 'deltas', 'index.json'),
+        'resolution_cache': os.path.join(base, 'resolution_cache.json'),
+        'schedule_manifest': os.path.join(base, 'schedule_manifest.json'),
+        'conflict_report': os.path.join(base, 'conflict_report.json'),
+        'schedule_conflicts': os.path.join(base, 'schedule_conflicts.json'),
+        'resolver_journal': os.path.join(base, 'resolver_journal.jsonl'),
+        'generation': os.path.join(base, 'generation.json'),
+        'generation_pending': os.path.join(base, 'generation.pending.json'),
+    }
+
+
+def shard_key(date):
+    """Month shard a YYYY-MM-DD date belongs to."""
+    return date[:7]
+
+
+def shard_schedule(schedule):
+    shards = {}
+    for date in sorted(schedule):
+        shards.setdefault(shard_key(date), {})[date] = schedule[date]
+    return shards
+
+
+def shard_call_times(call_times):
+    """Split any {actor: {date: ...}} index (call times, call windows) by month."""
+    shards = {}
+    for actor, dates in call_times.items():
+        for date in sorted(dates):
+            shards.setdefault(shard_key(date), {}).setdefault(actor, {})[date] = dates[date]
+    return shards
+
+
+def save_shards(shards, directory, generation=None):
+    """Write one <month>.json per shard and remove shards that no longer exist.
+
+    Returns the months whose files were written or removed.
+    """
+    if generation is None:
+        os.makedirs(directory, exist_ok=True)
+    changed = []
+    for month, data in sorted(shards.items()):
+        if save_json(data, os.path.join(directory, f"{month}.json"), generation):
+            changed.append(month)
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        month = os.path.splitext(os.path.basename(path))[0]
+        if month not in shards:
+            if generation is None:
+                os.remove(path)
+            else:
+                generation.remove(path)
+            changed.append(month)
+    return changed
+
+
+def load_schedule(paths):
+    """Load a show's schedule, merging month shards for sharded shows."""
+    if not paths['sharded']:
+        return load_json(paths['schedules'])
+    shard_files = sorted(glob.glob(os.path.join(paths['schedule_shards'], '*.json')))
+    if not shard_files:
+        return None
+    schedule = {}
+    for path in shard_files:
+        schedule.update(load_json(path) or {})
+    return schedule
+
+
+def load_call_times(paths):
+    """Load a show's per-actor call index, merging month shards for sharded shows."""
+    return load_actor_dates(paths, 'call_times', 'call_time_shards')
+
+
+def load_call_windows(paths):
+    """Load a show's per-actor arrive/release windows, merging month shards for sharded shows."""
+    return load_actor_dates(paths, 'call_windows', 'call_window_shards')
+
+
+def load_actor_dates(paths, file_key, shards_key):
+    if not paths['sharded']:
+        return load_json(paths[file_key])
+    shard_files = sorted(glob.glob(os.path.join(paths[shards_key], '*.json')))
+    if not shard_files:
+        return None
+    merged = {}
+    for path in shard_files:
+        for actor, dates in (load_json(path) or {}).items():
+            merged.setdefault(actor, {}).update(dates)
+    return merged
+
+
+def save_schedule_data(paths, schedule, generation=None):
+    """Save a show's schedule; returns True if any file changed."""
+    if not paths['sharded']:
+        return save_json(schedule, paths['schedules'], generation)
+    return bool(save_shards(shard_schedule(schedule), paths['schedule_shards'], generation))
+
+
+def save_call_times(paths, call_times, generation=None):
+    """Save a show's per-actor call index; returns True if any file changed."""
+    if not paths['sharded']:
+        return save_json(call_times, paths['call_times'], generation)
+    return bool(save_shards(shard_call_times(call_times), paths['call_time_shards'], generation))
+
+
+def save_call_windows(paths, call_windows, generation=None):
+    """Save a show's per-actor arrival/release windows; returns True if any file changed."""
+    if not paths['sharded']:
+        return save_json(call_windows, paths['call_windows'], generation)
+    return bool(save_shards(shard_call_times(call_windows), paths['call_window_shards'], generation))
+
+
+def show_year(show_id):
+    """Default year recorded for a show in shows.json, or DEFAULT_YEAR."""
+    manifest = load_json(SHOWS_MANIFEST_PATH) or {}
+    return manifest.get('shows', {}).get(show_id, {}).get('year', DEFAULT_YEAR)
+
+
+def register_show(paths, schedule, year, name=None):
+    """Add or refresh a show's entry in shows.json.
+
+    The entry lists URLs (relative to index.html) for the show's cast, group
+    mappings and each month shard, plus the first and last date per month so
+    pages can pick shards for a date range without downloading them.
+    """
+    manifest = load_json(SHOWS_MANIFEST_PATH) or {'shows': {}}
+    show_id = paths['show_id']
+    entry = manifest['shows'].get(show_id, {})
+    base = posixpath.join(SHOWS_DIR, show_id)
+    months = {}
+    for month, dates in shard_schedule(schedule).items():
+        months[month] = {
+            'first': min(dates),
+            'last': max(dates),
+            'schedules': posixpath.join(base, 'schedules', f"{month}.json"),
+            'call_times': posixpath.join(base, 'call_times', f"{month}.json"),
+            'call_windows': posixpath.join(base, 'call_windows', f"{month}.json"),
+            'compact': posixpath.join(base, 'compact', f"{month}.json"),
+        }
+    entry.update({
+        'name': name or entry.get('name') or show_id,
+        'year': year,
+        'cast': posixpath.join(base, 'cast.json'),
+        'group_mappings': posixpath.join(base, 'group_mappings.json'),
+        'calendars': posixpath.join(base, 'calendars', 'feeds.json'),
+        'months': months,
+    })
+    manifest['shows'][show_id] = entry
+    manifest['shows'] = dict(sorted(manifest['shows'].items()))
+    return save_json(manifest, SHOWS_MANIFEST_PATH)
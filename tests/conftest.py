@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+
+# The scripts are top-level modules run from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CAST_CSV = """Role,Actor,Group (y/n)
+SpongeBob,Kyla Bassler,n
+Patrick Star,Tavian Hernandez,n
+Plankton,Ben Blank,n
+Karen,Emily Springer,n
+Plankton Posse,Talia Bast,y
+Plankton Posse,Lucas Schmidt,y
+"""
+
+CALL_BOARD = """Friday September 12:
+5:30-8:30 FULL CAST
+5:30-9:00 Plankton, Karen, Spongebob, Plankton Posse
+Saturday September 13:
+9:30-2:00 Money Dancers, Trio
+"""
+
+
+@pytest.fixture
+def show(tmp_path, monkeypatch):
+    """A root show with a cast list and call board, as the working directory."""
+    os.makedirs(tmp_path / 'Cast_List')
+    os.makedirs(tmp_path / 'Call_Schedule')
+    (tmp_path / 'Cast_List' / 'CastList.csv').write_text(CAST_CSV, encoding='utf-8')
+    (tmp_path / 'Call_Schedule' / 'CallSchedule.txt').write_text(CALL_BOARD, encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
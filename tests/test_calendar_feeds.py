@@ -0,0 +1,52 @@
+import re
+
+import update_cast_from_csv
+import update_schedules
+
+
+def build():
+    update_schedules.main(update_schedules.make_arg_parser().parse_args(['--batch']))
+
+
+def vevents(path):
+    """{UID: {property: value}} of a feed, unfolded."""
+    text = path.read_bytes().decode('utf-8').replace('\r\n ', '')
+    events = {}
+    for block in re.findall(r'BEGIN:VEVENT\r\n(.*?)END:VEVENT', text, re.S):
+        properties = dict(line.split(':', 1) for line in block.splitlines())
+        events[properties['UID']] = properties
+    return events
+
+
+def test_slot_keeps_its_uid_when_the_groups_called_change(show):
+    update_cast_from_csv.main(update_cast_from_csv.make_arg_parser().parse_args(['-q']))
+    build()
+    feed = show / 'calendars' / 'emily-springer.ics'
+    before = vevents(feed)
+    assert sorted(event['SEQUENCE'] for event in before.values()) == ['0', '0']
+
+    call_board = show / 'Call_Schedule' / 'CallSchedule.txt'
+    call_board.write_text(call_board.read_text(encoding='utf-8').replace(', Plankton Posse', ''), encoding='utf-8')
+    build()
+    after = vevents(feed)
+    assert set(after) == set(before)
+    changed = [uid for uid in after if after[uid]['SEQUENCE'] != before[uid]['SEQUENCE']]
+    assert len(changed) == 1
+    event = after[changed[0]]
+    assert event['SEQUENCE'] == '1'
+    assert event['DESCRIPTION'] == 'Called: PLANKTON\\, KAREN\\, SPONGEBOB'
+    assert event['LAST-MODIFIED'] >= before[changed[0]]['LAST-MODIFIED']
+    # Plankton Posse is no longer called, so that event is gone from their feeds
+    assert len(vevents(show / 'calendars' / 'talia-bast.ics')) == 1
+
+
+def test_call_times_are_in_the_show_time_zone(show):
+    update_cast_from_csv.main(update_cast_from_csv.make_arg_parser().parse_args(['-q']))
+    build()
+    feed = show / 'calendars' / 'emily-springer.ics'
+    text = feed.read_bytes().decode('utf-8')
+    assert 'X-WR-TIMEZONE:America/Chicago\r\n' in text
+    assert 'BEGIN:VTIMEZONE\r\nTZID:America/Chicago\r\n' in text
+    times = sorted((event['DTSTART;TZID=America/Chicago'], event['DTEND;TZID=America/Chicago'])
+                   for event in vevents(feed).values())
+    assert times == [('20250912T173000', '20250912T203000'), ('20250912T173000', '20250912T210000')]
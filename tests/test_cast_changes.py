@@ -0,0 +1,78 @@
+import json
+
+from cast_changes import update_cast
+from show_store import show_paths
+import update_cast_from_csv
+
+
+def run_cast(*argv):
+    update_cast_from_csv.main(update_cast_from_csv.make_arg_parser().parse_args(['-q', *argv]))
+
+
+def parse_csv(csv_path):
+    cast_data, unique_roles = update_cast_from_csv.parse_cast_list(str(csv_path), quiet=True)
+    return cast_data, {role: role for role in unique_roles}
+
+
+def load(name):
+    with open(name, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def add_resolver_group(group, actors):
+    cast = load('cast.json')
+    mappings = load('group_mappings.json')
+    for actor in actors:
+        cast['actor_roles'][actor].append(group)
+    mappings[group] = group
+    with open('cast.json', 'w', encoding='utf-8') as f:
+        json.dump(cast, f)
+    with open('group_mappings.json', 'w', encoding='utf-8') as f:
+        json.dump(mappings, f)
+
+
+def test_resolver_groups_survive_a_new_cast_list(show):
+    run_cast()
+    add_resolver_group('OPENING TRIO', ['Kyla Bassler', 'Ben Blank'])
+    run_cast()
+    cast = load('cast.json')
+    assert 'OPENING TRIO' in cast['actor_roles']['Kyla Bassler']
+    assert load('group_mappings.json')['OPENING TRIO'] == 'OPENING TRIO'
+    assert load('cast_changes.json')['kept']['groups'] == ['OPENING TRIO']
+
+
+def test_without_source_record_only_recorded_names_are_kept(show):
+    run_cast()
+    # A cast from an earlier show, saved before cast_source.json existed
+    add_resolver_group('OPENING TRIO', ['Kyla Bassler'])
+    add_resolver_group('OLD SHOW ROLE', ['Ben Blank'])
+    (show / 'cast_source.json').unlink()
+    with open('resolution_cache.json', 'w', encoding='utf-8') as f:
+        json.dump({'version': 1, 'fingerprint': '', 'aliases': {
+            'OPENING TRIO': {'type': 'mapping', 'value': 'OPENING TRIO'},
+            'PATRICK': {'type': 'mapping', 'value': 'PATRICK STAR'},
+        }}, f)
+    run_cast()
+    cast = load('cast.json')
+    assert 'OPENING TRIO' in cast['actor_roles']['Kyla Bassler']
+    assert 'OLD SHOW ROLE' not in cast['actor_roles']['Ben Blank']
+    assert 'OLD SHOW ROLE' not in load('group_mappings.json')
+
+
+def test_clean_keeps_nothing(show):
+    run_cast()
+    add_resolver_group('OPENING TRIO', ['Kyla Bassler'])
+    run_cast('--clean')
+    assert 'OPENING TRIO' not in load('cast.json')['actor_roles']['Kyla Bassler']
+    assert 'OPENING TRIO' not in load('group_mappings.json')
+    assert load('cast_changes.json')['roles_removed'] == ['OPENING TRIO']
+
+
+def test_rename_is_detected_by_holders(show):
+    run_cast()
+    csv_path = show / 'Cast_List' / 'CastList.csv'
+    csv_path.write_text(csv_path.read_text(encoding='utf-8').replace('Plankton Posse', 'Plankton Crew'),
+                        encoding='utf-8')
+    cast, mappings, changes = update_cast(show_paths(None), *parse_csv(csv_path))
+    assert changes['groups_renamed'] == {'PLANKTON POSSE': 'PLANKTON CREW'}
+    assert changes['roles_removed'] == [] and changes['roles_added'] == []
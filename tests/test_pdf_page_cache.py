@@ -0,0 +1,91 @@
+import pytest
+
+from pdf_layout import layout_lines
+from pdf_page_cache import PageCache
+
+
+def two_column_layout():
+    """A page_layout() result: a title across both columns, then a 'ROLE: Actor' list in each."""
+    words = [('CAST', 250.0, 280.0, 40.0, 50.0), ('LIST', 284.0, 310.0, 40.0, 50.0)]
+    for row, (left, right) in enumerate([('SPONGEBOB: Kyla', 'PLANKTON: Ben'),
+                                         ('PATRICK: Tavian', 'KAREN: Emily'),
+                                         ('SANDY: Maggie', 'PEARL: Ava')]):
+        top = 80.0 + row * 14
+        for column, text in ((50.0, left), (350.0, right)):
+            x = column
+            for word in text.split():
+                words.append((word, x, x + 8 * len(word), top, top + 10))
+                x += 8 * len(word) + 4
+    return {'width': 612, 'words': words, 'tables': []}
+
+
+def test_cached_layout_reads_the_same_lines(tmp_path):
+    layout = two_column_layout()
+    expected = layout_lines(layout)
+    assert expected[0] == ['CAST LIST', 'SPONGEBOB: Kyla', 'PATRICK: Tavian', 'SANDY: Maggie',
+                           'PLANKTON: Ben', 'KAREN: Emily', 'PEARL: Ava']
+
+    cache = PageCache(str(tmp_path))
+    cache.put('page', layout)
+    cache.save()
+    cached = PageCache(str(tmp_path)).get('page')
+    assert layout_lines(cached) == expected
+
+
+def test_lru_removes_least_recently_used(tmp_path):
+    cache = PageCache(str(tmp_path), max_bytes=200)
+    for n in range(5):
+        cache.put(f'k{n}', 'x' * 50)
+    cache.save()
+    assert cache.evicted == 2
+
+    cache = PageCache(str(tmp_path), max_bytes=200)
+    assert cache.get('k1') is None
+    assert cache.get('k2') == 'x' * 50
+    cache.put('k5', 'y' * 50)
+    cache.save()
+    assert sorted(cache.index['entries']) == ['k2', 'k4', 'k5']
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def write_two_column_pdf(path):
+    stream = "BT /F1 11 Tf 250 750 Td (CAST LIST) Tj ET\n"
+    for row, (left, right) in enumerate([('SPONGEBOB: Kyla', 'PLANKTON: Ben'),
+                                         ('PATRICK: Tavian', 'KAREN: Emily'),
+                                         ('SANDY: Maggie', 'PEARL: Ava')]):
+        y = 700 - row * 14
+        stream += f"BT /F1 11 Tf 50 {y} Td ({left}) Tj ET\nBT /F1 11 Tf 350 {y} Td ({right}) Tj ET\n"
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>",
+               "<< /Type /Pages /Kids [4 0 R] /Count 1 >>",
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+               "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+               "/Resources << /Font << /F1 3 0 R >> >> /Contents 5 0 R >>",
+               f"<< /Length {len(stream)} >>\nstream\n{stream}endstream"]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1')
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('latin-1')
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('latin-1')
+    path.write_bytes(bytes(out))
+
+
+def test_layout_extraction_twice_on_one_cache(tmp_path):
+    pytest.importorskip('pdfplumber')
+    from update_cast_from_pdf import parse_cast_list
+
+    pdf_path = tmp_path / 'CastList.pdf'
+    write_two_column_pdf(pdf_path)
+    results = []
+    for _ in range(2):
+        cache = PageCache(str(tmp_path / 'pdf_page_cache'))
+        report = []
+        results.append((parse_cast_list(str(pdf_path), workers=1, layout=True, page_report=report, cache=cache),
+                        report))
+        cache.save()
+    assert cache.hits == 1
+    assert results[0] == results[1]
+    assert 'PLANKTON' in results[0][0][1]
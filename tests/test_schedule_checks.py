@@ -0,0 +1,15 @@
+from schedule_checks import find_capacity_overflows
+
+
+def test_capacity_sweep_counts_each_actor_once():
+    calls = [
+        ('2025-09-12', 0, (17 * 60 + 30, 21 * 60), {'A': [], 'B': [], 'C': []}),
+        ('2025-09-12', 1, (18 * 60, 19 * 60), {'C': [], 'D': []}),
+        ('2025-09-12', 2, (19 * 60, 20 * 60), {'A': [], 'B': []}),
+        ('2025-09-13', 0, (9 * 60 + 30, 11 * 60), {'A': [], 'B': [], 'C': [], 'D': [], 'E': []}),
+    ]
+    assert find_capacity_overflows(calls, 3) == [
+        {'date': '2025-09-12', 'time': '6:00pm-7:00pm', 'headcount': 4, 'capacity': 3},
+        {'date': '2025-09-13', 'time': '9:30am-11:00am', 'headcount': 5, 'capacity': 3},
+    ]
+    assert find_capacity_overflows(calls, 5) == []
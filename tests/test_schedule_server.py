@@ -0,0 +1,37 @@
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+import update_cast_from_csv
+import update_schedules
+from schedule_server import ScheduleRequestHandler, ScheduleServer
+
+
+@pytest.fixture
+def server(show):
+    update_cast_from_csv.main(update_cast_from_csv.make_arg_parser().parse_args(['-q']))
+    update_schedules.main(update_schedules.make_arg_parser().parse_args(['--batch']))
+    httpd = ScheduleServer(('localhost', 0), ScheduleRequestHandler, quiet=True)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://localhost:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_calls_include_arrive_and_release_windows(server):
+    with urlopen(server + '/calls?actor=emily%20springer&from=2025-09-12&to=2025-09-12') as res:
+        data = json.load(res)
+    assert data['calls'] == {'Emily Springer': {'2025-09-12': ['FULL CAST 5:30-8:30', 'KAREN 5:30-9:00']}}
+    assert list(data['windows']['Emily Springer']) == ['2025-09-12']
+
+
+def test_calls_without_an_actor_is_a_json_error(server):
+    # index.html checks for this answer to tell it is served by schedule_server.py
+    with pytest.raises(HTTPError) as error:
+        urlopen(server + '/calls')
+    assert error.value.code == 400
+    assert error.value.headers['Content-Type'].startswith('application/json')
@@ -0,0 +1,70 @@
+import json
+
+import update_cast_from_csv
+import update_schedules
+from update_schedules import ConflictResolver
+
+
+def build(*argv):
+    update_schedules.main(update_schedules.make_arg_parser().parse_args(list(argv)))
+
+
+def load(name):
+    with open(name, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_interactive_run_asks_about_names_batch_left_unresolved(show, monkeypatch):
+    update_cast_from_csv.main(update_cast_from_csv.make_arg_parser().parse_args(['-q']))
+    build('--batch')
+    report = load('conflict_report.json')
+    assert sorted(entry['name'] for entry in report['unresolved']) == ['Money Dancers', 'Trio']
+    assert load('schedule_manifest.json')['unresolved'] == {'2025-09-13': ['MONEY DANCERS', 'TRIO']}
+
+    # Nothing changed, so a second --batch run has nothing new to ask
+    build('--batch')
+    assert load('schedules.json')['2025-09-13'] == []
+
+    asked = []
+
+    def ask_user(self, name, current_date=None, current_time=None):
+        asked.append((name, current_date))
+        return 'PLANKTON'
+
+    monkeypatch.setattr(ConflictResolver, 'ask_user', ask_user)
+    build()
+    assert asked == [('Money Dancers', '2025-09-13'), ('Trio', '2025-09-13')]
+    assert load('schedules.json')['2025-09-13'] == [{'time': '9:30-2:00', 'groups': ['PLANKTON', 'PLANKTON']}]
+    assert load('conflict_report.json')['unresolved'] == []
+    assert load('schedule_manifest.json')['unresolved'] == {}
+
+    # Answered: the next run reuses the date without asking again
+    asked.clear()
+    build()
+    assert asked == []
+
+
+def test_batch_run_reparses_once_an_answer_is_saved(show):
+    update_cast_from_csv.main(update_cast_from_csv.make_arg_parser().parse_args(['-q']))
+    build('--batch')
+    cache = load('resolution_cache.json')
+    cache['aliases']['TRIO'] = {'type': 'full_cast'}
+    with open('resolution_cache.json', 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    build('--batch')
+    assert load('schedules.json')['2025-09-13'] == [{'time': '9:30-2:00', 'groups': ['FULL CAST']}]
+    assert [entry['name'] for entry in load('conflict_report.json')['unresolved']] == ['Money Dancers']
+
+
+def test_batch_leaves_actor_matches_for_review(show):
+    update_cast_from_csv.main(update_cast_from_csv.make_arg_parser().parse_args(['-q']))
+    call_board = show / 'Call_Schedule' / 'CallSchedule.txt'
+    call_board.write_text(call_board.read_text(encoding='utf-8') + "Friday September 19:\n5:30-8:30 Kyla Basler, Plankten\n",
+                          encoding='utf-8')
+    build('--batch')
+    assert load('cast.json')['actor_roles']['Kyla Bassler'] == ['SPONGEBOB']
+    assert load('schedules.json')['2025-09-19'] == [{'time': '5:30-8:30', 'groups': ['PLANKTON']}]
+    report = load('conflict_report.json')
+    assert report['auto_matched'] == {'PLANKTEN': {'kind': 'group', 'target': 'PLANKTON', 'score': 0.875}}
+    entry = next(entry for entry in report['unresolved'] if entry['name'] == 'Kyla Basler')
+    assert entry['candidates'][0] == {'kind': 'actor', 'name': 'Kyla Bassler', 'score': 0.957}
@@ -0,0 +1,81 @@
+"""Minute-precision intervals for call schedule time ranges.
+
+Slots keep their time as written on the callboard ("5:30-9:00",
+"9:30am-2:00pm"). Times without am/pm follow the rehearsal defaults used by
+parse_schedule: Friday rehearsals are evenings (5:30pm-9:00pm), so every
+hour is pm; Saturday rehearsals run through midday (9:30am-2:00pm), so
+7-11 are morning, 12 is noon and 1-6 are afternoon. Intervals are
+(start, end) minutes after midnight with the end exclusive.
+"""
+import re
+from datetime import datetime
+from functools import lru_cache
+
+CLOCK_RE = re.compile(r'^\s*(\d{1,2}):(\d{2})\s*(am|pm)?\s*$', re.IGNORECASE)
+
+# First hour read as morning on non-Friday dates when no am/pm is given
+MORNING_FROM_HOUR = 7
+
+
+def clock_minutes(text, evening):
+    """Minutes after midnight for '5:30', '9:30am' or '2:00pm'; None if unreadable."""
+    match = CLOCK_RE.match(text)
+    if not match:
+        return None
+    hour, minute, suffix = int(match.group(1)), int(match.group(2)), (match.group(3) or '').lower()
+    if hour > 12 or minute > 59:
+        return None
+    if suffix:
+        hour = hour % 12 + (12 if suffix == 'pm' else 0)
+    elif evening:
+        hour = hour % 12 + 12
+    elif hour < MORNING_FROM_HOUR:
+        hour += 12
+    return hour * 60 + minute
+
+
+@lru_cache(maxsize=None)
+def is_evening(date):
+    """Friday dates default to pm times."""
+    return datetime.strptime(date, '%Y-%m-%d').weekday() == 4
+
+
+def slot_interval(time_range, date):
+    """(start, end) minutes for a slot time on a YYYY-MM-DD date, or None."""
+    parts = time_range.split('-')
+    if len(parts) != 2:
+        return None
+    evening = is_evening(date)
+    start = clock_minutes(parts[0], evening)
+    end = clock_minutes(parts[1], evening)
+    if start is None or end is None:
+        return None
+    if end <= start and not CLOCK_RE.match(parts[1]).group(3):
+        # '11:30-1:00' on a Saturday: the end wrapped past noon
+        end += 12 * 60
+    if end <= start:
+        return None
+    return start, end
+
+
+def merge_intervals(intervals):
+    """Merge overlapping or touching intervals with a sorted sweep."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [tuple(interval) for interval in merged]
+
+
+def format_minutes(minutes):
+    hour, minute = divmod(minutes, 60)
+    suffix = 'am' if hour < 12 else 'pm'
+    return f"{(hour - 1) % 12 + 1}:{minute:02d}{suffix}"
+
+
+def format_interval(interval):
+    """'5:30pm-9:00pm' for (1050, 1260)."""
+    return f"{format_minutes(interval[0])}-{format_minutes(interval[1])}"
@@ -1,62 +1,90 @@
+import argparse
 import csv
 import json
 import re
+import time
 
-def parse_cast_list(csv_path):
-    cast_data = {"actors": [], "actor_roles": {}}
+from cast_changes import describe_changes, stage_cast_update, update_cast
+from show_store import Generation, recover_generation, show_paths
+
+EXPECTED_HEADERS = ['role', 'actor', 'group (y/n)']
+
+
+def parse_cast_list(csv_path, quiet=False, stats=None):
+    # Ordered sets (dict keys) keep first-seen order while making membership checks O(1)
+    actors = {}
     unique_roles = set()
     current_group = None
     row_count = 0
+    skipped = 0
+
+    def log(message):
+        if not quiet:
+            print(message)
 
     try:
-        with open(csv_path, 'r', encoding='utf-8-sig') as f:
-            print(f"Reading file: {csv_path} with content preview: {f.read(100)}...")
-            f.seek(0)
-            reader = csv.DictReader(f)
-            print(f"Detected headers: {reader.fieldnames}")
-            normalized_headers = [h.strip().lower().replace('\ufeff', '') for h in reader.fieldnames]
-            expected_headers = ['role', 'actor', 'group (y/n)']
-            if not all(h in normalized_headers for h in expected_headers):
-                raise ValueError(f"CSV is missing required headers: {expected_headers}")
-            
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            if not quiet:
+                print(f"Reading file: {csv_path} with content preview: {f.read(100)}...")
+                f.seek(0)
+            reader = csv.reader(f)
+            headers = next(reader, None)
+            log(f"Detected headers: {headers}")
+            if headers is None:
+                raise TypeError("CSV file is empty")
+            normalized_headers = [h.strip().lower().replace('\ufeff', '') for h in headers]
+            if not all(h in normalized_headers for h in EXPECTED_HEADERS):
+                raise ValueError(f"CSV is missing required headers: {EXPECTED_HEADERS}")
+            # Same columns csv.DictReader would pick for 'Role', 'Actor' and 'Group (y/n)'
+            columns = {name: index for index, name in enumerate(headers)}
+            role_col = columns.get('Role')
+            actor_col = columns.get('Actor')
+            group_col = columns.get('Group (y/n)')
+
+            def cell(row, index):
+                return row[index] if index is not None and index < len(row) else ""
+
             for row in reader:
+                if not row:
+                    continue
                 row_count += 1
-                role = row['Role'].strip().upper() if row.get('Role') else ""
-                actor = row['Actor'].strip() if row.get('Actor') else ""
-                is_group = row['Group (y/n)'].strip().lower() == 'y' if row.get('Group (y/n)') else False
+                role = cell(row, role_col).strip().upper()
+                actor = cell(row, actor_col).strip()
+                is_group = cell(row, group_col).strip().lower() == 'y'
 
                 if not actor:
-                    print(f"Skipping row {row_count} due to missing actor: {row}")
+                    skipped += 1
+                    log(f"Skipping row {row_count} due to missing actor: {row}")
                     continue
 
                 # Add actor if not already present, regardless of group status
-                if actor and actor not in cast_data["actors"]:
-                    cast_data["actors"].append(actor)
-                    cast_data["actor_roles"][actor] = []
-                    print(f"Row {row_count}: Added actor {actor}")
+                if actor not in actors:
+                    actors[actor] = {}
+                    log(f"Row {row_count}: Added actor {actor}")
+                roles = actors[actor]
 
                 if is_group:
                     current_group = role
                     unique_roles.add(role)
-                    print(f"Row {row_count}: Set group {current_group}")
-                    if role and actor in cast_data["actors"] and role not in cast_data["actor_roles"][actor]:
-                        cast_data["actor_roles"][actor].append(role)
-                        unique_roles.add(role)
-                        print(f"Row {row_count}: Added role {role} to {actor}")
+                    log(f"Row {row_count}: Set group {current_group}")
+                    if role and role not in roles:
+                        roles[role] = None
+                        log(f"Row {row_count}: Added role {role} to {actor}")
                 else:
-                    if role and actor in cast_data["actors"] and role not in cast_data["actor_roles"][actor]:
-                        cast_data["actor_roles"][actor].append(role)
+                    if role and role not in roles:
+                        roles[role] = None
                         unique_roles.add(role)
-                        print(f"Row {row_count}: Added role {role} to {actor}")
-                    if current_group and actor in cast_data["actors"] and current_group not in cast_data["actor_roles"][actor]:
-                        cast_data["actor_roles"][actor].append(current_group)
+                        log(f"Row {row_count}: Added role {role} to {actor}")
+                    if current_group and current_group not in roles:
+                        roles[current_group] = None
                         unique_roles.add(current_group)
-                        print(f"Row {row_count}: Added group role {current_group} to {actor}")
-
-        print(f"Processed {row_count} rows, total actors: {len(cast_data['actors'])}")
-        for actor in cast_data["actor_roles"]:
-            cast_data["actor_roles"][actor] = list(dict.fromkeys(cast_data["actor_roles"][actor]))
+                        log(f"Row {row_count}: Added group role {current_group} to {actor}")
 
+        cast_data = {"actors": list(actors), "actor_roles": {actor: list(roles) for actor, roles in actors.items()}}
+        log(f"Processed {row_count} rows, total actors: {len(cast_data['actors'])}")
+        if stats is not None:
+            stats.update(rows=row_count, skipped=skipped, actors=len(actors), roles=len(unique_roles),
+                         assignments=sum(len(roles) for roles in actors.values()))
         return cast_data, unique_roles
     except csv.Error as e:
         print(f"CSV parsing error at row {row_count}: {e}")
@@ -65,20 +93,47 @@ def parse_cast_list(csv_path):
         print(f"Unexpected error in parse_cast_list at row {row_count}: {e}")
         raise
 
-def save_data(cast_data, mappings_data, cast_path="cast.json", mappings_path="group_mappings.json"):
-    with open(cast_path, 'w', encoding='utf-8') as f:
-        json.dump(cast_data, f, indent=2, ensure_ascii=False)
-    with open(mappings_path, 'w', encoding='utf-8') as f:
-        json.dump(mappings_data, f, indent=2, ensure_ascii=False)
-    print(f"Cast list updated and saved to {cast_path}. Group mappings updated and saved to {mappings_path}.")
+def save_data(cast_data, mappings_data, paths, source, changes):
+    """Replace cast.json and group_mappings.json, with the parsed cast list and the changes, as one generation."""
+    generation = Generation(paths)
+    generation.stage(paths['cast'], json.dumps(cast_data, indent=2, ensure_ascii=False))
+    generation.stage(paths['group_mappings'], json.dumps(mappings_data, indent=2, ensure_ascii=False))
+    stage_cast_update(generation, paths, *source, changes)
+    generation.commit()
+    print(f"Cast list updated and saved to {paths['cast']}. Group mappings updated and saved to {paths['group_mappings']}.")
 
-if __name__ == "__main__":
-    csv_path = "./Cast_List/CastList.csv"
+def make_arg_parser(prog=None):
+    arg_parser = argparse.ArgumentParser(prog=prog, description="Build cast.json and group_mappings.json from Cast_List/CastList.csv")
+    arg_parser.add_argument('--show', help="read and write shows/<SHOW>/ instead of the root files")
+    arg_parser.add_argument('-q', '--quiet', action='store_true', help="only print the summary, not every row")
+    arg_parser.add_argument('--clean', action='store_true',
+                            help="use the cast list as it is, dropping roles and groups added while resolving names")
+    return arg_parser
+
+def main(args):
+    paths = show_paths(args.show)
+    csv_path = paths['cast_list_csv']
     try:
-        cast_data, unique_roles = parse_cast_list(csv_path)
+        start = time.perf_counter()
+        stats = {}
+        cast_data, unique_roles = parse_cast_list(csv_path, args.quiet, stats)
+        parsed = time.perf_counter()
         new_mappings = {role: role for role in unique_roles}
-        save_data(cast_data, new_mappings)
+        # Roles and groups the resolver added to the previous cast are kept unless --clean
+        recover_generation(paths)
+        source = (cast_data, new_mappings)
+        cast_data, new_mappings, changes = update_cast(paths, cast_data, new_mappings, args.clean)
+        for line in describe_changes(changes):
+            print(line)
+        save_data(cast_data, new_mappings, paths, source, changes)
+        done = time.perf_counter()
+        print(f"{stats['rows']} rows ({stats['skipped']} skipped): {stats['actors']} actors, "
+              f"{stats['roles']} roles, {stats['assignments']} role assignments")
+        print(f"Parsed in {parsed - start:.3f}s, saved in {done - parsed:.3f}s")
     except FileNotFoundError:
-        print("Error: CastList.csv not found. Please ensure it is in the same folder as this script.")
+        print(f"Error: {csv_path} not found. Please ensure it is in the same folder as this script.")
     except Exception as e:
-        print(f"Error processing the CSV: {e}")
\ No newline at end of file
+        print(f"Error processing the CSV: {e}")
+
+if __name__ == "__main__":
+    main(make_arg_parser().parse_args())
\ No newline at end of file
@@ -1,112 +1,290 @@
+import argparse
 import json
-import pdfplumber
 import re
 
-def parse_cast_list(pdf_path):
+from cast_changes import describe_changes, stage_cast_update, update_cast
+from pdf_layout import layout_lines, page_layout
+from pdf_page_cache import DEFAULT_MAX_BYTES, PageCache
+from pipeline_metrics import metrics
+from show_store import Generation, recover_generation, show_paths
+
+COLON_RE = re.compile(r'^(.+?):\s*(.+)$', re.IGNORECASE)
+GROUP_HEADER_RE = re.compile(r'^[A-Z][A-Za-z\s-]*(?:-.*)?:$')
+ACTOR_NAME_RE = re.compile(r'^[A-Z][A-Za-z\s-]*$')
+SUB_ACTOR_RE = re.compile(r'^[A-Za-z\s-]+$')
+HEADER_LIKE_RE = re.compile(r'^[A-Z\s-]{5,}:?$')
+STANDALONE_ACTOR_RE = re.compile(r'^[A-Za-z]+(?:\s[A-Za-z]+)*$')
+SPECIAL_CHARS_RE = re.compile(r'[#*]')
+
+# Pages handed to each worker process at a time
+PAGES_PER_TASK = 4
+
+# Pages where less of the text than this was understood are flagged for review
+LOW_CONFIDENCE = 0.6
+
+
+def extract_page(page, layout=False):
+    return page_layout(page) if layout else page.extract_text() or ''
+
+
+def open_pdf(pdf_path):
+    # pdfplumber (and pdfminer behind it) is imported on first use, so only a PDF cast list pays for it
+    import pdfplumber
+    return pdfplumber.open(pdf_path)
+
+
+def extract_pages(pdf_path, numbers, layout=False):
+    """Extract the given pages in one worker process."""
+    with open_pdf(pdf_path) as pdf:
+        return [extract_page(pdf.pages[n], layout) for n in numbers]
+
+
+def iter_pages(pdf_path, workers=None, layout=False, cache=None):
+    """Yield each page's text (or page_layout() with layout=True) in page order.
+
+    Pages found in cache (a PageCache) are not extracted again, and the
+    ones that are get added to it. With more than one worker, the remaining
+    pages are extracted in parallel by a process pool in chunks of
+    PAGES_PER_TASK and yielded as soon as each chunk (and every page before
+    it) is done.
+    """
+    with open_pdf(pdf_path) as pdf:
+        page_count = len(pdf.pages)
+        keys = [cache.key(page, layout) for page in pdf.pages] if cache else [None] * page_count
+        pages = [cache.get(key) for key in keys] if cache else [None] * page_count
+        missing = [n for n in range(page_count) if pages[n] is None]
+        if workers == 1 or len(missing) <= PAGES_PER_TASK:
+            for n in range(page_count):
+                if pages[n] is None:
+                    pages[n] = extract_page(pdf.pages[n], layout)
+                    if cache:
+                        cache.put(keys[n], pages[n])
+                yield pages[n]
+            return
+
+    from concurrent.futures import ProcessPoolExecutor
+    chunks = [missing[start:start + PAGES_PER_TASK] for start in range(0, len(missing), PAGES_PER_TASK)]
+    next_page = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(extract_pages, [pdf_path] * len(chunks), chunks, [layout] * len(chunks))
+        for numbers, extracted in zip(chunks, results):
+            for n, page in zip(numbers, extracted):
+                pages[n] = page
+                if cache:
+                    cache.put(keys[n], page)
+            while next_page < page_count and pages[next_page] is not None:
+                yield pages[next_page]
+                next_page += 1
+
+
+def parse_cast_list(pdf_path, workers=None, verbose=False, layout=False, page_report=None, cache=None):
+    """Parse a cast list PDF into (cast_data, unique_roles).
+
+    layout=True rebuilds each page's lines from word positions and tables
+    (see pdf_layout) instead of extract_text(). If page_report is a list, one
+    {'page', 'layout', 'lines', 'matched', 'confidence'} dict is appended per
+    page, where confidence is the share of lines the grammar understood.
+    With a PageCache, unchanged pages are read from it instead of the PDF.
+    """
+    pages = metrics.timed('extract', iter_pages(pdf_path, workers, layout, cache))
+    descriptions = []
+    if layout:
+        pages = metrics.timed('layout', layout_page_texts(pages, descriptions))
+    page_stats = [] if page_report is not None else None
+    with metrics.stage('parse'):
+        result = parse_pages(pages, verbose, page_stats)
+    if page_report is not None:
+        for stats, description in zip(page_stats, descriptions or ['text'] * len(page_stats)):
+            confidence = stats['matched'] / stats['lines'] if stats['lines'] else 0.0
+            page_report.append(dict(stats, layout=description, confidence=round(confidence, 3)))
+    return result
+
+
+def layout_page_texts(layouts, descriptions):
+    for layout in layouts:
+        lines, description = layout_lines(layout)
+        descriptions.append(description)
+        yield '\n'.join(lines)
+
+
+def parse_pages(page_texts, verbose=False, page_stats=None):
     cast_data = {"actors": [], "actor_roles": {}}
     unique_roles = set()
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_num, page in enumerate(pdf.pages, 1):
-            text = page.extract_text()
-            print(f"Page {page_num} raw text: {text}")  # Debug: Show raw extracted text
-            lines = [line.strip() for line in text.split('\n') if line.strip()]
-            
-            i = 0
-            while i < len(lines):
-                line = re.sub(r'[#*]', '', lines[i].strip())  # Clean special characters first
-                print(f"Processing line {i} (cleaned): {line}")  # Debug: Trace each cleaned line
-                # Match colon-separated character:actor format for standalone lines
-                colon_match = re.match(r'^(.+?):\s*(.+)$', line, re.IGNORECASE)
-                if colon_match:
-                    role, actor = colon_match.groups()
-                    role = role.strip().replace('.', '').upper()
-                    actor = actor.strip()
-                    if actor and not re.match(r'^[A-Z][A-Za-z\s-]*$', actor):  # Skip if actor looks like a role
-                        i += 1
-                        continue
-                    if actor and actor not in cast_data["actors"]:
-                        cast_data["actors"].append(actor)
-                        cast_data["actor_roles"][actor] = []
-                    if role and actor in cast_data["actors"] and role not in cast_data["actor_roles"][actor]:
-                        cast_data["actor_roles"][actor].append(role)
-                        unique_roles.add(role)
-                    print(f"Matched colon: Actor={actor}, Role={role}")
+    # Membership sets mirroring cast_data so lookups don't scan the lists
+    known_actors = set()
+    known_roles = {}
+
+    def add_actor(actor):
+        if actor not in known_actors:
+            known_actors.add(actor)
+            known_roles[actor] = set()
+            cast_data["actors"].append(actor)
+            cast_data["actor_roles"][actor] = []
+
+    def add_role(actor, role):
+        if role and actor in known_actors and role not in known_roles[actor]:
+            known_roles[actor].add(role)
+            cast_data["actor_roles"][actor].append(role)
+            unique_roles.add(role)
+
+    for page_num, text in enumerate(page_texts, 1):
+        if verbose:
+            print(f"Page {page_num} raw text: {text}")
+        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        matched = 0
+        metrics.count('pages')
+        metrics.count('lines', len(lines))
+        
+        i = 0
+        while i < len(lines):
+            line = SPECIAL_CHARS_RE.sub('', lines[i].strip())  # Clean special characters first
+            if verbose:
+                print(f"Processing line {i} (cleaned): {line}")
+            # Match colon-separated character:actor format for standalone lines
+            colon_match = COLON_RE.match(line)
+            if colon_match:
+                role, actor = colon_match.groups()
+                role = role.strip().replace('.', '').upper()
+                actor = actor.strip()
+                if actor and not ACTOR_NAME_RE.match(actor):  # Skip if actor looks like a role
                     i += 1
                     continue
-                
-                # Match group header (e.g., PLANKTON POSSE)
-                group_match = re.match(r'^[A-Z][A-Za-z\s-]*(?:-.*)?:$', line)
-                if group_match:
-                    group_role = line.rstrip(':').strip().upper()
-                    i += 1
-                    while i < len(lines) and not re.match(r'^[A-Z][A-Za-z\s-]*(?:-.*)?:$', lines[i]):
-                        sub_line = re.sub(r'[#*]', '', lines[i].strip())  # Clean special characters
-                        print(f"Processing sub-line (cleaned): {sub_line}")  # Debug: Trace sub-line
-                        sub_colon_match = re.match(r'^(.+?):\s*(.+)$', sub_line, re.IGNORECASE)
-                        if sub_colon_match:
-                            sub_role, sub_actor = sub_colon_match.groups()
-                            sub_role = sub_role.strip().replace('.', '').upper()
-                            sub_actor = sub_actor.strip()
-                            if sub_actor and not re.match(r'^[A-Z][A-Za-z\s-]*$', sub_actor):  # Skip if actor looks like a role
-                                i += 1
-                                continue
-                            if sub_actor and sub_actor not in cast_data["actors"]:
-                                cast_data["actors"].append(sub_actor)
-                                cast_data["actor_roles"][sub_actor] = []
-                            if sub_role and sub_actor in cast_data["actors"] and sub_role not in cast_data["actor_roles"][sub_actor]:
-                                cast_data["actor_roles"][sub_actor].append(sub_role)
-                                unique_roles.add(sub_role)
+                if actor:
+                    add_actor(actor)
+                add_role(actor, role)
+                matched += 1
+                if verbose:
+                    print(f"Matched colon: Actor={actor}, Role={role}")
+                i += 1
+                continue
+            
+            # Match group header (e.g., PLANKTON POSSE)
+            if GROUP_HEADER_RE.match(line):
+                group_role = line.rstrip(':').strip().upper()
+                matched += 1
+                i += 1
+                while i < len(lines) and not GROUP_HEADER_RE.match(lines[i]):
+                    sub_line = SPECIAL_CHARS_RE.sub('', lines[i].strip())  # Clean special characters
+                    if verbose:
+                        print(f"Processing sub-line (cleaned): {sub_line}")
+                    sub_colon_match = COLON_RE.match(sub_line)
+                    if sub_colon_match:
+                        sub_role, sub_actor = sub_colon_match.groups()
+                        sub_role = sub_role.strip().replace('.', '').upper()
+                        sub_actor = sub_actor.strip()
+                        if sub_actor and not ACTOR_NAME_RE.match(sub_actor):  # Skip if actor looks like a role
+                            i += 1
+                            continue
+                        if sub_actor:
+                            add_actor(sub_actor)
+                        add_role(sub_actor, sub_role)
+                        matched += 1
+                        if verbose:
                             print(f"Matched sub-colon: Actor={sub_actor}, Role={sub_role}")
-                        else:
-                            sub_actor = sub_line
-                            if (sub_actor and re.match(r'^[A-Za-z\s-]+$', sub_actor) and 
-                                not re.match(r'^[A-Z\s-]{5,}:?$', sub_actor) and 
-                                sub_actor not in unique_roles):
-                                if sub_actor not in cast_data["actors"]:
-                                    cast_data["actors"].append(sub_actor)
-                                    cast_data["actor_roles"][sub_actor] = []
-                                if group_role and sub_actor in cast_data["actors"] and group_role not in cast_data["actor_roles"][sub_actor]:
-                                    cast_data["actor_roles"][sub_actor].append(group_role)
-                                    unique_roles.add(group_role)
+                    else:
+                        sub_actor = sub_line
+                        if (sub_actor and SUB_ACTOR_RE.match(sub_actor) and 
+                            not HEADER_LIKE_RE.match(sub_actor) and 
+                            sub_actor not in unique_roles):
+                            add_actor(sub_actor)
+                            add_role(sub_actor, group_role)
+                            matched += 1
+                            if verbose:
                                 print(f"Matched sub-actor: {sub_actor}, Role={group_role}")
-                        i += 1
-                    continue
-                
-                # Fallback for standalone actor names, excluding header-like lines
-                actor_match = re.match(r'^[A-Za-z]+(?:\s[A-Za-z]+)*$', line)
-                if actor_match and not re.match(r'^[A-Z\s-]{5,}:?$', line) and line not in unique_roles and line not in cast_data["actors"]:
-                    actor = line
-                    if actor not in cast_data["actors"]:
-                        cast_data["actors"].append(actor)
-                        cast_data["actor_roles"][actor] = []
-                    print(f"Matched actor: {actor}")
-                
-                i += 1
+                    i += 1
+                continue
             
+            # Fallback for standalone actor names, excluding header-like lines
+            if (STANDALONE_ACTOR_RE.match(line) and not HEADER_LIKE_RE.match(line)
+                    and line not in unique_roles and line not in known_actors):
+                add_actor(line)
+                matched += 1
+                if verbose:
+                    print(f"Matched actor: {line}")
+            
+            i += 1
+        
+        if page_stats is not None:
+            page_stats.append({'page': page_num, 'lines': len(lines), 'matched': matched})
+        if verbose:
             print(f"After page {page_num}, actors: {cast_data['actors']}")
             print(f"After page {page_num}, roles: {cast_data['actor_roles']}")
     
     return cast_data, unique_roles
 
-def save_data(cast_data, mappings_data, cast_path="cast.json", mappings_path="group_mappings.json"):
-    with open(cast_path, 'w') as f:
-        json.dump(cast_data, f, indent=2)
-    with open(mappings_path, 'w') as f:
-        json.dump(mappings_data, f, indent=2)
-    print(f"Cast list updated and saved to {cast_path}. Group mappings updated and saved to {mappings_path}.")
+def save_data(cast_data, mappings_data, paths, source, changes):
+    """Replace cast.json and group_mappings.json, with the parsed cast list and the changes, as one generation."""
+    generation = Generation(paths)
+    generation.stage(paths['cast'], json.dumps(cast_data, indent=2))
+    generation.stage(paths['group_mappings'], json.dumps(mappings_data, indent=2))
+    stage_cast_update(generation, paths, *source, changes)
+    with metrics.stage('save'):
+        generation.commit()
+    print(f"Cast list updated and saved to {paths['cast']}. Group mappings updated and saved to {paths['group_mappings']}.")
 
-if __name__ == "__main__":
-    pdf_path = "./Cast_List/CastList.pdf"  # Assume CastList.pdf is in the same folder
+def make_arg_parser(prog=None):
+    arg_parser = argparse.ArgumentParser(prog=prog, description="Build cast.json and group_mappings.json from Cast_List/CastList.pdf")
+    arg_parser.add_argument('--show', help="read and write shows/<SHOW>/ instead of the root files")
+    arg_parser.add_argument('--workers', type=int,
+                            help="processes used to extract pages (default: one per CPU; 1 disables the pool)")
+    arg_parser.add_argument('-v', '--verbose', action='store_true', help="print each page and parsed line")
+    arg_parser.add_argument('--layout', action='store_true',
+                            help="read columns and role/actor pairs from word positions instead of flattened text")
+    arg_parser.add_argument('--clean', action='store_true',
+                            help="use the cast list as it is, dropping roles and groups added while resolving names")
+    arg_parser.add_argument('--no-cache', action='store_true',
+                            help="extract every page again instead of reusing unchanged pages from pdf_page_cache/")
+    arg_parser.add_argument('--cache-size', type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024, metavar='MB',
+                            help="largest the page cache may grow before the least recently used pages are removed "
+                                 "(default: %(default)g)")
+    arg_parser.add_argument('--profile', action='store_true',
+                            help="print time per stage and counts, and save them to metrics/update_cast_from_pdf-<time>.json")
+    arg_parser.add_argument('--cprofile', metavar='FILE', help="also save a cProfile dump of the run to FILE")
+    return arg_parser
+
+def main(args):
+    paths = show_paths(args.show)
+    pdf_path = paths['cast_list_pdf']
+    if args.profile or args.cprofile:
+        metrics.start('update_cast_from_pdf', paths['base'], args.cprofile)
+    status = 'error'
     try:
         # Parse the PDF and get cast data and unique roles
-        cast_data, unique_roles = parse_cast_list(pdf_path)
+        page_report = []
+        cache = None if args.no_cache else PageCache(paths['pdf_page_cache'], int(args.cache_size * 1024 * 1024))
+        cast_data, unique_roles = parse_cast_list(pdf_path, args.workers, args.verbose, args.layout, page_report,
+                                                  cache)
+        if cache:
+            cache.save()
+            print(cache.report())
+            metrics.count('page_cache_hits', cache.hits)
+            metrics.count('page_cache_misses', cache.misses)
+        for page in page_report:
+            warning = "  <-- check this page" if page['confidence'] < LOW_CONFIDENCE else ""
+            print(f"Page {page['page']}: {page['layout']}, {page['matched']}/{page['lines']} lines understood, "
+                  f"confidence {page['confidence']:.2f}{warning}")
+        print(f"Parsed {len(cast_data['actors'])} actors and {len(unique_roles)} roles from {pdf_path}.")
+        metrics.count('actors', len(cast_data['actors']))
+        metrics.count('roles', len(unique_roles))
         
         # Create new group mappings from unique roles, mapping each to itself
         new_mappings = {role: role for role in unique_roles}
         
-        # Save the new data, overwriting existing files
-        save_data(cast_data, new_mappings)
+        # Keep the roles and groups the resolver added to the previous cast unless --clean
+        recover_generation(paths)
+        source = (cast_data, new_mappings)
+        cast_data, new_mappings, changes = update_cast(paths, cast_data, new_mappings, args.clean)
+        for line in describe_changes(changes):
+            print(line)
+        
+        save_data(cast_data, new_mappings, paths, source, changes)
+        status = 'ok'
     except FileNotFoundError:
-        print("Error: CastList.pdf not found. Please ensure it is in the same folder as this script.")
+        print(f"Error: {pdf_path} not found. Please ensure it is in the same folder as this script.")
     except Exception as e:
-        print(f"Error processing the PDF: {e}")
\ No newline at end of file
+        print(f"Error processing the PDF: {e}")
+    finally:
+        metrics.finish(status)
+
+if __name__ == "__main__":
+    main(make_arg_parser().parse_args())
\ No newline at end of file
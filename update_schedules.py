@@ -1,46 +1,281 @@
+import argparse
+import copy
+import difflib
+import hashlib
 import json
+import os
 import re
+from collections import namedtuple
 from datetime import datetime
-import tkinter as tk
-from tkinter import ttk, messagebox
+
+from calendar_feeds import save_calendars
+from cast_changes import cast_fingerprint, diff_casts
+from compact_export import save_compact
+from pipeline_metrics import metrics
+from schedule_checks import check_schedule
+from schedule_deltas import save_delta
+from show_store import (DEFAULT_YEAR, Generation, atomic_write, current_generation, load_json, load_schedule,
+                        recover_generation, register_show, save_call_times, save_call_windows, save_json,
+                        save_schedule_data, show_paths, show_year)
+from time_intervals import format_interval, merge_intervals, slot_interval
+
+# Saved "apply to all" conflict decisions (resolution_cache.json next to group_mappings.json)
+RESOLUTION_CACHE_VERSION = 1
+
+# Date-block hashes, the cast and unresolved names from the last run (schedule_manifest.json),
+# used to skip unchanged dates and to re-resolve only the slots a cast change touches
+SCHEDULE_MANIFEST_VERSION = 3
+
+# Headless (--batch) resolution: unresolved names are written to conflict_report.json
+AUTO_MATCH_THRESHOLD = 0.85
+AUTO_MATCH_MARGIN = 0.05
+PREFIX_SCORE = 0.86
+MIN_CANDIDATE_SCORE = 0.5
+
+
+def is_word_prefix(prefix, text):
+    return len(text) > len(prefix) and text.startswith(prefix) and not text[len(prefix)].isalnum()
+
+
+class CastIndex:
+    """Normalized lookup tables over cast_data and group_mappings.
+
+    Built once per run and updated in place when the resolver adds roles or
+    groups, so name checks are set lookups instead of scans over the cast.
+    """
+
+    def __init__(self, cast_data, group_mappings):
+        self.cast_data = cast_data
+        self.group_mappings = group_mappings
+        self.groups = set(group_mappings)
+        self.roles = set()
+        self.role_actors = {}
+        self._sorted_actors = None
+        self._sorted_roles = None
+        self._sorted_groups = None
+        for actor, roles in cast_data.get('actor_roles', {}).items():
+            for role in roles:
+                self._index_role(actor, role)
+
+    def _index_role(self, actor, role):
+        role_upper = role.upper()
+        self.roles.add(role_upper)
+        actors = self.role_actors.setdefault(role_upper, [])
+        if actor not in actors:
+            actors.append(actor)
+
+    def is_valid(self, name):
+        name_upper = name.upper()
+        return name_upper == "FULL CAST" or name_upper in self.groups or name_upper in self.roles
+
+    def actors_for(self, name):
+        return self.role_actors.get(name.upper(), [])
+
+    def add_role(self, actor, role):
+        self._index_role(actor, role)
+        self._sorted_roles = None
+
+    def add_group(self, group, actors):
+        self.groups.add(group)
+        for actor in actors:
+            self._index_role(actor, group)
+        self._sorted_roles = None
+        self._sorted_groups = None
+
+    def rank_candidates(self, name, limit=5):
+        """Return up to `limit` (score, kind, candidate) tuples, best first.
+
+        Roles, groups and actors are scored by difflib similarity; a name that
+        is a whole-word prefix of a candidate ("Patchy" for "PATCHY THE
+        PIRATE") scores at least PREFIX_SCORE.
+        """
+        name_upper = ' '.join(name.upper().split())
+        matcher = difflib.SequenceMatcher(autojunk=False)
+        matcher.set_seq2(name_upper)
+        pools = (('group', self.groups), ('role', self.roles - self.groups),
+                 ('actor', self.cast_data.get('actors', [])))
+        scored = []
+        for kind, pool in pools:
+            for candidate in pool:
+                candidate_upper = candidate.upper()
+                matcher.set_seq1(candidate_upper)
+                score = matcher.ratio()
+                if score < PREFIX_SCORE and is_word_prefix(name_upper, candidate_upper):
+                    score = PREFIX_SCORE
+                if score >= MIN_CANDIDATE_SCORE:
+                    scored.append((round(score, 3), kind, candidate))
+        scored.sort(key=lambda c: (-c[0], c[2]))
+        return scored[:limit]
+
+    def sorted_actors(self):
+        if self._sorted_actors is None:
+            self._sorted_actors = sorted(self.cast_data.get('actors', []))
+        return self._sorted_actors
+
+    def sorted_roles(self):
+        if self._sorted_roles is None:
+            roles = set()
+            for actor_roles in self.cast_data.get('actor_roles', {}).values():
+                for role in actor_roles:
+                    if role.upper() not in self.group_mappings:
+                        roles.add(role)
+            self._sorted_roles = sorted(roles)
+        return self._sorted_roles
+
+    def sorted_groups(self):
+        if self._sorted_groups is None:
+            self._sorted_groups = sorted(self.group_mappings.keys())
+        return self._sorted_groups
+
 
 class ConflictResolver:
     def __init__(self, cast_data, group_mappings):
         self.cast_data = cast_data
         self.group_mappings = group_mappings
         self.resolution_cache = {}
+        self.index = CastIndex(cast_data, group_mappings)
+        # Dialog answers replayed from an interrupted session: (NAME, date, time) -> [results]
+        self.answers = {}
+        self.journal_path = None
         
     def get_all_actors(self):
-        return sorted(self.cast_data.get('actors', []))
+        return self.index.sorted_actors()
     
     def get_all_roles(self):
-        roles = set()
-        for actor_roles in self.cast_data.get('actor_roles', {}).values():
-            for role in actor_roles:
-                if role.upper() not in self.group_mappings:
-                    roles.add(role)
-        return sorted(roles)
+        return self.index.sorted_roles()
     
     def get_all_groups(self):
-        return sorted(self.group_mappings.keys())
+        return self.index.sorted_groups()
     
     def is_valid_name(self, name):
-        name_upper = name.upper()
-        
-        if name_upper == "FULL CAST":
-            return True
-        
-        if name_upper in self.group_mappings:
-            return True
-        
-        for actor_roles in self.cast_data.get('actor_roles', {}).values():
-            if name_upper in [r.upper() for r in actor_roles]:
-                return True
-        
+        return self.index.is_valid(name)
+    
+    def left_unresolved(self, name):
+        """True if name was left out for lack of an answer; a dialog always gets one."""
         return False
     
+    def can_resolve(self, name):
+        """True if resolving name again could give a different answer than last time."""
+        return True
+    
+    def has_answer(self, name):
+        key = name.upper()
+        return key in self.resolution_cache or any(answer[0] == key for answer in self.answers)
+    
+    def load_resolution_cache(self, filepath, cast_changes=None):
+        """Load saved "apply to all" decisions if they match the current cast.
+
+        A cache saved against the cast that cast_changes (diff_casts()) starts
+        from is carried over: answers pointing at a renamed name follow it and
+        answers pointing at a removed name are dropped. The old names of
+        renamed groups resolve to the new ones, as the call board may still
+        use them.
+        """
+        if cast_changes:
+            for old, new in cast_changes['groups_renamed'].items():
+                self.resolution_cache.setdefault(old, {'type': 'mapping', 'value': new})
+        data = load_json(filepath)
+        if not data:
+            return 0
+        if data.get('version') != RESOLUTION_CACHE_VERSION:
+            print(f"Ignoring {filepath}: cache version {data.get('version')} is out of date.")
+            return 0
+        aliases = data.get('aliases', {})
+        if data.get('fingerprint') != cast_fingerprint(self.cast_data, self.group_mappings):
+            if not cast_changes or data.get('fingerprint') != cast_changes['from']:
+                print(f"Ignoring {filepath}: the cast list has changed since it was saved.")
+                return 0
+            aliases = migrate_resolutions(aliases, cast_changes)
+        for name, decision in aliases.items():
+            self.resolution_cache.setdefault(name.upper(), decision)
+        print(f"Loaded {len(aliases)} saved resolutions from {filepath}.")
+        return len(aliases)
+    
+    def save_resolution_cache(self, filepath):
+        save_json({
+            'version': RESOLUTION_CACHE_VERSION,
+            'fingerprint': cast_fingerprint(self.cast_data, self.group_mappings),
+            'aliases': dict(sorted(self.resolution_cache.items())),
+        }, filepath)
+    
+    def open_journal(self, filepath):
+        """Replay the mutations and answers of an interrupted session, then journal to filepath.
+
+        Every new role, new group and dialog answer is appended to the journal
+        as it happens. The journal is removed by close_journal() once the
+        cast and schedule have been saved, so it only exists after a crash or
+        Ctrl-C, and the next run picks up where that session stopped.
+        """
+        replayed = 0
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            lines = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Last line cut off by the crash: drop it so new entries start on a fresh line
+                atomic_write(filepath, ''.join(lines[:replayed]))
+                break
+            self.replay(entry)
+            replayed += 1
+        if replayed:
+            print(f"Resuming interrupted session: replayed {replayed} entries from {filepath}.")
+        self.journal_path = filepath
+        return replayed
+    
+    def replay(self, entry):
+        if entry['action'] == 'new_role':
+            self.add_role_to_actor(entry['actor'], entry['role'], journal=False)
+        elif entry['action'] == 'new_group':
+            self.add_group(entry['group'], entry['actors'], journal=False)
+        elif entry['action'] == 'answer':
+            key = (entry['name'].upper(), entry['date'], entry['time'])
+            self.answers.setdefault(key, []).append(entry['result'])
+            if entry.get('alias'):
+                self.resolution_cache[entry['name'].upper()] = entry['alias']
+    
+    def journal(self, entry):
+        if self.journal_path is None:
+            return
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def close_journal(self):
+        """Drop the journal once everything it records has been saved."""
+        if self.journal_path and os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+    
+    def add_role_to_actor(self, actor, role_upper, journal=True):
+        if actor in self.cast_data['actor_roles']:
+            if role_upper not in self.cast_data['actor_roles'][actor]:
+                self.cast_data['actor_roles'][actor].append(role_upper)
+        else:
+            self.cast_data['actor_roles'][actor] = [role_upper]
+        self.index.add_role(actor, role_upper)
+        if journal:
+            self.journal({'action': 'new_role', 'actor': actor, 'role': role_upper})
+    
+    def add_group(self, group_upper, actors, journal=True):
+        self.group_mappings[group_upper] = group_upper
+        
+        for actor in actors:
+            if actor in self.cast_data['actor_roles']:
+                if group_upper not in self.cast_data['actor_roles'][actor]:
+                    self.cast_data['actor_roles'][actor].append(group_upper)
+            else:
+                self.cast_data['actor_roles'][actor] = [group_upper]
+        self.index.add_group(group_upper, actors)
+        if journal:
+            self.journal({'action': 'new_group', 'group': group_upper, 'actors': list(actors)})
+    
     def resolve_conflict(self, conflicting_name, current_date=None, current_time=None):
         if conflicting_name.upper() in self.resolution_cache:
+            metrics.count('cache_hits')
             cached = self.resolution_cache[conflicting_name.upper()]
             if cached['type'] == 'ignore':
                 return None
@@ -49,6 +284,23 @@ class ConflictResolver:
             else:
                 return cached['value']
         
+        replayed = self.answers.get((conflicting_name.upper(), current_date, current_time))
+        if replayed:
+            metrics.count('journal_replays')
+            return replayed.pop(0)
+        
+        metrics.count('dialogs')
+        with metrics.stage('dialog'):
+            resolved = self.ask_user(conflicting_name, current_date, current_time)
+        self.journal({'action': 'answer', 'name': conflicting_name, 'date': current_date, 'time': current_time,
+                      'result': resolved, 'alias': self.resolution_cache.get(conflicting_name.upper())})
+        return resolved
+    
+    def ask_user(self, conflicting_name, current_date=None, current_time=None):
+        # tkinter is only loaded once a name actually needs a dialog, so headless runs start faster
+        import tkinter as tk
+        from tkinter import ttk, messagebox
+
         result = {'action': None, 'selection': None, 'apply_all': False}
         
         root = tk.Tk()
@@ -229,12 +481,7 @@ class ConflictResolver:
         
         if result['action'] == 'new_role':
             role_upper = conflicting_name.upper()
-            actor = result['selection']
-            if actor in self.cast_data['actor_roles']:
-                if role_upper not in self.cast_data['actor_roles'][actor]:
-                    self.cast_data['actor_roles'][actor].append(role_upper)
-            else:
-                self.cast_data['actor_roles'][actor] = [role_upper]
+            self.add_role_to_actor(result['selection'], role_upper)
             
             if result['apply_all']:
                 self.resolution_cache[conflicting_name.upper()] = {'type': 'mapping', 'value': role_upper}
@@ -242,14 +489,7 @@ class ConflictResolver:
         
         if result['action'] == 'new_group':
             group_upper = conflicting_name.upper()
-            self.group_mappings[group_upper] = group_upper
-            
-            for actor in result['selection']:
-                if actor in self.cast_data['actor_roles']:
-                    if group_upper not in self.cast_data['actor_roles'][actor]:
-                        self.cast_data['actor_roles'][actor].append(group_upper)
-                else:
-                    self.cast_data['actor_roles'][actor] = [group_upper]
+            self.add_group(group_upper, result['selection'])
             
             if result['apply_all']:
                 self.resolution_cache[conflicting_name.upper()] = {'type': 'mapping', 'value': group_upper}
@@ -258,187 +498,704 @@ class ConflictResolver:
         return None
 
 
-def load_json(filepath):
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
+class BatchResolver(ConflictResolver):
+    """Non-interactive resolver for unattended runs.
+
+    Unknown names are matched against the cast index by string similarity.
+    A clear best match to a role or group at or above `threshold` is applied
+    automatically and recorded with its kind and score; everything else is
+    left out of the schedule and collected in one review report instead of
+    opening a dialog per name. A name that best matches an actor is always
+    left for review: using it would add it to that actor's roles in cast.json,
+    which only the name dialog should do.
+    """
+
+    def __init__(self, cast_data, group_mappings, threshold=AUTO_MATCH_THRESHOLD):
+        super().__init__(cast_data, group_mappings)
+        self.threshold = threshold
+        self.auto_matches = {}
+        self.unresolved = {}
+
+    def resolve_conflict(self, conflicting_name, current_date=None, current_time=None):
+        key = conflicting_name.upper()
+        if key in self.resolution_cache:
+            return super().resolve_conflict(conflicting_name, current_date, current_time)
+
+        if key not in self.auto_matches and key not in self.unresolved:
+            with metrics.stage('rank_candidates'):
+                candidates = self.index.rank_candidates(conflicting_name)
+            if candidates and self._is_confident(candidates) and candidates[0][1] != 'actor':
+                score, kind, candidate = candidates[0]
+                self.auto_matches[key] = {'kind': kind, 'target': candidate, 'score': score}
+                print(f"Auto-matched '{conflicting_name}' to {kind} '{candidate}' (score {score})")
+            else:
+                if candidates and self._is_confident(candidates):
+                    score, kind, candidate = candidates[0]
+                    print(f"'{conflicting_name}' looks like actor '{candidate}' (score {score}); left for review")
+                self.unresolved[key] = {'name': conflicting_name, 'occurrences': [], 'candidates': [
+                    {'kind': kind, 'name': candidate, 'score': score} for score, kind, candidate in candidates
+                ]}
+
+        if key in self.auto_matches:
+            return self.auto_matches[key]['target']
+
+        self.unresolved[key]['occurrences'].append({'date': current_date, 'time': current_time})
         return None
 
+    def left_unresolved(self, name):
+        return name.upper() in self.unresolved and name.upper() not in self.resolution_cache
 
-def save_json(data, filepath):
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    def can_resolve(self, name):
+        # Only an answer saved since (Apply to All, or a journal entry) changes the result
+        return self.has_answer(name)
 
+    def _is_confident(self, candidates):
+        best = candidates[0][0]
+        if best < self.threshold:
+            return False
+        return len(candidates) == 1 or best - candidates[1][0] >= AUTO_MATCH_MARGIN
 
-def parse_schedule(file_path, conflict_resolver):
-    schedule = {}
-    current_date = None
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-        i = 0
-        
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            # Check for date line
-            date_pattern = r'^(?:Friday|Saturday),?\s+([A-Za-z]+)\s+(\d{1,2})(?:,?\s+(\d{4}))?:?$'
-            date_match = re.match(date_pattern, line, re.IGNORECASE)
-            
-            if date_match:
-                month_name = date_match.group(1)
-                day = int(date_match.group(2))
-                year = int(date_match.group(3)) if date_match.group(3) else 2025
-                month_num = datetime.strptime(month_name, '%B').month
-                current_date = datetime(year, month_num, day).strftime('%Y-%m-%d')
-                schedule[current_date] = []
-                print(f"Parsed date: {line} -> {current_date}")
-                i += 1
-                continue
-            
-            if not current_date or not line:
-                i += 1
+    def write_report(self, filepath, unchanged_dates=()):
+        """Save the review report.
+
+        Entries from the previous report that occur on `unchanged_dates` are
+        kept, since an incremental run does not revisit those dates.
+        """
+        auto_matches = {}
+        unresolved = {}
+        previous = load_json(filepath) if unchanged_dates else None
+        if previous:
+            unchanged_dates = set(unchanged_dates)
+            # Reports from before matches recorded their kind and score only had the name
+            auto_matches.update((name, match) for name, match in previous.get('auto_matched', {}).items()
+                                if isinstance(match, dict))
+            for entry in previous.get('unresolved', []):
+                occurrences = [o for o in entry['occurrences'] if o['date'] in unchanged_dates]
+                if occurrences:
+                    unresolved[entry['name'].upper()] = dict(entry, occurrences=occurrences)
+        auto_matches.update(self.auto_matches)
+        for key, entry in self.unresolved.items():
+            if key in unresolved:
+                entry = dict(entry, occurrences=unresolved[key]['occurrences'] + entry['occurrences'])
+            unresolved[key] = entry
+        self.auto_matches = auto_matches
+        self.unresolved = unresolved
+
+        report = {
+            'auto_matched': {name: value for name, value in sorted(self.auto_matches.items())},
+            'unresolved': [self.unresolved[key] for key in sorted(self.unresolved)],
+        }
+        save_json(report, filepath)
+        print(f"{len(self.auto_matches)} names auto-matched, {len(self.unresolved)} need review. Report saved to {filepath}.")
+
+
+def prune_conflict_report(filepath, answered_dates):
+    """Drop the names an interactive run has asked about from an earlier --batch report."""
+    report = load_json(filepath)
+    if not report:
+        return
+    answered_dates = set(answered_dates)
+    unresolved = []
+    for entry in report.get('unresolved', []):
+        occurrences = [o for o in entry['occurrences'] if o['date'] not in answered_dates]
+        if occurrences:
+            unresolved.append(dict(entry, occurrences=occurrences))
+    if save_json(dict(report, unresolved=unresolved), filepath):
+        print(f"{len(unresolved)} names from {filepath} still need review.")
+
+
+def migrate_resolutions(aliases, cast_changes):
+    """Saved resolutions updated for a cast change: renamed targets follow, removed ones are dropped."""
+    renamed = cast_changes['groups_renamed']
+    removed = set(cast_changes['roles_removed'])
+    migrated = {}
+    for name, decision in aliases.items():
+        value = decision.get('value')
+        if decision.get('type') == 'mapping' and value:
+            if value.upper() in removed:
                 continue
-            
-            # Check if line is ONLY a time (no groups on same line)
-            time_only_pattern = r'^\s*(\d{1,2}:\d{2}(?:am|pm)?-\d{1,2}:\d{2}(?:am|pm)?)\s*$'
-            time_only_match = re.match(time_only_pattern, line)
-            
+            if value.upper() in renamed:
+                decision = dict(decision, value=renamed[value.upper()])
+        migrated[name] = decision
+    if len(migrated) < len(aliases):
+        print(f"Dropped {len(aliases) - len(migrated)} saved resolutions to names no longer in the cast.")
+    return migrated
+
+
+TIME_RANGE = r'\d{1,2}:\d{2}(?:am|pm)?-\d{1,2}:\d{2}(?:am|pm)?'
+
+DATE_RE = re.compile(r'^(?:Friday|Saturday),?\s+([A-Za-z]+)\s+(\d{1,2})(?:,?\s+(\d{4}))?:?$', re.IGNORECASE)
+TIME_ONLY_RE = re.compile(r'^\s*(' + TIME_RANGE + r')\s*$')
+TIME_GROUPS_RE = re.compile(r'^\s*(' + TIME_RANGE + r')\s+(.+)$')
+TIME_PREFIX_RE = re.compile(r'^\s*(' + TIME_RANGE + r')')
+DAY_PREFIX_RE = re.compile(r'^\s*(?:Friday|Saturday)', re.IGNORECASE)
+FULL_CAST_RE = re.compile(r'^\s*Full Cast\s*(?:\(optional\))?\s*$', re.IGNORECASE)
+GROUP_SPLIT_RE = re.compile(r',\s*')
+
+# Token kinds produced by tokenize_schedule
+DATE = 'date'
+SLOT = 'slot'
+BREAK = 'break'
+FULL_CAST = 'full_cast'
+TEXT = 'text'
+
+Token = namedtuple('Token', ['kind', 'line', 'value', 'text'])
+
+_month_numbers = {}
+
+
+def month_number(month_name):
+    key = month_name.lower()
+    if key not in _month_numbers:
+        _month_numbers[key] = datetime.strptime(month_name, '%B').month
+    return _month_numbers[key]
+
+
+def parse_date(date_match, default_year=DEFAULT_YEAR):
+    year = int(date_match.group(3)) if date_match.group(3) else default_year
+    month_num = month_number(date_match.group(1))
+    return datetime(year, month_num, int(date_match.group(2))).strftime('%Y-%m-%d')
+
+
+def tokenize_schedule(lines, default_year=DEFAULT_YEAR):
+    """Yield one typed Token per non-blank line of a call board.
+
+    DATE carries the ISO date, SLOT carries the time range and the groups
+    text (None for a time-only line), BREAK is any other line starting with
+    a time or weekday (it ends a group continuation), and FULL_CAST / TEXT
+    carry the raw line for the grammar to interpret.
+    """
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+
+        date_match = DATE_RE.match(line)
+        if date_match:
+            yield Token(DATE, line, parse_date(date_match, default_year), None)
+            continue
+
+        if TIME_PREFIX_RE.match(line):
+            time_only_match = TIME_ONLY_RE.match(line)
             if time_only_match:
-                time_range = time_only_match.group(1).strip()
-                groups = []
-                i += 1
-                
-                # Collect groups from subsequent lines
-                while i < len(lines):
-                    next_line = lines[i].strip()
-                    if not next_line:
-                        i += 1
-                        continue
-                    
-                    # Check if next line is a new time or date
-                    time_check_pattern = r'^\s*(\d{1,2}:\d{2}(?:am|pm)?-\d{1,2}:\d{2}(?:am|pm)?)'
-                    date_check_pattern = r'^\s*(?:Friday|Saturday)'
-                    if re.match(time_check_pattern, next_line) or re.match(date_check_pattern, next_line, re.IGNORECASE):
-                        break
-                    
-                    next_groups_raw = [g.strip() for g in re.split(r',\s*', next_line) if g.strip()]
-                    for group_name in next_groups_raw:
-                        resolved = resolve_name(group_name, conflict_resolver, current_date, time_range)
-                        if resolved:
-                            groups.append(resolved.upper())
-                    i += 1
-                
-                if groups and current_date in schedule:
-                    schedule[current_date].append({"time": time_range, "groups": groups})
-                    print(f"Added schedule: {current_date}, {time_range}, {groups}")
+                yield Token(SLOT, line, time_only_match.group(1).strip(), None)
                 continue
-            
-            # Check for time with groups on the same line
-            time_groups_pattern = r'^\s*(\d{1,2}:\d{2}(?:am|pm)?-\d{1,2}:\d{2}(?:am|pm)?)\s+(.+)$'
-            time_match = re.match(time_groups_pattern, line)
-            
+            time_match = TIME_GROUPS_RE.match(line)
             if time_match:
-                time_range = time_match.group(1).strip()
-                groups_text = time_match.group(2).strip()
-                
-                groups_raw = [g.strip() for g in re.split(r',\s*', groups_text) if g.strip()]
-                groups = []
-                
-                for group_name in groups_raw:
-                    resolved = resolve_name(group_name, conflict_resolver, current_date, time_range)
-                    if resolved:
-                        groups.append(resolved.upper())
-                
-                # Only add to schedule if we have valid groups
-                if current_date in schedule and groups:
-                    schedule[current_date].append({"time": time_range, "groups": groups})
-                    print(f"Added schedule: {current_date}, {time_range}, {groups}")
-                
-                i += 1
-                
-                # Only check for continuation lines if we added a schedule entry
-                if groups and current_date in schedule and schedule[current_date]:
-                    while i < len(lines):
-                        next_line = lines[i].strip()
-                        if not next_line:
-                            i += 1
-                            continue
-                        
-                        # Check if next line is a new time or date
-                        time_check_pattern = r'^\s*(\d{1,2}:\d{2}(?:am|pm)?-\d{1,2}:\d{2}(?:am|pm)?)'
-                        date_check_pattern = r'^\s*(?:Friday|Saturday)'
-                        if re.match(time_check_pattern, next_line) or re.match(date_check_pattern, next_line, re.IGNORECASE):
-                            break
-                        
-                        next_groups_raw = [g.strip() for g in re.split(r',\s*', next_line) if g.strip()]
-                        next_groups = []
-                        
-                        for group_name in next_groups_raw:
-                            resolved = resolve_name(group_name, conflict_resolver, current_date, time_range)
-                            if resolved:
-                                next_groups.append(resolved.upper())
-                        
-                        if next_groups:
-                            schedule[current_date][-1]["groups"].extend(next_groups)
-                            print(f"Added groups to: {current_date}, {schedule[current_date][-1]['time']}, {schedule[current_date][-1]['groups']}")
-                        i += 1
+                yield Token(SLOT, line, time_match.group(1).strip(), time_match.group(2).strip())
                 continue
-            
-            # Handle standalone Full Cast lines for cases with no time specified
-            full_cast_check = r'^\s*Full Cast\s*(?:\(optional\))?\s*$'
-            if re.match(full_cast_check, line, re.IGNORECASE) and current_date in schedule:
-                if not schedule[current_date]:
-                    # No time slots yet for this date use default time
-                    day_of_week = datetime.strptime(current_date, '%Y-%m-%d').strftime('%A')
-                    default_time = "5:30pm-9:00pm" if day_of_week == "Friday" else "9:30am-2:00pm"
-                    schedule[current_date].append({"time": default_time, "groups": ["FULL CAST"]})
-                    print(f"Added default FULL CAST schedule: {current_date}, {default_time}, ['FULL CAST']")
-                else:
-                    # There are existing time slots add to the last one
-                    schedule[current_date][-1]["groups"].append("FULL CAST")
-                    print(f"Added FULL CAST to: {current_date}, {schedule[current_date][-1]['time']}, {schedule[current_date][-1]['groups']}")
-                i += 1
+            yield Token(BREAK, line, None, None)
+            continue
+
+        if DAY_PREFIX_RE.match(line):
+            yield Token(BREAK, line, None, None)
+            continue
+
+        if FULL_CAST_RE.match(line):
+            yield Token(FULL_CAST, line, None, line)
+            continue
+
+        yield Token(TEXT, line, None, line)
+
+
+def split_groups(text):
+    return [g.strip() for g in GROUP_SPLIT_RE.split(text) if g.strip()]
+
+
+def parse_schedule(file_path, conflict_resolver, default_year=DEFAULT_YEAR):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return parse_schedule_lines(f, conflict_resolver, default_year)
+
+
+def parse_schedule_lines(lines, conflict_resolver, default_year=DEFAULT_YEAR, conflicts=None, unresolved=None):
+    """Parse call board lines into {date: [slots]}.
+
+    Names that needed resolving are added to the conflicts set, and those
+    left out for lack of an answer (--batch) to the unresolved set.
+    """
+    schedule = {}
+    current_date = None
+    # Slot currently collecting continuation lines, and whether it is a
+    # time-only slot that has not been added to the schedule yet.
+    open_slot = None
+    pending = False
+
+    def resolve_groups(text, time_range):
+        groups = []
+        for group_name in split_groups(text):
+            resolved = resolve_name(group_name, conflict_resolver, current_date, time_range, conflicts, unresolved)
+            if resolved:
+                groups.append(resolved.upper())
+        return groups
+
+    def close_slot():
+        if pending and open_slot['groups']:
+            schedule[current_date].append(open_slot)
+            print(f"Added schedule: {current_date}, {open_slot['time']}, {open_slot['groups']}")
+
+    for token in metrics.timed('tokenize', tokenize_schedule(lines, default_year)):
+        if token.kind == DATE:
+            if open_slot is not None:
+                close_slot()
+                open_slot = None
+            current_date = token.value
+            schedule[current_date] = []
+            print(f"Parsed date: {token.line} -> {current_date}")
+            continue
+
+        if not current_date:
+            continue
+
+        if token.kind in (SLOT, BREAK):
+            if open_slot is not None:
+                close_slot()
+                open_slot = None
+
+            if token.kind == BREAK:
+                continue
+
+            time_range = token.value
+            if token.text is None:
+                open_slot = {"time": time_range, "groups": []}
+                pending = True
+                continue
+
+            groups = resolve_groups(token.text, time_range)
+            # Only add to schedule (and accept continuation lines) if we have valid groups
+            if groups:
+                open_slot = {"time": time_range, "groups": groups}
+                pending = False
+                schedule[current_date].append(open_slot)
+                print(f"Added schedule: {current_date}, {time_range}, {groups}")
+            continue
+
+        if open_slot is not None:
+            next_groups = resolve_groups(token.text, open_slot['time'])
+            if next_groups:
+                open_slot['groups'].extend(next_groups)
+                if not pending:
+                    print(f"Added groups to: {current_date}, {open_slot['time']}, {open_slot['groups']}")
+            continue
+
+        # Handle standalone Full Cast lines for cases with no time specified
+        if token.kind == FULL_CAST:
+            if not schedule[current_date]:
+                # No time slots yet for this date use default time
+                day_of_week = datetime.strptime(current_date, '%Y-%m-%d').strftime('%A')
+                default_time = "5:30pm-9:00pm" if day_of_week == "Friday" else "9:30am-2:00pm"
+                schedule[current_date].append({"time": default_time, "groups": ["FULL CAST"]})
+                print(f"Added default FULL CAST schedule: {current_date}, {default_time}, ['FULL CAST']")
             else:
-                i += 1
-    
+                # There are existing time slots add to the last one
+                schedule[current_date][-1]["groups"].append("FULL CAST")
+                print(f"Added FULL CAST to: {current_date}, {schedule[current_date][-1]['time']}, {schedule[current_date][-1]['groups']}")
+
+    if open_slot is not None:
+        close_slot()
+
     return schedule
 
 
-def resolve_name(name, conflict_resolver, current_date=None, current_time=None):
+def split_date_blocks(lines, default_year=DEFAULT_YEAR):
+    """Group the non-blank call board lines by the date heading they fall under.
+
+    Lines before the first date are dropped (parse_schedule ignores them), and
+    repeated headings for the same date are merged in order so that parsing a
+    block on its own reproduces the full-file result.
+    """
+    blocks = {}
+    current_date = None
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+        date_match = DATE_RE.match(line)
+        if date_match:
+            current_date = parse_date(date_match, default_year)
+            blocks.setdefault(current_date, [])
+        if current_date is not None:
+            blocks[current_date].append(line)
+    return blocks
+
+
+def block_hash(lines):
+    return hashlib.sha256('\n'.join(lines).encode('utf-8')).hexdigest()
+
+
+def load_schedule_manifest(filepath, cast_data, group_mappings):
+    """Return the manifest from the last run, or {} if it cannot be used.
+
+    A manifest written by a different parser version is ignored so every
+    date is reparsed. See with_cast_changes() for one saved against a
+    different cast.
+    """
+    manifest = load_json(filepath)
+    if not manifest or manifest.get('version') != SCHEDULE_MANIFEST_VERSION:
+        return {}
+    return with_cast_changes(manifest, cast_data, group_mappings)
+
+
+def with_cast_changes(manifest, cast_data, group_mappings):
+    """The manifest with 'changes' set to the diff_casts() from its cast to this one (None if unchanged)."""
+    if not manifest:
+        return {}
+    if manifest.get('fingerprint') == cast_fingerprint(cast_data, group_mappings):
+        return dict(manifest, changes=None)
+    changes = diff_casts(manifest['cast'], manifest['group_mappings'], cast_data, group_mappings)
+    print(f"The cast has changed since the last build: {len(changes['roles_removed'])} name(s) removed, "
+          f"{len(changes['groups_renamed'])} renamed, {len(changes['roles_added'])} added.")
+    return dict(manifest, changes=changes)
+
+
+def reresolve_slots(slots, changes, conflict_resolver, date, conflicts, unresolved):
+    """A date's slots updated for a cast change; returns (slots, number of slots touched).
+
+    Renamed names are replaced and removed ones are resolved again. If that
+    leaves a slot with no groups the date's slots are None, because parsing
+    the block again may attach its continuation lines differently.
+    """
+    renamed = changes['groups_renamed']
+    removed = set(changes['roles_removed'])
+    updated = []
+    touched = 0
+    for slot in slots:
+        if not any(group in renamed or group in removed for group in slot['groups']):
+            updated.append(slot)
+            continue
+        touched += 1
+        groups = []
+        for group in slot['groups']:
+            if group in renamed:
+                # Resolved through the cache from now on, like a full reparse would
+                conflicts.add(group)
+                groups.append(renamed[group])
+            elif group in removed:
+                resolved = resolve_name(group, conflict_resolver, date, slot['time'], conflicts, unresolved)
+                if resolved:
+                    groups.append(resolved.upper())
+            else:
+                groups.append(group)
+        if not groups:
+            return None, touched
+        updated.append({'time': slot['time'], 'groups': groups})
+        print(f"Re-resolved schedule: {date}, {slot['time']}, {slot['groups']} -> {groups}")
+    return updated, touched
+
+
+def parse_schedule_incremental(file_path, conflict_resolver, previous_schedule, previous_manifest,
+                               default_year=DEFAULT_YEAR):
+    """Reparse only the date blocks whose hash differs from previous_manifest's.
+
+    Returns the schedule, the block hashes, per-date conflict names and
+    per-date unresolved names for the next manifest, and the list of dates
+    that were reparsed. Unchanged blocks are copied from previous_schedule,
+    except those with names a --batch run left unresolved when this
+    resolver can now answer them (see ConflictResolver.can_resolve). If the
+    cast has changed since (previous_manifest['changes']), an unchanged
+    block is also reparsed when a name it had to resolve is now in the
+    cast; otherwise only its slots that use a removed or renamed name are
+    resolved again.
+    """
+    with metrics.stage('read'):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            blocks = split_date_blocks(f, default_year)
+    metrics.count('lines', sum(len(lines) for lines in blocks.values()))
+
+    old_hashes = previous_manifest.get('blocks', {}) if previous_schedule else {}
+    old_conflicts = previous_manifest.get('conflicts', {})
+    old_unresolved = previous_manifest.get('unresolved', {})
+    changes = previous_manifest.get('changes')
+    added = set(changes['roles_added']) | set(changes['groups_renamed'].values()) if changes else set()
+    schedule = {}
+    hashes = {}
+    conflicts = {}
+    unresolved = {}
+    reparsed = []
+    touched = 0
+    for date, lines in blocks.items():
+        hashes[date] = block_hash(lines)
+        day = None
+        day_unresolved = set(old_unresolved.get(date, []))
+        if (old_hashes.get(date) == hashes[date] and date in previous_schedule
+                and not any(conflict_resolver.can_resolve(name) for name in day_unresolved)):
+            day_conflicts = set(old_conflicts.get(date, []))
+            if not changes:
+                day = previous_schedule[date]
+            elif not day_conflicts & added:
+                day, day_touched = reresolve_slots(previous_schedule[date], changes, conflict_resolver, date,
+                                                   day_conflicts, day_unresolved)
+                touched += day_touched
+        if day is not None:
+            schedule[date] = day
+        else:
+            day_conflicts = set()
+            day_unresolved = set()
+            with metrics.stage('parse'):
+                schedule.update(parse_schedule_lines(lines, conflict_resolver, default_year, day_conflicts,
+                                                     day_unresolved))
+            reparsed.append(date)
+        conflicts[date] = sorted(day_conflicts)
+        if day_unresolved:
+            unresolved[date] = sorted(day_unresolved)
+    metrics.count('dates_reparsed', len(reparsed))
+    metrics.count('dates_reused', len(blocks) - len(reparsed))
+    if changes:
+        metrics.count('slots_reresolved', touched)
+        print(f"Cast change: re-resolved {touched} slot(s) in unchanged dates.")
+    return schedule, hashes, conflicts, unresolved, reparsed
+
+
+def resolve_name(name, conflict_resolver, current_date=None, current_time=None, conflicts=None, unresolved=None):
     if not name or name.upper() == "WORSHIP":
         return None
     
     if conflict_resolver.is_valid_name(name):
         return name
     
+    if conflicts is not None:
+        conflicts.add(name.upper())
+    # Only names that are not in the cast are timed; the lookup above is too cheap to measure per call
+    metrics.count('conflicts')
     print(f"Conflict detected: '{name}' on {current_date} at {current_time}")
-    resolved = conflict_resolver.resolve_conflict(name, current_date, current_time)
+    with metrics.stage('resolve_conflict'):
+        resolved = conflict_resolver.resolve_conflict(name, current_date, current_time)
+    if not resolved and unresolved is not None and conflict_resolver.left_unresolved(name):
+        unresolved.add(name.upper())
     return resolved
 
 
-def save_schedule(schedule, schedule_path="schedules.json"):
-    with open(schedule_path, 'w', encoding='utf-8') as f:
-        json.dump(schedule, f, indent=2)
-    print(f"Schedule saved to {schedule_path}.")
+SPLIT_GROUP_RE = re.compile(r'^[A-Z\s-]+-\d{8}-[\dampm-]+$')
 
 
-if __name__ == "__main__":
+def call_label(actor, actor_roles, slot, group_mappings):
+    """Label one call the way index.html shows it, e.g. 'PLANKTON 5:30-9:00'."""
+    if 'FULL CAST' in slot['groups']:
+        return f"FULL CAST {slot['time']}"
+    for role in actor_roles:
+        if role.upper() in slot['groups']:
+            return f"{role} {slot['time']}"
+    for group in slot['groups']:
+        if group != actor and (SPLIT_GROUP_RE.match(group) or group in group_mappings):
+            # Subsets created by schedule_editor.html look like 'GROUP-20250919-530900'
+            if SPLIT_GROUP_RE.match(group):
+                return f"{group.split('-')[0]} {slot['time']}"
+            if group_mappings[group]:
+                return f"{group} {slot['time']}"
+            return slot['time']
+    return f"{actor} {slot['time']}"
+
+
+def iter_calls(schedule, cast_data):
+    """Yield (date, slot, called actors) for every slot, dates in order."""
+    actor_roles = cast_data.get('actor_roles', {})
+    actors = cast_data.get('actors', [])
+    group_actors = {}
+    for actor in actors:
+        for role in actor_roles.get(actor, []):
+            group_actors.setdefault(role, []).append(actor)
+
+    for date in sorted(schedule):
+        for slot in schedule[date]:
+            if 'FULL CAST' in slot['groups']:
+                called = actors
+            else:
+                called = {}
+                for group in slot['groups']:
+                    for actor in group_actors.get(group, []):
+                        called[actor] = True
+            yield date, slot, called
+
+
+def iter_call_labels(schedule, cast_data, group_mappings):
+    """Yield (date, slot, {actor: call label}) for every slot, dates in order."""
+    actor_roles = cast_data.get('actor_roles', {})
+    for date, slot, called in iter_calls(schedule, cast_data):
+        yield date, slot, {actor: call_label(actor, actor_roles.get(actor, []), slot, group_mappings)
+                           for actor in called}
+
+
+def build_call_times(schedule, cast_data, group_mappings):
+    """Invert the schedule into {actor: {date: [call labels]}} for index.html."""
+    call_times = {actor: {} for actor in cast_data.get('actors', [])}
+    for date, slot, labels in iter_call_labels(schedule, cast_data, group_mappings):
+        for actor, label in labels.items():
+            call_times[actor].setdefault(date, []).append(label)
+    return call_times
+
+
+def save_outputs(paths, schedule, cast_data, group_mappings, generation):
+    """Stage call_times.json, call_windows.json, the page delta, the compact export and calendar feeds for a schedule."""
+    with metrics.stage('call_times'):
+        call_times = build_call_times(schedule, cast_data, group_mappings)
+        if save_call_times(paths, call_times, generation):
+            print("Call times saved.")
+    with metrics.stage('call_windows'):
+        call_windows = build_call_windows(schedule, cast_data)
+        if save_call_windows(paths, call_windows, generation):
+            print("Call windows saved.")
+    with metrics.stage('deltas'):
+        if save_delta(paths, cast_data.get('actors', []), call_times, call_windows, generation):
+            print(f"Schedule delta saved to {paths['deltas']}.")
+    with metrics.stage('compact'):
+        if save_compact(paths, cast_data.get('actors', []), iter_call_labels(schedule, cast_data, group_mappings),
+                        generation):
+            print("Compact schedule saved.")
+    with metrics.stage('calendars'):
+        regenerated, total = save_calendars(paths, cast_data.get('actors', []),
+                                            iter_call_labels(schedule, cast_data, group_mappings), generation)
+    metrics.count('calendar_feeds_written', regenerated)
+    print(f"Calendar feeds: {regenerated} of {total} regenerated.")
+
+
+def build_call_windows(schedule, cast_data):
+    """Each actor's arrival and release per day: {actor: {date: [window]}}.
+
+    Overlapping and back-to-back slots merge into one window; a gap between
+    calls leaves separate windows. Slots whose time cannot be read are skipped.
+    """
+    intervals = {}
+    for date, slot, called in iter_calls(schedule, cast_data):
+        interval = slot_interval(slot['time'], date)
+        if interval is None:
+            continue
+        for actor in called:
+            intervals.setdefault(actor, {}).setdefault(date, []).append(interval)
+
+    call_windows = {actor: {} for actor in cast_data.get('actors', [])}
+    for actor, dates in intervals.items():
+        for date, day_intervals in dates.items():
+            call_windows[actor][date] = [
+                {'start': start, 'end': end, 'label': format_interval((start, end))}
+                for start, end in merge_intervals(day_intervals)
+            ]
+    return call_windows
+
+
+def save_schedule(schedule, schedule_path="schedules.json", generation=None):
+    if save_json(schedule, schedule_path, generation):
+        print(f"Schedule saved to {schedule_path}.")
+    else:
+        print(f"Schedule unchanged, {schedule_path} not rewritten.")
+
+
+def update_show(paths, resolver, previous_schedule, previous_manifest, year=DEFAULT_YEAR, capacity=None, show_name=None,
+                generation=None):
+    """Parse the call board and save the schedule and everything built from it as one generation.
+
+    Dates whose block hash matches previous_manifest are copied from
+    previous_schedule (see parse_schedule_incremental). Files already staged
+    in generation are committed with the rest. Returns (schedule, manifest,
+    reparsed dates, changed files) so a caller that stays running
+    (watch_show.py) can pass the first two back in for the next build.
+    """
+    cast_data = resolver.cast_data
+    group_mappings = resolver.group_mappings
+    if generation is None:
+        generation = Generation(paths)
+    schedule, block_hashes, block_conflicts, block_unresolved, reparsed = parse_schedule_incremental(
+        paths['call_schedule'], resolver, previous_schedule, previous_manifest, year)
+    print(f"Reparsed {len(reparsed)} of {len(schedule)} dates.")
+    with metrics.stage('check'):
+        conflicts = check_schedule(schedule, cast_data, group_mappings, capacity)
+    save_json(conflicts, paths['schedule_conflicts'], generation)
+
+    with metrics.stage('schedule'):
+        save_json(cast_data, paths['cast'], generation)
+        save_json(group_mappings, paths['group_mappings'], generation)
+        if paths['sharded']:
+            if save_schedule_data(paths, schedule, generation):
+                print(f"Schedule shards saved to {paths['schedule_shards']}.")
+        else:
+            save_schedule(schedule, paths['schedules'], generation)
+    save_outputs(paths, schedule, cast_data, group_mappings, generation)
+    with metrics.stage('save'):
+        # The cast is copied so later resolver additions do not change what it was resolved against
+        manifest = copy.deepcopy({
+            'version': SCHEDULE_MANIFEST_VERSION,
+            'fingerprint': cast_fingerprint(cast_data, group_mappings),
+            'cast': cast_data,
+            'group_mappings': group_mappings,
+            'blocks': block_hashes,
+            'conflicts': block_conflicts,
+            'unresolved': block_unresolved,
+        })
+        save_json(manifest, paths['schedule_manifest'], generation)
+        changed = generation.commit()
+        if changed:
+            print(f"Saved generation {current_generation(paths)}: {len(changed)} file(s) changed.")
+        resolver.close_journal()
+        resolver.save_resolution_cache(paths['resolution_cache'])
+        if paths['sharded']:
+            register_show(paths, schedule, year, show_name)
+        if isinstance(resolver, BatchResolver):
+            resolver.write_report(paths['conflict_report'], [d for d in schedule if d not in reparsed])
+        else:
+            prune_conflict_report(paths['conflict_report'], reparsed)
+    return schedule, manifest, reparsed, changed
+
+
+def make_arg_parser(prog=None):
+    arg_parser = argparse.ArgumentParser(prog=prog, description="Build schedules.json from Call_Schedule/CallSchedule.txt")
+    arg_parser.add_argument('--show',
+                            help="build shows/<SHOW>/ (month-sharded output listed in shows.json) instead of the root files")
+    arg_parser.add_argument('--show-name', help="display name for --show in shows.json")
+    arg_parser.add_argument('--year', type=int,
+                            help="year for date headings without one (default: the show's year in shows.json, else %d)" % DEFAULT_YEAR)
+    arg_parser.add_argument('--batch', action='store_true',
+                            help="resolve unknown names without dialogs and write conflict_report.json")
+    arg_parser.add_argument('--index-only', action='store_true',
+                            help="only rebuild call_times.json, call_windows.json, schedule_compact.json and the calendar feeds "
+                                 "from the existing schedules")
+    arg_parser.add_argument('--full', action='store_true',
+                            help="reparse every date instead of only the ones that changed")
+    arg_parser.add_argument('--threshold', type=float, default=AUTO_MATCH_THRESHOLD,
+                            help="minimum similarity for --batch auto-matching (default: %(default)s)")
+    arg_parser.add_argument('--capacity', type=int,
+                            help="flag times when more than this many actors are called at once")
+    arg_parser.add_argument('--profile', action='store_true',
+                            help="print time per stage and counts, and save them to metrics/update_schedules-<time>.json")
+    arg_parser.add_argument('--cprofile', metavar='FILE', help="also save a cProfile dump of the run to FILE")
+    return arg_parser
+
+
+def main(args):
+    paths = show_paths(args.show)
+    year = args.year or (show_year(args.show) if args.show else DEFAULT_YEAR)
+    if args.profile or args.cprofile:
+        metrics.start('update_schedules', paths['base'], args.cprofile)
+    status = 'error'
+    
     try:
-        cast_data = load_json("cast.json")
-        group_mappings = load_json("group_mappings.json")
+        with metrics.stage('load'):
+            recover_generation(paths)
+            cast_data = load_json(paths['cast'])
+            group_mappings = load_json(paths['group_mappings'])
         
         if not cast_data or not group_mappings:
-            print("Error: cast.json or group_mappings.json not found.")
+            print(f"Error: {paths['cast']} or {paths['group_mappings']} not found.")
             exit(1)
         
-        resolver = ConflictResolver(cast_data, group_mappings)
-        schedule = parse_schedule("./Call_Schedule/CallSchedule.txt", resolver)
+        if args.index_only:
+            generation = Generation(paths)
+            schedule = load_schedule(paths) or {}
+            save_outputs(paths, schedule, cast_data, group_mappings, generation)
+            with metrics.stage('save'):
+                generation.commit()
+            status = 'ok'
+            exit(0)
         
-        save_json(cast_data, "cast.json")
-        save_json(group_mappings, "group_mappings.json")
-        save_schedule(schedule)
+        if args.batch:
+            resolver = BatchResolver(cast_data, group_mappings, args.threshold)
+        else:
+            resolver = ConflictResolver(cast_data, group_mappings)
+        with metrics.stage('load'):
+            manifest = load_schedule_manifest(paths['schedule_manifest'], cast_data, group_mappings)
+            resolver.load_resolution_cache(paths['resolution_cache'], manifest.get('changes'))
+            previous_manifest = {} if args.full else manifest
+            resolver.open_journal(paths['resolver_journal'])
+            previous_schedule = load_schedule(paths)
+        update_show(paths, resolver, previous_schedule, previous_manifest, year, args.capacity, args.show_name)
+        status = 'ok'
         
         print("\nProcessing complete!")
         
@@ -450,3 +1207,9 @@ if __name__ == "__main__":
         import traceback
         traceback.print_exc()
         exit(1)
+    finally:
+        metrics.finish(status)
+
+
+if __name__ == "__main__":
+    main(make_arg_parser().parse_args())
@@ -0,0 +1,302 @@
+"""Keep a show's website files up to date while the call board is being edited.
+
+    python watch_show.py [--show ID] [--batch]
+
+Builds once, then waits for Call_Schedule/CallSchedule.txt or
+Cast_List/CastList.csv/.pdf to be saved and rebuilds straight away. The
+cast, its name index and the conflict resolver (with every "apply to all"
+answer) stay in memory between builds, and the date-block hashes of the last
+build are kept too, so saving the call board only reparses the dates that
+changed; Generation.stage() then skips every output whose content is
+unchanged. Saving the cast list rebuilds the cast the way the cast scripts
+do, keeping the roles and groups added while resolving names, and resolves
+again only the slots that use a name it removed or renamed.
+
+Changes are seen through inotify on Linux and by checking the files' size
+and modification time everywhere else (or with --poll). Editors often save
+in several steps, so a build starts once no further change has arrived for
+--debounce seconds. index.html, when served from this computer or the local
+network, checks generation.json and shows the new calls without a reload.
+"""
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+import traceback
+
+from cast_changes import describe_changes, stage_cast_update, update_cast
+from show_store import (DEFAULT_YEAR, Generation, load_json, load_schedule, recover_generation, show_paths,
+                        show_year)
+from update_cast_from_csv import parse_cast_list as parse_cast_csv
+from update_schedules import (AUTO_MATCH_THRESHOLD, BatchResolver, ConflictResolver, load_schedule_manifest,
+                              update_show, with_cast_changes)
+
+# Seconds without a further change before a burst of saves is built
+DEBOUNCE = 0.2
+# Seconds between file checks when inotify is not available
+POLL_INTERVAL = 0.2
+
+# inotify(7) event flags: a file written and closed, renamed into place, created or deleted
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Linux inotify on the folders of the watched files.
+
+    Watching the folder rather than the file also catches editors that save
+    by writing a new file and renaming it over the old one.
+    """
+
+    def __init__(self, files):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # watch descriptor -> {file name: path}
+        self.files = {}
+        for path in files:
+            directory = os.path.dirname(os.path.abspath(path))
+            if not os.path.isdir(directory):
+                continue
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"cannot watch {directory}")
+            self.files.setdefault(wd, {})[os.path.basename(path)] = path
+
+    def wait(self, timeout=None):
+        """Watched paths changed within timeout seconds (forever if None); empty if none."""
+        changed = set()
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return changed
+        data = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            path = self.files.get(wd, {}).get(name)
+            if path:
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Compares each file's size and modification time every POLL_INTERVAL seconds."""
+
+    def __init__(self, files, interval=POLL_INTERVAL):
+        self.interval = interval
+        self.signatures = {path: self.signature(path) for path in files}
+
+    @staticmethod
+    def signature(path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path, signature in self.signatures.items():
+                current = self.signature(path)
+                if current != signature:
+                    self.signatures[path] = current
+                    changed.add(path)
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+            time.sleep(self.interval if deadline is None else max(0, min(self.interval, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+
+def make_watcher(files, polling=False):
+    if not polling:
+        try:
+            return InotifyWatcher(files)
+        except (OSError, AttributeError) as e:
+            print(f"inotify not available ({e}); checking the files every {POLL_INTERVAL}s instead.")
+    return PollingWatcher(files)
+
+
+def wait_for_changes(watcher, debounce=DEBOUNCE):
+    """Block until something changes, then keep collecting until debounce seconds pass quietly."""
+    changed = watcher.wait()
+    while True:
+        more = watcher.wait(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+def parse_cast_source(path, page_cache_dir=None):
+    """(cast_data, group_mappings) from CastList.csv or CastList.pdf, as the Update_Cast_List scripts build them.
+
+    A PDF's unchanged pages are read from the page cache in page_cache_dir, if given.
+    """
+    if path.lower().endswith('.pdf'):
+        # pdfplumber is only needed when a PDF cast list is being watched
+        from pdf_page_cache import PageCache
+        from update_cast_from_pdf import parse_cast_list as parse_cast_pdf
+        cache = PageCache(page_cache_dir) if page_cache_dir else None
+        cast_data, unique_roles = parse_cast_pdf(path, cache=cache)
+        if cache:
+            cache.save()
+            print(cache.report())
+    else:
+        cast_data, unique_roles = parse_cast_csv(path, quiet=True)
+    return cast_data, {role: role for role in unique_roles}
+
+
+class ShowWatcher:
+    """One show's cast, resolver and last schedule, rebuilt as its inputs change."""
+
+    def __init__(self, paths, year=DEFAULT_YEAR, batch=False, threshold=AUTO_MATCH_THRESHOLD, capacity=None,
+                 show_name=None):
+        self.paths = paths
+        self.year = year
+        self.batch = batch
+        self.threshold = threshold
+        self.capacity = capacity
+        self.show_name = show_name
+        self.resolver = None
+        self.schedule = None
+        self.manifest = {}
+        # (parsed cast, parsed mappings, changes) of a cast list not yet saved with a build
+        self.cast_update = None
+
+    def watched_files(self):
+        return [self.paths['call_schedule'], self.paths['cast_list_csv'], self.paths['cast_list_pdf']]
+
+    def use_cast(self, cast_data, group_mappings):
+        if self.batch:
+            self.resolver = BatchResolver(cast_data, group_mappings, self.threshold)
+        else:
+            self.resolver = ConflictResolver(cast_data, group_mappings)
+        self.resolver.load_resolution_cache(self.paths['resolution_cache'], self.manifest.get('changes'))
+        self.resolver.open_journal(self.paths['resolver_journal'])
+
+    def start(self):
+        """Load the saved cast and schedule and bring the outputs up to date; False if there is no cast yet."""
+        recover_generation(self.paths)
+        cast_data = load_json(self.paths['cast'])
+        group_mappings = load_json(self.paths['group_mappings'])
+        if not cast_data or not group_mappings:
+            print(f"Error: {self.paths['cast']} or {self.paths['group_mappings']} not found. "
+                  f"Run Update_Cast_List.ps1 first.")
+            return False
+        self.manifest = load_schedule_manifest(self.paths['schedule_manifest'], cast_data, group_mappings)
+        self.use_cast(cast_data, group_mappings)
+        self.schedule = load_schedule(self.paths)
+        if os.path.exists(self.paths['call_schedule']):
+            self.build()
+        return True
+
+    def build(self):
+        generation = Generation(self.paths)
+        if self.cast_update:
+            # Saved with the cast.json it was merged into, so the two cannot get out of step
+            stage_cast_update(generation, self.paths, *self.cast_update)
+        self.schedule, self.manifest, _, _ = update_show(self.paths, self.resolver, self.schedule, self.manifest,
+                                                         self.year, self.capacity, self.show_name, generation)
+        self.cast_update = None
+
+    def rebuild_cast(self, path):
+        cast_data, group_mappings = parse_cast_source(path, self.paths['pdf_page_cache'])
+        if not cast_data['actors']:
+            print(f"No actors found in {path}; keeping the previous cast.")
+            return
+        print(f"Cast list {path} changed: {len(cast_data['actors'])} actors, {len(group_mappings)} roles.")
+        source_cast, source_mappings = cast_data, group_mappings
+        cast_data, group_mappings, changes = update_cast(self.paths, cast_data, group_mappings)
+        for line in describe_changes(changes):
+            print(line)
+        self.cast_update = (source_cast, source_mappings, changes)
+        # Only the slots using a removed or renamed name are resolved again
+        self.manifest = with_cast_changes(self.manifest, cast_data, group_mappings)
+        self.use_cast(cast_data, group_mappings)
+        self.build()
+
+    def handle(self, changed):
+        """Rebuild for a set of changed input paths."""
+        start = time.perf_counter()
+        cast_lists = [path for path in (self.paths['cast_list_csv'], self.paths['cast_list_pdf'])
+                      if path in changed and os.path.exists(path)]
+        try:
+            if cast_lists:
+                # Both saved at once: the newer one is the one being edited
+                self.rebuild_cast(max(cast_lists, key=os.path.getmtime))
+            elif self.paths['call_schedule'] in changed and os.path.exists(self.paths['call_schedule']):
+                print(f"{self.paths['call_schedule']} changed.")
+                self.build()
+            else:
+                return
+        except Exception as e:
+            # Most often a file caught half-saved; the next save triggers another build
+            print(f"Error rebuilding the show: {e}")
+            traceback.print_exc()
+            return
+        print(f"Rebuilt in {time.perf_counter() - start:.2f}s.")
+
+
+def watch(show_watcher, polling=False, debounce=DEBOUNCE):
+    watcher = make_watcher(show_watcher.watched_files(), polling)
+    try:
+        while True:
+            print("Watching for changes (Ctrl-C to stop)...")
+            show_watcher.handle(wait_for_changes(watcher, debounce))
+    finally:
+        watcher.close()
+
+
+def make_arg_parser(prog=None):
+    arg_parser = argparse.ArgumentParser(
+        prog=prog, description="Rebuild the schedule whenever Call_Schedule/CallSchedule.txt or the cast list is saved")
+    arg_parser.add_argument('--show', help="watch shows/<SHOW>/ instead of the root files")
+    arg_parser.add_argument('--show-name', help="display name for --show in shows.json")
+    arg_parser.add_argument('--year', type=int,
+                            help="year for date headings without one (default: the show's year in shows.json, else %d)" % DEFAULT_YEAR)
+    arg_parser.add_argument('--batch', action='store_true',
+                            help="resolve unknown names without dialogs and write conflict_report.json")
+    arg_parser.add_argument('--threshold', type=float, default=AUTO_MATCH_THRESHOLD,
+                            help="minimum similarity for --batch auto-matching (default: %(default)s)")
+    arg_parser.add_argument('--capacity', type=int,
+                            help="flag times when more than this many actors are called at once")
+    arg_parser.add_argument('--poll', action='store_true', help="check the files for changes instead of using inotify")
+    arg_parser.add_argument('--debounce', type=float, default=DEBOUNCE,
+                            help="seconds to wait for further saves before rebuilding (default: %(default)s)")
+    return arg_parser
+
+
+def main(args):
+    paths = show_paths(args.show)
+    year = args.year or (show_year(args.show) if args.show else DEFAULT_YEAR)
+    show_watcher = ShowWatcher(paths, year, args.batch, args.threshold, args.capacity, args.show_name)
+    try:
+        if not show_watcher.start():
+            exit(1)
+        watch(show_watcher, args.poll, args.debounce)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+
+if __name__ == "__main__":
+    main(make_arg_parser().parse_args())